@@ -0,0 +1,542 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module defines the benchmarks of the framework.
+
+Each benchmark prepares an operation on generated survey data, which is then
+timed. Preparations, like reading the input of the operation, are not part of
+the measured time. The benchmarks cover loading the metadata and the survey
+data, composing data frames, the helpers in hifis_surveyval.core.util,
+running analysis scripts and plotting.
+"""
+import copy
+import csv
+import gc
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+import yaml
+from pandas import DataFrame, Series
+
+from hifis_surveyval.benchmark.survey_generator import SurveyGenerator
+from hifis_surveyval.core import util
+from hifis_surveyval.core.dispatch import Dispatcher
+from hifis_surveyval.core.metadata_loader import MetadataLoader
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.survey_data_reader import SurveyDataReader
+from hifis_surveyval.data_container import DataContainer
+from hifis_surveyval.hifis_surveyval import HIFISSurveyval
+from hifis_surveyval.models.mixins.yaml_constructable import YamlLoader
+from hifis_surveyval.plotting.supported_output_format import \
+    SupportedOutputFormat
+
+# The operation measured by a benchmark
+Operation = Callable[[], Any]
+
+# The analysis scripts run by the dispatch benchmark
+_SCRIPTS = {
+    "count_values": (
+        "from hifis_surveyval.core import util\n"
+        "\n"
+        "def run(hifis_surveyval, data):\n"
+        "    for collection in data.survey_questions:\n"
+        "        util.dataframe_value_counts(collection.as_data_frame())\n"
+    ),
+    "describe_survey": (
+        "def run(hifis_surveyval, data):\n"
+        "    frame = data.data_frame_for_ids(data.question_collection_ids)\n"
+        "    frame.describe(include='all')\n"
+    ),
+}
+
+# The amount of questions shown in plots, limited by the colors available for
+# bar charts
+_PLOTTED_QUESTIONS: int = 6
+
+
+class BenchmarkEnvironment(object):
+    """Holds the generated survey data the benchmarks operate on."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        folder: Path,
+        participants: int,
+        questions: int,
+        seed: int = 0,
+    ) -> None:
+        """
+        Generate survey data and set up the settings to process them.
+
+        Args:
+            settings:
+                The settings to base the benchmarks on, e.g. determining the
+                CSV engine or the amount of workers. They are not modified.
+            folder:
+                The folder to hold the generated data and outputs.
+            participants:
+                The amount of participants in the generated survey data.
+            questions:
+                The amount of questions in the generated survey data.
+            seed:
+                The seed of the random numbers the data is generated from.
+        """
+        self.generator: SurveyGenerator = SurveyGenerator(
+            settings, participants, questions, seed
+        )
+        (self.metadata_files, self.survey_data) = self.generator.write(folder)
+
+        self.settings: Settings = copy.deepcopy(settings)
+        self.settings.METADATA = folder / "metadata"
+        self.settings.SCRIPT_FOLDER = folder / "scripts"
+        self.settings.SCRIPT_NAMES = []
+        self.settings.ANALYSIS_OUTPUT_PATH = folder / "output"
+        self.settings.OUTPUT_FORMAT = SupportedOutputFormat.PNG
+        self.settings.INCREMENTAL = False
+        self.settings.PROFILE_SCRIPTS = False
+
+        self.settings.SCRIPT_FOLDER.mkdir(exist_ok=True)
+        for (name, source) in _SCRIPTS.items():
+            (self.settings.SCRIPT_FOLDER / f"{name}.py").write_text(source)
+
+        self._data: Optional[DataContainer] = None
+        self._surveyval: Optional[HIFISSurveyval] = None
+
+    @property
+    def data(self) -> DataContainer:
+        """
+        Get the generated data, loaded into a data container.
+
+        The data are loaded on first access and kept afterwards.
+
+        Returns:
+            The data container holding the generated data.
+        """
+        if self._data is None:
+            self._data = self.empty_container(with_metadata=True)
+            SurveyDataReader.read(
+                settings=self.settings,
+                survey_data=self.survey_data,
+                data=self._data,
+            )
+        return self._data
+
+    @property
+    def surveyval(self) -> HIFISSurveyval:
+        """
+        Get the framework object that is passed to analysis scripts.
+
+        Returns:
+            The framework object, writing outputs into the benchmark folder.
+        """
+        if self._surveyval is None:
+            self._surveyval = HIFISSurveyval(settings=self.settings)
+        return self._surveyval
+
+    def empty_container(self, with_metadata: bool) -> DataContainer:
+        """
+        Create a data container without survey data.
+
+        Since IDs of questions must be unique, the kept data container is
+        released beforehand.
+
+        Args:
+            with_metadata:
+                Whether to load the generated metadata into the container.
+        Returns:
+            A new data container.
+        """
+        self.release()
+        data: DataContainer = DataContainer(settings=self.settings)
+        if with_metadata:
+            MetadataLoader.load(
+                settings=self.settings,
+                metadata_files=self.metadata_files,
+                data=data,
+            )
+        return data
+
+    def release(self) -> None:
+        """Release the kept data container, so its IDs can be used again."""
+        self._data = None
+        gc.collect()
+
+
+class Benchmark(object):
+    """An operation of the framework whose duration is measured."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        prepare: Callable[[BenchmarkEnvironment], Operation],
+    ) -> None:
+        """
+        Set up a benchmark.
+
+        Args:
+            name:
+                The name identifying the benchmark.
+            description:
+                What the benchmark measures.
+            prepare:
+                Prepares the operation to be measured in the given
+                environment and returns it. It is called again before each
+                measurement.
+        """
+        self.name: str = name
+        self.description: str = description
+        self.prepare: Callable[[BenchmarkEnvironment], Operation] = prepare
+
+
+def _load_metadata(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare adding parsed metadata to an empty data container.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    parsed: List[Any] = [
+        yaml.load(metadata_file.read_text(), Loader=YamlLoader)
+        for metadata_file in environment.metadata_files
+    ]
+    data: DataContainer = environment.empty_container(with_metadata=False)
+
+    def operation() -> None:
+        for metadata in parsed:
+            data.load_metadata(metadata)
+
+    return operation
+
+
+def _load_survey_data(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare adding parsed survey data to a data container.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    with environment.survey_data.open(newline="") as csv_file:
+        rows: List[List[str]] = list(csv.reader(csv_file))
+    data: DataContainer = environment.empty_container(with_metadata=True)
+    return lambda: data.load_survey_data(rows)
+
+
+def _read_survey_data(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare reading the survey data file into a data container.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    data: DataContainer = environment.empty_container(with_metadata=True)
+    return lambda: SurveyDataReader.read(
+        settings=environment.settings,
+        survey_data=environment.survey_data,
+        data=data,
+    )
+
+
+def _as_data_frame(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare composing a data frame for each question collection.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    collections = environment.data.survey_questions
+    return lambda: [collection.as_data_frame() for collection in collections]
+
+
+def _data_frame_for_ids(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare composing a data frame of the whole survey.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    data: DataContainer = environment.data
+    collection_ids: List[str] = data.question_collection_ids
+    return lambda: data.data_frame_for_ids(collection_ids)
+
+
+def _option_frame(
+    environment: BenchmarkEnvironment, limit: Optional[int] = None
+) -> DataFrame:
+    """
+    Compose a data frame of the questions with answer options.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+        limit:
+            The maximum amount of questions to include, all if not given.
+    Returns:
+        The data frame with one column per question.
+    """
+    return environment.data.data_frame_for_ids(
+        environment.generator.question_ids("option")[:limit]
+    )
+
+
+def _cross_reference_input(
+    environment: BenchmarkEnvironment, limit: Optional[int] = None
+) -> Tuple[DataFrame, Series]:
+    """
+    Compose the input for util.cross_reference_sum().
+
+    Args:
+        environment:
+            The environment holding the generated data.
+        limit:
+            The maximum amount of yes / no questions to include, all if not
+            given.
+    Returns:
+        A data frame of the yes / no questions as numbers and the answers
+        given to the first option question to group them by.
+    """
+    frame: DataFrame = environment.data.data_frame_for_ids(
+        environment.generator.question_ids("bool")[:limit]
+    ).astype(float)
+    grouping: Series = environment.data.question_for_id(
+        environment.generator.question_ids("option")[0]
+    ).as_series().dropna()
+    return (frame, grouping)
+
+
+def _grouped_bool_frame(
+    environment: BenchmarkEnvironment, limit: Optional[int] = None
+) -> DataFrame:
+    """
+    Count the answers to yes / no questions per answer to an option question.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+        limit:
+            The maximum amount of yes / no questions to include, all if not
+            given.
+    Returns:
+        The result of util.cross_reference_sum().
+    """
+    (frame, grouping) = _cross_reference_input(environment, limit)
+    return util.cross_reference_sum(frame, grouping)
+
+
+def _dataframe_value_counts(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare counting the answers to all questions with answer options.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    frame: DataFrame = _option_frame(environment)
+    return lambda: util.dataframe_value_counts(frame)
+
+
+def _cross_reference_sum(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare grouping the yes / no questions by an option question.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    (frame, grouping) = _cross_reference_input(environment)
+    return lambda: util.cross_reference_sum(frame, grouping)
+
+
+def _filter_and_group_series(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare grouping the answers to a number question by an option question.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    data: DataContainer = environment.data
+    base_data: Series = data.question_for_id(
+        environment.generator.question_ids("int")[0]
+    ).as_series()
+    group_by: Series = data.question_for_id(
+        environment.generator.question_ids("option")[0]
+    ).as_series().dropna()
+    return lambda: util.filter_and_group_series(
+        base_data, group_by, min_value=10, max_value=90
+    )
+
+
+def _dispatch(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare running a set of analysis scripts.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    dispatcher: Dispatcher = Dispatcher(
+        surveyval=environment.surveyval, data=environment.data
+    )
+    dispatcher.discover()
+    return dispatcher.load_all_modules
+
+
+def _plot_bar_chart(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare plotting the answer counts of option questions as bar chart.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    frame: DataFrame = util.dataframe_value_counts(
+        _option_frame(environment, _PLOTTED_QUESTIONS)
+    )
+    return lambda: environment.surveyval.plotter.plot_bar_chart(
+        frame, plot_file_name="benchmark_bar_chart"
+    )
+
+
+def _plot_box_chart(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare plotting the answers to decimal number questions as box chart.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    frame: DataFrame = environment.data.data_frame_for_ids(
+        environment.generator.question_ids("float")[:_PLOTTED_QUESTIONS]
+    )
+    return lambda: environment.surveyval.plotter.plot_box_chart(
+        data_frame=frame, plot_file_name="benchmark_box_chart"
+    )
+
+
+def _plot_matrix_chart(environment: BenchmarkEnvironment) -> Operation:
+    """
+    Prepare plotting grouped answers to yes / no questions as matrix chart.
+
+    Args:
+        environment:
+            The environment holding the generated data.
+    Returns:
+        The operation to be measured.
+    """
+    frame: DataFrame = _grouped_bool_frame(environment, _PLOTTED_QUESTIONS)
+    return lambda: environment.surveyval.plotter.plot_matrix_chart(
+        frame, plot_file_name="benchmark_matrix_chart"
+    )
+
+
+BENCHMARKS: List[Benchmark] = [
+    # Benchmarks that need to load data from scratch come first, so the
+    # data container used by the others is only loaded once
+    Benchmark(
+        "load_metadata",
+        "Add parsed metadata to an empty data container.",
+        _load_metadata,
+    ),
+    Benchmark(
+        "load_survey_data",
+        "Add parsed survey data to a data container.",
+        _load_survey_data,
+    ),
+    Benchmark(
+        "read_survey_data",
+        "Read the survey data file with the configured CSV engine.",
+        _read_survey_data,
+    ),
+    Benchmark(
+        "as_data_frame",
+        "Compose a data frame for each question collection.",
+        _as_data_frame,
+    ),
+    Benchmark(
+        "data_frame_for_ids",
+        "Compose a data frame of all question collections.",
+        _data_frame_for_ids,
+    ),
+    Benchmark(
+        "dataframe_value_counts",
+        "Count the answers to all questions with answer options.",
+        _dataframe_value_counts,
+    ),
+    Benchmark(
+        "cross_reference_sum",
+        "Group the yes / no questions by a question with answer options.",
+        _cross_reference_sum,
+    ),
+    Benchmark(
+        "filter_and_group_series",
+        "Group a number question by a question with answer options.",
+        _filter_and_group_series,
+    ),
+    Benchmark(
+        "dispatch",
+        "Run analysis scripts counting values and describing the survey.",
+        _dispatch,
+    ),
+    Benchmark(
+        "plot_bar_chart",
+        "Plot answer counts of questions with answer options.",
+        _plot_bar_chart,
+    ),
+    Benchmark(
+        "plot_box_chart",
+        "Plot answers to decimal number questions.",
+        _plot_box_chart,
+    ),
+    Benchmark(
+        "plot_matrix_chart",
+        "Plot grouped answers to yes / no questions.",
+        _plot_matrix_chart,
+    ),
+]
+"""All benchmarks, in the order in which they are run."""
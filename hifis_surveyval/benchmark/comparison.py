@@ -0,0 +1,248 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module compares benchmark results of two runs.
+
+Whether a benchmark became slower is decided by a one-sided permutation test
+on the mean of its timings. It does not assume the timings to be normally
+distributed and works for the small amount of repetitions benchmarks are
+usually run with. A change is only flagged if it is significant and larger
+than a threshold, so tiny but consistent changes do not raise alarms.
+"""
+import itertools
+import logging
+import math
+import random
+from typing import Dict, List, Sequence
+
+from hifis_surveyval.benchmark.results import BenchmarkRecord
+from hifis_surveyval.benchmark.runner import BenchmarkResult
+
+# Up to this many ways to split the timings, all of them are evaluated,
+# otherwise as many random splits are drawn
+_PERMUTATIONS: int = 10000
+
+
+def _p_value(baseline: Sequence[float], candidate: Sequence[float]) -> float:
+    """
+    Test whether the candidate timings are larger than the baseline timings.
+
+    Args:
+        baseline:
+            The timings of the earlier run.
+        candidate:
+            The timings of the later run.
+    Returns:
+        The probability to observe a candidate mean at least as large as the
+        actual one if both runs were equally fast.
+    """
+    pooled: List[float] = list(baseline) + list(candidate)
+    size: int = len(candidate)
+    # With the pooled timings fixed, the difference of the means only depends
+    # on the sum of the candidate timings
+    observed: float = sum(candidate) * (1 - 1e-9)
+    splits: int = math.factorial(len(pooled)) // (
+        math.factorial(size) * math.factorial(len(pooled) - size)
+    )
+    if splits <= _PERMUTATIONS:
+        larger: int = sum(
+            1
+            for split in itertools.combinations(pooled, size)
+            if sum(split) >= observed
+        )
+        return larger / splits
+
+    generator: random.Random = random.Random(0)
+    larger = sum(
+        1
+        for _ in range(_PERMUTATIONS)
+        if sum(generator.sample(pooled, size)) >= observed
+    )
+    return (larger + 1) / (_PERMUTATIONS + 1)
+
+
+class BenchmarkComparison(object):
+    """Compares the timings of a benchmark in two runs."""
+
+    REGRESSION: str = "SLOWER"
+    """The verdict on a benchmark that became significantly slower."""
+
+    IMPROVEMENT: str = "faster"
+    """The verdict on a benchmark that became significantly faster."""
+
+    def __init__(
+        self, baseline: BenchmarkResult, candidate: BenchmarkResult
+    ) -> None:
+        """
+        Set up a comparison.
+
+        Args:
+            baseline:
+                The result of the benchmark in the earlier run.
+            candidate:
+                The result of the benchmark in the later run.
+        """
+        self.name: str = candidate.name
+        self.baseline: BenchmarkResult = baseline
+        self.candidate: BenchmarkResult = candidate
+
+    @property
+    def change(self) -> float:
+        """
+        Get the relative change of the mean time.
+
+        Returns:
+            The change as a fraction of the baseline mean, positive if the
+            candidate is slower.
+        """
+        return self.candidate.mean / self.baseline.mean - 1
+
+    @property
+    def p_slower(self) -> float:
+        """
+        Get the significance of the candidate being slower.
+
+        Returns:
+            The p-value of the candidate timings being larger, 1 if either
+            run has a single timing only.
+        """
+        if len(self.baseline.timings) < 2 or len(self.candidate.timings) < 2:
+            return 1.0
+        return _p_value(self.baseline.timings, self.candidate.timings)
+
+    @property
+    def p_faster(self) -> float:
+        """
+        Get the significance of the candidate being faster.
+
+        Returns:
+            The p-value of the candidate timings being smaller, 1 if either
+            run has a single timing only.
+        """
+        if len(self.baseline.timings) < 2 or len(self.candidate.timings) < 2:
+            return 1.0
+        return _p_value(self.candidate.timings, self.baseline.timings)
+
+    def verdict(self, alpha: float, threshold: float) -> str:
+        """
+        Decide whether the benchmark became slower or faster.
+
+        Args:
+            alpha:
+                The significance level a change must reach.
+            threshold:
+                The minimum relative change of the mean time to be reported.
+        Returns:
+            REGRESSION or IMPROVEMENT if the change is significant and
+            exceeds the threshold, an empty string otherwise.
+        """
+        if self.change >= threshold and self.p_slower <= alpha:
+            return self.REGRESSION
+        if -self.change >= threshold and self.p_faster <= alpha:
+            return self.IMPROVEMENT
+        return ""
+
+    @classmethod
+    def compare(
+        cls, baseline: BenchmarkRecord, candidate: BenchmarkRecord
+    ) -> List["BenchmarkComparison"]:
+        """
+        Compare the benchmarks present in both records.
+
+        Differences in the scale or configuration of the runs and benchmarks
+        present in one record only are logged as warnings.
+
+        Args:
+            baseline:
+                The record of the earlier run.
+            candidate:
+                The record of the later run.
+        Returns:
+            The comparisons in the order of the candidate record.
+        """
+        for (aspect, earlier, later) in [
+            ("scale", baseline.scale, candidate.scale),
+            ("configuration", baseline.configuration,
+             candidate.configuration),
+        ]:
+            for key in sorted(set(earlier) | set(later)):
+                if earlier.get(key) != later.get(key):
+                    logging.warning(
+                        f"Runs differ in {aspect} {key}: "
+                        f"{earlier.get(key)} vs. {later.get(key)}"
+                    )
+
+        earlier_results: Dict[str, BenchmarkResult] = {
+            result.name: result for result in baseline.results
+        }
+        comparisons: List[BenchmarkComparison] = []
+        for result in candidate.results:
+            if result.name in earlier_results:
+                comparisons.append(cls(earlier_results.pop(result.name),
+                                       result))
+            else:
+                logging.warning(f"Benchmark {result.name} is new")
+        for name in earlier_results:
+            logging.warning(f"Benchmark {name} is missing")
+        return comparisons
+
+    @staticmethod
+    def summary(
+        comparisons: List["BenchmarkComparison"],
+        alpha: float,
+        threshold: float,
+    ) -> str:
+        """
+        Summarize comparisons as a table.
+
+        Args:
+            comparisons:
+                The comparisons of the benchmarks.
+            alpha:
+                The significance level a change must reach.
+            threshold:
+                The minimum relative change of the mean time to be reported.
+        Returns:
+            A text listing the mean times, their relative change, the
+            p-value of the change and the verdict on each benchmark.
+        """
+        width: int = max(
+            [len("Benchmark")]
+            + [len(comparison.name) for comparison in comparisons]
+        )
+        lines: List[str] = [
+            f"{'Benchmark':<{width}} {'Before [s]':>10} {'After [s]':>10} "
+            f"{'Change':>8} {'p':>6}  Verdict"
+        ]
+        for comparison in comparisons:
+            p_value: float = (
+                comparison.p_slower
+                if comparison.change >= 0
+                else comparison.p_faster
+            )
+            lines.append(
+                f"{comparison.name:<{width}} "
+                f"{comparison.baseline.mean:>10.4f} "
+                f"{comparison.candidate.mean:>10.4f} "
+                f"{comparison.change:>+8.1%} {p_value:>6.3f}  "
+                f"{comparison.verdict(alpha, threshold)}".rstrip()
+            )
+        return "\n".join(lines) + "\n"
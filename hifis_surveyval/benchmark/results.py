@@ -0,0 +1,260 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module persists benchmark results for later comparison.
+
+Besides the timings, a results file records the scale of the generated
+survey, the relevant settings, the machine the benchmarks ran on and the
+version of the framework, so results of different releases can be told
+apart.
+"""
+import datetime
+import json
+import os
+import platform
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy
+import pandas
+import pkg_resources
+
+import hifis_surveyval
+from hifis_surveyval.benchmark.runner import BenchmarkResult
+from hifis_surveyval.core.settings import Settings
+
+
+class BenchmarkRecord(object):
+    """Holds the results of a benchmark run together with its context."""
+
+    FORMAT_VERSION: int = 1
+    """The version of the results file format written by this class."""
+
+    CONFIGURATION: List[str] = [
+        "CSV_ENGINE",
+        "CSV_CHUNK_SIZE",
+        "DECODE_WORKERS",
+        "METADATA_WORKERS",
+        "SCRIPT_WORKERS",
+        "LAZY_METADATA",
+    ]
+    """The settings affecting the benchmarks that are recorded."""
+
+    def __init__(
+        self,
+        results: List[BenchmarkResult],
+        scale: Dict[str, int],
+        configuration: Dict[str, Any],
+        machine: Dict[str, Any],
+        version: str,
+        commit: Optional[str],
+        created: str,
+    ) -> None:
+        """
+        Set up a record of benchmark results.
+
+        Args:
+            results:
+                The timings of the benchmarks that ran.
+            scale:
+                The amount of participants and questions, the seed and the
+                amount of repetitions of the run.
+            configuration:
+                The values of the settings listed in CONFIGURATION.
+            machine:
+                Information about the machine and the Python environment.
+            version:
+                The version of the framework that was measured.
+            commit:
+                The git commit the framework was run from, if known.
+            created:
+                When the benchmarks were run, in ISO format.
+        """
+        self.results: List[BenchmarkResult] = results
+        self.scale: Dict[str, int] = scale
+        self.configuration: Dict[str, Any] = configuration
+        self.machine: Dict[str, Any] = machine
+        self.version: str = version
+        self.commit: Optional[str] = commit
+        self.created: str = created
+
+    @classmethod
+    def collect(
+        cls,
+        settings: Settings,
+        results: List[BenchmarkResult],
+        scale: Dict[str, int],
+    ) -> "BenchmarkRecord":
+        """
+        Record the results of a benchmark run on this machine.
+
+        Args:
+            settings:
+                The settings the benchmarks ran with.
+            results:
+                The timings of the benchmarks that ran.
+            scale:
+                The amount of participants and questions, the seed and the
+                amount of repetitions of the run.
+        Returns:
+            The record of the results together with their context.
+        """
+        configuration: Dict[str, Any] = {
+            name: str(getattr(settings, name)) for name in cls.CONFIGURATION
+        }
+        return cls(
+            results=results,
+            scale=scale,
+            configuration=configuration,
+            machine=cls._machine(),
+            version=cls._version(),
+            commit=cls._commit(),
+            created=datetime.datetime.now().isoformat(timespec="seconds"),
+        )
+
+    @classmethod
+    def read(cls, path: Path) -> "BenchmarkRecord":
+        """
+        Read a results file.
+
+        Args:
+            path:
+                The results file to be read.
+        Returns:
+            The record stored in the file.
+        Raises:
+            ValueError:
+                If the file is not a results file of a supported version.
+        """
+        content: Dict[str, Any] = json.loads(path.read_text())
+        if content.get("format") != cls.FORMAT_VERSION:
+            raise ValueError(f"{path} is not a supported results file")
+        return cls(
+            results=[
+                BenchmarkResult(entry["name"], entry["timings"])
+                for entry in content["results"]
+            ],
+            scale=content["scale"],
+            configuration=content["configuration"],
+            machine=content["machine"],
+            version=content["version"],
+            commit=content["commit"],
+            created=content["created"],
+        )
+
+    def write(self, path: Path) -> None:
+        """
+        Write the record into a results file.
+
+        Args:
+            path:
+                The results file to be written. It is replaced if it exists.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary: Path = path.with_name(f".{path.name}.tmp")
+        temporary.write_text(
+            json.dumps(
+                {
+                    "format": self.FORMAT_VERSION,
+                    "created": self.created,
+                    "version": self.version,
+                    "commit": self.commit,
+                    "machine": self.machine,
+                    "scale": self.scale,
+                    "configuration": self.configuration,
+                    "results": [result.as_dict() for result in self.results],
+                },
+                indent=2,
+            )
+        )
+        os.replace(temporary, path)
+
+    def description(self) -> str:
+        """
+        Describe what was measured in one line.
+
+        Returns:
+            The version, commit and scale of the run.
+        """
+        commit: str = f", commit {self.commit[:12]}" if self.commit else ""
+        return (
+            f"version {self.version}{commit}, "
+            f"{self.scale['participants']} participants x "
+            f"{self.scale['questions']} questions, "
+            f"{self.scale['repeat']} repetitions, {self.created}"
+        )
+
+    @staticmethod
+    def _machine() -> Dict[str, Any]:
+        """
+        Get information about this machine and the Python environment.
+
+        Returns:
+            The platform, processor, CPU count and the versions of Python and
+            the libraries doing the heavy lifting.
+        """
+        return {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "pandas": pandas.__version__,
+        }
+
+    @staticmethod
+    def _version() -> str:
+        """
+        Get the version of the framework.
+
+        Returns:
+            The installed version, "unknown" if the framework is not
+            installed.
+        """
+        try:
+            return pkg_resources.require("hifis_surveyval")[0].version
+        except pkg_resources.DistributionNotFound:
+            return "unknown"
+
+    @staticmethod
+    def _commit() -> Optional[str]:
+        """
+        Get the git commit the framework is run from.
+
+        Returns:
+            The commit hash, suffixed with "-dirty" if there are uncommitted
+            changes, or None if the framework is not run from a git
+            repository, e.g. if it was installed as a package.
+        """
+        repository: Path = Path(hifis_surveyval.__file__).parent.parent
+        if not (repository / ".git").exists():
+            return None
+        try:
+            return subprocess.run(
+                ["git", "describe", "--always", "--dirty", "--abbrev=40"],
+                cwd=repository,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,185 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""This module runs benchmarks and summarizes their timings."""
+import gc
+import logging
+import statistics
+import time
+from typing import Any, Dict, List
+
+from hifis_surveyval.benchmark.benchmarks import (
+    Benchmark, BenchmarkEnvironment, Operation,
+)
+
+
+class BenchmarkResult(object):
+    """Holds the timings of a benchmark."""
+
+    def __init__(self, name: str, timings: List[float]) -> None:
+        """
+        Set up the result of a benchmark.
+
+        Args:
+            name:
+                The name of the benchmark.
+            timings:
+                The time in seconds each repetition of the benchmark took.
+        """
+        self.name: str = name
+        self.timings: List[float] = timings
+
+    @property
+    def minimum(self) -> float:
+        """
+        Get the shortest time the benchmark took.
+
+        Returns:
+            The shortest time in seconds.
+        """
+        return min(self.timings)
+
+    @property
+    def mean(self) -> float:
+        """
+        Get the average time the benchmark took.
+
+        Returns:
+            The average time in seconds.
+        """
+        return statistics.mean(self.timings)
+
+    @property
+    def deviation(self) -> float:
+        """
+        Get the standard deviation of the times the benchmark took.
+
+        Returns:
+            The sample standard deviation in seconds, 0 if the benchmark was
+            run only once.
+        """
+        if len(self.timings) < 2:
+            return 0.0
+        return statistics.stdev(self.timings)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the result in a form that can be serialized as JSON.
+
+        Returns:
+            A dictionary holding the name, the timings and their statistics.
+        """
+        return {
+            "name": self.name,
+            "timings": self.timings,
+            "minimum": self.minimum,
+            "mean": self.mean,
+            "deviation": self.deviation,
+        }
+
+
+class BenchmarkRunner(object):
+    """Runs benchmarks in an environment of generated survey data."""
+
+    def __init__(
+        self, environment: BenchmarkEnvironment, repeat: int = 5
+    ) -> None:
+        """
+        Set up a runner.
+
+        Args:
+            environment:
+                The environment holding the generated survey data.
+            repeat:
+                How often each benchmark is run.
+        Raises:
+            ValueError:
+                If the benchmarks are to be run less than once.
+        """
+        if repeat < 1:
+            raise ValueError("Benchmarks must be run at least once")
+        self.environment: BenchmarkEnvironment = environment
+        self.repeat: int = repeat
+
+    def run(self, benchmark: Benchmark) -> BenchmarkResult:
+        """
+        Run a benchmark repeatedly.
+
+        The operation of the benchmark is prepared anew for each repetition
+        and garbage is collected before it starts, so the measurements do not
+        affect each other.
+
+        Args:
+            benchmark:
+                The benchmark to be run.
+        Returns:
+            The timings of the benchmark.
+        """
+        logging.info(f"Running benchmark {benchmark.name}")
+        timings: List[float] = []
+        for _ in range(self.repeat):
+            operation: Operation = benchmark.prepare(self.environment)
+            gc.collect()
+            start: float = time.perf_counter()
+            operation()
+            timings.append(time.perf_counter() - start)
+            # Release whatever the operation holds on to, e.g. a data
+            # container whose IDs the next preparation needs
+            del operation
+            gc.collect()
+        return BenchmarkResult(benchmark.name, timings)
+
+    def run_all(self, benchmarks: List[Benchmark]) -> List[BenchmarkResult]:
+        """
+        Run benchmarks one after another.
+
+        Args:
+            benchmarks:
+                The benchmarks to be run, in order.
+        Returns:
+            The timings of each benchmark, in the same order.
+        """
+        return [self.run(benchmark) for benchmark in benchmarks]
+
+    @staticmethod
+    def summary(results: List[BenchmarkResult]) -> str:
+        """
+        Summarize the timings of benchmarks as a table.
+
+        Args:
+            results:
+                The timings of the benchmarks.
+        Returns:
+            A text listing the shortest and average time and the standard
+            deviation of each benchmark.
+        """
+        width: int = max(
+            [len("Benchmark")] + [len(result.name) for result in results]
+        )
+        lines: List[str] = [
+            f"{'Benchmark':<{width}} {'Min [s]':>10} {'Mean [s]':>10} "
+            f"{'StdDev [s]':>10}"
+        ]
+        for result in results:
+            lines.append(
+                f"{result.name:<{width}} {result.minimum:>10.4f} "
+                f"{result.mean:>10.4f} {result.deviation:>10.4f}"
+            )
+        return "\n".join(lines) + "\n"
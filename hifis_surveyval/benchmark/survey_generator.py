@@ -0,0 +1,299 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module generates synthetic survey data for benchmarks.
+
+The generated data resemble a LimeSurvey export: a CSV file with one row per
+participant and one column per question, accompanied by YAML metadata files
+describing the questions. Questions are of the following kinds, mixed at
+random:
+
+* bool: Yes / No answers,
+* int: whole numbers,
+* float: decimal numbers,
+* str: free text,
+* option: one of several answer options, given by the option ID.
+
+A fraction of the answers is left empty, as participants usually skip some
+questions. The same parameters and seed always produce the same data.
+"""
+import csv
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy
+import yaml
+
+from hifis_surveyval.core.settings import Settings
+
+# Pre-formatted answers the generated answers are picked from
+_MAX_OPTIONS: int = 8
+_BOOLEANS: numpy.ndarray = numpy.array(["Yes", "No"], dtype=object)
+_INTEGERS: numpy.ndarray = numpy.array(
+    [str(number) for number in range(100)], dtype=object
+)
+_DECIMALS: numpy.ndarray = numpy.array(
+    [f"{number / 100:.2f}" for number in range(10000)], dtype=object
+)
+_TEXTS: numpy.ndarray = numpy.array(
+    [f"text{number}" for number in range(1000)], dtype=object
+)
+_OPTIONS: numpy.ndarray = numpy.array(
+    [f"A{number + 1:03d}" for number in range(_MAX_OPTIONS)],
+    dtype=object,
+)
+
+
+class SurveyGenerator(object):
+    """Generates survey data and metadata of a given scale."""
+
+    KINDS: Dict[str, float] = {
+        "bool": 0.2,
+        "int": 0.15,
+        "float": 0.15,
+        "str": 0.1,
+        "option": 0.4,
+    }
+    """The kinds of questions and how likely each kind is to be chosen."""
+
+    MISSING_ANSWERS: float = 0.05
+    """The fraction of answers left empty."""
+
+    QUESTIONS_PER_COLLECTION: int = 10
+    """The maximum amount of questions grouped into a question collection."""
+
+    COLLECTIONS_PER_FILE: int = 50
+    """The maximum amount of question collections per metadata file."""
+
+    ROWS_PER_CHUNK: int = 10000
+    """The amount of participants generated at once."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        participants: int,
+        questions: int,
+        seed: int = 0,
+    ) -> None:
+        """
+        Set up a generator.
+
+        Args:
+            settings:
+                The settings determining the ID column and how IDs are
+                composed.
+            participants:
+                The amount of participants, i.e. rows of the survey data.
+            questions:
+                The amount of questions, i.e. columns of the survey data. Each
+                kind of question occurs at least once.
+            seed:
+                The seed of the random numbers the data is generated from.
+        Raises:
+            ValueError:
+                If there are no participants or less questions than kinds of
+                questions.
+        """
+        if participants < 1 or questions < len(self.KINDS):
+            raise ValueError(
+                f"At least one participant and {len(self.KINDS)} questions "
+                f"are required"
+            )
+        self.settings: Settings = settings
+        self.participants: int = participants
+        self.questions: int = questions
+        self.seed: int = seed
+
+        random = numpy.random.default_rng(seed)
+        kinds: List[str] = list(self.KINDS.keys())
+        chosen_kinds = random.choice(
+            kinds, size=questions, p=list(self.KINDS.values())
+        )
+        # Make sure each kind occurs at least once
+        chosen_kinds[:len(kinds)] = random.permutation(kinds)
+        option_counts = random.integers(3, _MAX_OPTIONS + 1, size=questions)
+
+        separator: str = settings.HIERARCHY_SEPARATOR
+        self._columns: List[Tuple[str, str, int]] = []
+        for index in range(questions):
+            collection_id: str = (
+                f"C{index // self.QUESTIONS_PER_COLLECTION + 1:04d}"
+            )
+            question_id: str = (
+                f"Q{index % self.QUESTIONS_PER_COLLECTION + 1:03d}"
+            )
+            self._columns.append((
+                f"{collection_id}{separator}{question_id}",
+                str(chosen_kinds[index]),
+                int(option_counts[index]),
+            ))
+
+    def question_ids(self, kind: str) -> List[str]:
+        """
+        Get the full IDs of the questions of a kind.
+
+        Args:
+            kind:
+                One of the question kinds listed in KINDS.
+        Returns:
+            The full IDs of all questions of the given kind, in the order of
+            the columns in the survey data.
+        """
+        return [
+            full_id
+            for (full_id, question_kind, _) in self._columns
+            if question_kind == kind
+        ]
+
+    def write(self, folder: Path) -> Tuple[List[Path], Path]:
+        """
+        Write the metadata and the survey data into a folder.
+
+        Args:
+            folder:
+                The folder to write into. It is created if necessary.
+        Returns:
+            A tuple of the written metadata files and the survey data file.
+        """
+        metadata_folder: Path = folder / "metadata"
+        metadata_folder.mkdir(parents=True, exist_ok=True)
+        collections: List[Dict] = self._metadata()
+        metadata_files: List[Path] = []
+        for start in range(0, len(collections), self.COLLECTIONS_PER_FILE):
+            metadata_file: Path = (
+                metadata_folder
+                / f"metadata-{start // self.COLLECTIONS_PER_FILE + 1:04d}.yml"
+            )
+            metadata_file.write_text(
+                yaml.safe_dump(
+                    collections[start:start + self.COLLECTIONS_PER_FILE],
+                    sort_keys=False,
+                )
+            )
+            metadata_files.append(metadata_file)
+
+        survey_data: Path = folder / "survey_data.csv"
+        logging.info(
+            f"Generating {self.participants} participants answering "
+            f"{self.questions} questions into {survey_data}"
+        )
+        with survey_data.open("w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(
+                [self.settings.ID_COLUMN_NAME]
+                + [full_id for (full_id, _, _) in self._columns]
+            )
+            random = numpy.random.default_rng(self.seed + 1)
+            for start in range(0, self.participants, self.ROWS_PER_CHUNK):
+                size: int = min(
+                    self.ROWS_PER_CHUNK, self.participants - start
+                )
+                columns: List[Iterable] = [range(start + 1, start + size + 1)]
+                for (_, kind, option_count) in self._columns:
+                    columns.append(
+                        self._answers(random, kind, option_count, size)
+                    )
+                writer.writerows(zip(*columns))
+
+        return (metadata_files, survey_data)
+
+    def _metadata(self) -> List[Dict]:
+        """
+        Describe the generated questions as metadata.
+
+        Returns:
+            The question collections as they are to be written into the YAML
+            metadata files.
+        """
+        separator: str = self.settings.HIERARCHY_SEPARATOR
+        collections: Dict[str, Dict] = {}
+        for (full_id, kind, option_count) in self._columns:
+            (collection_id, question_id) = full_id.split(separator)
+            if collection_id not in collections:
+                collections[collection_id] = {
+                    "id": collection_id,
+                    "label": f"Collection {collection_id}",
+                    "text": {
+                        "en": f"Generated question collection {collection_id}"
+                    },
+                    "questions": [],
+                }
+
+            question: Dict = {
+                "id": question_id,
+                "label": f"Question {full_id}",
+                "text": {"en": f"Generated {kind} question {full_id}"},
+                "datatype": "str" if kind == "option" else kind,
+                "mandatory": False,
+            }
+            if kind == "option":
+                question["answers"] = [
+                    {
+                        "id": f"A{option + 1:03d}",
+                        "label": f"Option {option + 1}",
+                        "text": {"en": f"Generated option {option + 1}"},
+                    }
+                    for option in range(option_count)
+                ]
+            collections[collection_id]["questions"].append(question)
+        return list(collections.values())
+
+    @classmethod
+    def _answers(
+        cls,
+        random: numpy.random.Generator,
+        kind: str,
+        option_count: int,
+        size: int,
+    ) -> numpy.ndarray:
+        """
+        Generate the answers of participants to a question.
+
+        Args:
+            random:
+                The source of random numbers.
+            kind:
+                The kind of the question.
+            option_count:
+                The amount of answer options, if the question has options.
+            size:
+                The amount of answers to generate.
+        Returns:
+            The answers as they appear in the CSV file.
+        """
+        # Picking pre-formatted answers is much faster than formatting
+        # random numbers
+        if kind == "bool":
+            answers = _BOOLEANS[random.integers(0, 2, size=size)]
+        elif kind == "int":
+            answers = _INTEGERS[random.integers(0, 100, size=size)]
+        elif kind == "float":
+            answers = _DECIMALS[
+                random.normal(5000, 1500, size=size)
+                .round().clip(0, len(_DECIMALS) - 1).astype(int)
+            ]
+        elif kind == "str":
+            answers = _TEXTS[random.integers(0, len(_TEXTS), size=size)]
+        else:
+            answers = _OPTIONS[random.integers(0, option_count, size=size)]
+        answers[random.random(size) < cls.MISSING_ANSWERS] = ""
+        return answers
@@ -42,18 +42,30 @@ It can be used as a handy facility for running the task from a command line.
 """
 import logging
 import pathlib
-from csv import reader
+import sys
+import tempfile
+from typing import List, Optional, Tuple
 
 import click
 import pkg_resources
-import yaml
 
 from hifis_surveyval.core import util
+from hifis_surveyval.core.analysis_server import AnalysisServer
 from hifis_surveyval.core.dispatch import Dispatcher
+from hifis_surveyval.core.file_watcher import FileWatcher
+from hifis_surveyval.core.memory_report import MemoryReport, MemoryStages
+from hifis_surveyval.core.metadata_loader import MetadataLoader
 from hifis_surveyval.core.preprocess import Preprocessor
+from hifis_surveyval.core.run_cache import RunCache
+from hifis_surveyval.core.script_profiler import ProfileReport, ScriptProfile
 from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.snapshot_cache import SnapshotCache
+from hifis_surveyval.core.survey_data_reader import SurveyDataReader
+from hifis_surveyval.core.tracer import Tracer
 from hifis_surveyval.data_container import DataContainer
 from hifis_surveyval.hifis_surveyval import HIFISSurveyval
+from hifis_surveyval.plotting.supported_output_format import \
+    SupportedOutputFormat
 
 settings: Settings = Settings()
 
@@ -175,60 +187,574 @@ def init(
         util.create_custom_plot_style_template()
 
 
-@click.argument(
-    "survey_data",
-    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
-)
-@cli.command()
-def analyze(survey_data: pathlib.Path) -> None:
+def _load_survey(
+    survey_data: pathlib.Path,
+) -> Tuple[DataContainer, List[pathlib.Path]]:
     """
-    Read the survey data and run all defined analysis scripts.
-
-    The metadata are read from a file specified in the settings.
+    Load the metadata and the survey data as given in the settings.
 
     Args:
-        survey_data (click.File): File that contains all data for the analysis.
+        survey_data (pathlib.Path): File that contains all data for the
+            analysis.
+    Returns:
+        The loaded data, before preprocessing, and the metadata files they
+        were loaded from.
     """
-    settings.load_config_file()
-
     if not survey_data.suffix.lower() == ".csv":
         logging.error("Loaded data file seems not to be a CSV file.")
         # TODO Should we also use a regex to look whether the contents matches
         #  the expected pattern of CSVs?
 
-    surveyval: HIFISSurveyval = HIFISSurveyval(settings=settings)
-    raw_data: DataContainer = DataContainer(settings=settings)
-    logging.info(f"Analyzing file {survey_data.name}")
-
     # Load the metadata
     logging.info(f"Attempt to load metadata from {settings.METADATA}")
     yaml_files = [file for file in settings.METADATA.iterdir()]
-    # Filter out those files that do not have a YAML file extension
-    yaml_files = list(filter(
+    # Filter out those files that do not have a YAML file extension and
+    # sort them, so they are always loaded in the same order
+    yaml_files = sorted(filter(
         lambda file: file.suffix.lower() in [".yml", ".yaml"],
         yaml_files
     ))
 
-    for file in yaml_files:
-        logging.debug(f"Loading Metadata from {file}")
-        with file.open(mode="r", encoding="utf-8") as io_stream:
-            metadata_yaml = yaml.safe_load(io_stream)
-            raw_data.load_metadata(metadata_yaml)
+    # Restore metadata and survey data from a previous run if possible
+    raw_data: Optional[DataContainer] = None
+    snapshot_key: Optional[str] = None
+    if settings.SNAPSHOT_CACHE:
+        snapshot_key = SnapshotCache.key_for(
+            settings=settings,
+            survey_data=survey_data,
+            metadata_files=yaml_files,
+        )
+        raw_data = SnapshotCache.load(settings=settings, key=snapshot_key)
+
+    if raw_data is None:
+        raw_data = DataContainer(settings=settings)
+
+        with MemoryStages.stage("metadata loading"):
+            MetadataLoader.load(
+                settings=settings, metadata_files=yaml_files, data=raw_data
+            )
+
+        #  Load the actual survey data
+        logging.info(f"Attempt to load survey data from {survey_data}")
+        with MemoryStages.stage("survey data loading"):
+            SurveyDataReader.read(
+                settings=settings, survey_data=survey_data, data=raw_data
+            )
+
+        if snapshot_key is not None:
+            SnapshotCache.store(
+                settings=settings, key=snapshot_key, data=raw_data
+            )
+
+    return (raw_data, yaml_files)
+
+
+@click.argument(
+    "survey_data",
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+)
+@cli.command()
+@click.option(
+    "--watch",
+    "-w",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Keep the data loaded and re-run analysis scripts whenever they "
+    "change. A change to the preprocessing script re-runs the "
+    "preprocessing and all analysis scripts.",
+)
+@click.option(
+    "--trace",
+    "-t",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    default=None,
+    help="Record how long each stage of the run takes and write the timeline "
+    "into this file in Chrome trace format, e.g. for viewing in "
+    "https://ui.perfetto.dev.",
+)
+@click.option(
+    "--memory",
+    "-m",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Report the memory held by each question collection and question "
+    "and the peak memory of each stage of the run. The report is written "
+    "into the output folder.",
+)
+def analyze(
+    survey_data: pathlib.Path,
+    watch: bool,
+    trace: Optional[pathlib.Path],
+    memory: bool,
+) -> None:
+    r"""
+    Read the survey data and run all defined analysis scripts.
+
+    The metadata are read from a file specified in the settings.
+    \f
+
+    Args:
+        survey_data (click.File): File that contains all data for the analysis.
+        watch (bool):
+            Indicates whether to watch the scripts for changes after the
+            first run. (Default: False)
+        trace (Optional[pathlib.Path]):
+            File to write the timeline of the run into, if given.
+        memory (bool):
+            Indicates whether to report the memory usage of the run.
+            (Default: False)
+    """
+    settings.load_config_file()
+
+    if trace is not None:
+        Tracer.enable()
+    if memory:
+        MemoryStages.enable()
+    try:
+        _analyze(survey_data=survey_data, watch=watch, memory=memory)
+    finally:
+        MemoryStages.disable()
+        if trace is not None:
+            Tracer.write(trace)
+            Tracer.disable()
+            click.echo(f"Trace written to {trace}")
+
+
+def _analyze(survey_data: pathlib.Path, watch: bool, memory: bool) -> None:
+    """
+    Load and preprocess the survey data and run the analysis scripts.
+
+    Args:
+        survey_data (pathlib.Path): File that contains all data for the
+            analysis.
+        watch (bool): Whether to watch the scripts for changes after the
+            first run.
+        memory (bool): Whether to report the memory usage after the first
+            run.
+    """
 
-    #  Load the actual survey data
-    logging.info(f"Attempt to load survey data from {survey_data}")
-    with survey_data.open(mode="r", encoding="utf-8") as data_io_stream:
-        csv_reader = reader(data_io_stream)
-        raw_data.load_survey_data(csv_data=list(csv_reader))
+    surveyval: HIFISSurveyval = HIFISSurveyval(settings=settings)
+    logging.info(f"Analyzing file {survey_data.name}")
+    (raw_data, yaml_files) = _load_survey(survey_data)
 
     # preprocess the data
-    preprocessed_data: DataContainer = Preprocessor.preprocess(
-        settings=settings, data=raw_data
-    )
+    # When watching, the raw data are kept unmodified so the preprocessing
+    # can be repeated after the preprocessing script changed.
+    with MemoryStages.stage("preprocessing"):
+        preprocessed_data: DataContainer = Preprocessor.preprocess(
+            settings=settings, data=raw_data.snapshot() if watch else raw_data
+        )
+
+    # Re-use the outputs of unchanged scripts if possible
+    run_cache: Optional[RunCache] = None
+    if settings.INCREMENTAL:
+        if settings.OUTPUT_FORMAT == SupportedOutputFormat.SCREEN:
+            logging.warning(
+                "Incremental runs are not possible for output format SCREEN, "
+                "running all analysis scripts."
+            )
+        else:
+            run_cache = RunCache(
+                settings=settings,
+                data_fingerprint=RunCache.data_fingerprint_for(
+                    settings=settings,
+                    survey_data=survey_data,
+                    metadata_files=yaml_files,
+                ),
+            )
 
     # run analysis scripts
     dispatcher: Dispatcher = Dispatcher(
-        surveyval=surveyval, data=preprocessed_data
+        surveyval=surveyval, data=preprocessed_data, run_cache=run_cache
     )
     dispatcher.discover()
-    dispatcher.load_all_modules()
+    with MemoryStages.stage("analysis scripts"):
+        dispatcher.load_all_modules()
+    _echo_profiles(dispatcher)
+
+    if memory:
+        report: MemoryReport = preprocessed_data.memory_report()
+        report.write(settings=settings, stages=MemoryStages.take_stages())
+        click.echo(report.summary())
+
+    if watch:
+        _watch(surveyval=surveyval, raw_data=raw_data, data=preprocessed_data)
+
+
+def _echo_profiles(dispatcher: Dispatcher) -> None:
+    """
+    Print a summary of the profiles of the analysis scripts run last.
+
+    Nothing is printed if the scripts were not profiled.
+
+    Args:
+        dispatcher (Dispatcher): The dispatcher that ran the scripts.
+    """
+    profiles: List[ScriptProfile] = dispatcher.profiles
+    if profiles:
+        click.echo(ProfileReport.summary(profiles), nl=False)
+
+
+def _watch(
+    surveyval: HIFISSurveyval, raw_data: DataContainer, data: DataContainer
+) -> None:
+    """
+    Re-run analysis scripts whenever they or the preprocessing script change.
+
+    Only changed scripts and the scripts depending on their results are
+    re-run against the data kept in memory. A change to the preprocessing
+    script re-runs the preprocessing on the raw data and all analysis
+    scripts afterwards. Watching stops on keyboard interrupt.
+
+    Args:
+        surveyval (HIFISSurveyval): The framework object for the scripts.
+        raw_data (DataContainer): The data as loaded, before preprocessing.
+        data (DataContainer): The preprocessed data.
+    """
+    watcher: FileWatcher = FileWatcher(settings=settings)
+    click.echo(
+        f"Watching {settings.SCRIPT_FOLDER} and "
+        f"{settings.PREPROCESSING_FILENAME} for changes, "
+        f"press Ctrl+C to stop."
+    )
+    try:
+        while True:
+            changed: List[pathlib.Path] = watcher.wait_for_changes()
+            logging.info(
+                "Detected changes in "
+                f"{', '.join(str(path) for path in changed)}"
+            )
+            try:
+                preprocessing_changed: bool = (
+                    settings.PREPROCESSING_FILENAME in changed
+                )
+                if preprocessing_changed:
+                    data = Preprocessor.preprocess(
+                        settings=settings, data=raw_data.snapshot()
+                    )
+
+                dispatcher: Dispatcher = Dispatcher(
+                    surveyval=surveyval, data=data
+                )
+                dispatcher.discover()
+                if preprocessing_changed:
+                    dispatcher.load_all_modules()
+                else:
+                    dispatcher.load_changed_modules(
+                        path.stem for path in changed
+                    )
+                _echo_profiles(dispatcher)
+            except Exception:
+                # Keep watching, the next change may well fix the problem
+                logging.exception("Failed to re-run the analysis.")
+    except KeyboardInterrupt:
+        click.echo("Stopped watching for changes.")
+
+
+@click.argument(
+    "survey_data",
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+)
+@cli.command()
+def serve(survey_data: pathlib.Path) -> None:
+    r"""
+    Keep the survey data loaded and run analysis scripts submitted to it.
+
+    Scripts are submitted with the run command and executed against the
+    preprocessed data held in memory, so the data do not need to be loaded
+    for each script. The server listens on the socket given in the
+    settings until it is interrupted.
+    \f
+
+    Args:
+        survey_data (click.File): File that contains all data for the analysis.
+    """
+    settings.load_config_file()
+
+    surveyval: HIFISSurveyval = HIFISSurveyval(settings=settings)
+    server: AnalysisServer = AnalysisServer(surveyval=surveyval)
+    try:
+        server.listen()
+    except RuntimeError as error:
+        logging.error(error)
+        sys.exit(1)
+
+    try:
+        logging.info(f"Serving file {survey_data.name}")
+        (raw_data, _) = _load_survey(survey_data)
+        data: DataContainer = Preprocessor.preprocess(
+            settings=settings, data=raw_data
+        )
+
+        click.echo(
+            f"Accepting analysis scripts on {settings.SERVER_SOCKET}, "
+            f"press Ctrl+C to stop."
+        )
+        server.serve(data)
+    except KeyboardInterrupt:
+        click.echo("Stopped serving.")
+    finally:
+        server.close()
+
+
+@click.argument(
+    "scripts",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+)
+@cli.command()
+def run(scripts: Tuple[pathlib.Path, ...]) -> None:
+    r"""
+    Run analysis scripts on a server started with the serve command.
+
+    The scripts are run one after another. Their console output and log
+    messages are shown while they are running.
+    \f
+
+    Args:
+        scripts (Tuple[pathlib.Path, ...]): The analysis scripts to be run.
+    """
+    settings.load_config_file()
+
+    failed_scripts: List[str] = []
+    for script in scripts:
+        try:
+            if not AnalysisServer.submit(settings=settings, script=script):
+                failed_scripts.append(script.name)
+        except ConnectionError as error:
+            logging.error(f"{error} Start one with the serve command.")
+            sys.exit(1)
+
+    if failed_scripts:
+        logging.error(
+            f"{len(failed_scripts)} of {len(scripts)} scripts failed: "
+            f"{', '.join(failed_scripts)}"
+        )
+        sys.exit(1)
+
+
+@cli.command()
+@click.option(
+    "--participants",
+    "-p",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Amount of participants in the generated survey data.",
+)
+@click.option(
+    "--questions",
+    "-q",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="Amount of questions in the generated survey data, at least one "
+    "per kind of question.",
+)
+@click.option(
+    "--repeat",
+    "-r",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="How often each benchmark is run.",
+)
+@click.option(
+    "--seed",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Seed of the random numbers the survey data is generated from.",
+)
+@click.option(
+    "--benchmark",
+    "-b",
+    "selected",
+    multiple=True,
+    help="Only run the benchmark of the given name. May be given multiple "
+    "times. Runs all benchmarks if omitted.",
+)
+@click.option(
+    "--folder",
+    "-f",
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    default=None,
+    help="Keep the generated survey data and outputs in this folder. "
+    "A temporary folder is used if omitted.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    default=None,
+    help="Write the results into this JSON file to compare them with "
+    "other runs later on.",
+)
+def benchmark(
+    participants: int,
+    questions: int,
+    repeat: int,
+    seed: int,
+    selected: Tuple[str, ...],
+    folder: Optional[pathlib.Path],
+    output: Optional[pathlib.Path],
+) -> None:
+    r"""
+    Measure the performance of the framework on generated survey data.
+
+    Survey data and metadata resembling a LimeSurvey export are generated
+    at the given scale. Then loading, transforming, analyzing and plotting
+    them is timed. The settings in the configuration file, like the CSV
+    engine or the amount of workers, are taken into account.
+    \f
+
+    Args:
+        participants (int): Amount of participants in the generated data.
+        questions (int): Amount of questions in the generated data.
+        repeat (int): How often each benchmark is run.
+        seed (int): Seed of the random numbers the data is generated from.
+        selected (Tuple[str, ...]): Names of the benchmarks to run, all if
+            empty.
+        folder (Optional[pathlib.Path]): Folder to keep the generated data
+            and outputs in, a temporary folder if not given.
+        output (Optional[pathlib.Path]): File to write the results into, if
+            given.
+    """
+    # The benchmarks are only imported when needed, so the other commands
+    # do not pay for it
+    from hifis_surveyval.benchmark.benchmarks import (
+        BENCHMARKS, Benchmark, BenchmarkEnvironment,
+    )
+    from hifis_surveyval.benchmark.results import BenchmarkRecord
+    from hifis_surveyval.benchmark.runner import (
+        BenchmarkResult, BenchmarkRunner,
+    )
+    from hifis_surveyval.benchmark.survey_generator import SurveyGenerator
+
+    if questions < len(SurveyGenerator.KINDS):
+        raise click.BadParameter(
+            f"{questions} is smaller than the amount of kinds of questions "
+            f"({len(SurveyGenerator.KINDS)}).",
+            param_hint="'--questions'",
+        )
+    names: List[str] = [benchmark.name for benchmark in BENCHMARKS]
+    unknown: List[str] = [name for name in selected if name not in names]
+    if unknown:
+        raise click.BadParameter(
+            f"Unknown benchmark {', '.join(unknown)}, choose from "
+            f"{', '.join(names)}.",
+            param_hint="'--benchmark'",
+        )
+
+    settings.load_config_file()
+
+    benchmarks: List[Benchmark] = [
+        benchmark for benchmark in BENCHMARKS
+        if not selected or benchmark.name in selected
+    ]
+    with tempfile.TemporaryDirectory(prefix="surveyval-benchmark-") as work:
+        environment: BenchmarkEnvironment = BenchmarkEnvironment(
+            settings=settings,
+            folder=folder or pathlib.Path(work),
+            participants=participants,
+            questions=questions,
+            seed=seed,
+        )
+        results: List[BenchmarkResult] = BenchmarkRunner(
+            environment, repeat=repeat
+        ).run_all(benchmarks)
+        # Release the data before the folder holding them is removed
+        environment.release()
+
+    click.echo(BenchmarkRunner.summary(results), nl=False)
+    if output:
+        BenchmarkRecord.collect(
+            settings=settings,
+            results=results,
+            scale={
+                "participants": participants,
+                "questions": questions,
+                "seed": seed,
+                "repeat": repeat,
+            },
+        ).write(output)
+        click.echo(f"Results written to {output}")
+
+
+@cli.command()
+@click.argument(
+    "baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+)
+@click.argument(
+    "candidate",
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+)
+@click.option(
+    "--alpha",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    default=0.05,
+    show_default=True,
+    help="Significance level a change of a benchmark must reach.",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.05,
+    show_default=True,
+    help="Minimum relative change of the mean time of a benchmark to be "
+    "flagged.",
+)
+def compare(
+    baseline: pathlib.Path,
+    candidate: pathlib.Path,
+    alpha: float,
+    threshold: float,
+) -> None:
+    r"""
+    Compare the results of two benchmark runs.
+
+    Benchmarks whose mean time in the CANDIDATE results is significantly
+    larger than in the BASELINE results are flagged as slower. The command
+    fails if any benchmark became slower, e.g. to stop a CI pipeline.
+    \f
+
+    Args:
+        baseline (pathlib.Path): Results file of the earlier run.
+        candidate (pathlib.Path): Results file of the later run.
+        alpha (float): Significance level a change must reach.
+        threshold (float): Minimum relative change of the mean time to be
+            flagged.
+    """
+    # Only imported when needed, see benchmark()
+    from hifis_surveyval.benchmark.comparison import BenchmarkComparison
+    from hifis_surveyval.benchmark.results import BenchmarkRecord
+
+    try:
+        records: List[BenchmarkRecord] = [
+            BenchmarkRecord.read(path) for path in [baseline, candidate]
+        ]
+    except ValueError as error:
+        raise click.ClickException(str(error))
+
+    click.echo(f"Baseline:  {records[0].description()}")
+    click.echo(f"Candidate: {records[1].description()}")
+    comparisons: List[BenchmarkComparison] = BenchmarkComparison.compare(
+        *records
+    )
+    click.echo(
+        BenchmarkComparison.summary(comparisons, alpha, threshold), nl=False
+    )
+
+    slower: int = sum(
+        1
+        for comparison in comparisons
+        if comparison.verdict(alpha, threshold)
+        == BenchmarkComparison.REGRESSION
+    )
+    if slower:
+        click.echo(f"{slower} of {len(comparisons)} benchmarks became slower")
+        sys.exit(1)
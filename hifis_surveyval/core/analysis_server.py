@@ -0,0 +1,344 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module allows running analysis scripts against resident survey data.
+
+An analysis server loads and preprocesses the survey data once and then
+accepts analysis scripts on a local Unix socket. Each submitted script runs
+in a forked child process against the data held by the server, so the
+scripts can neither affect each other nor the server. Everything the script
+writes to the console and all log records are streamed back to the client
+while the script is running.
+
+Clients send a single request per connection, a dictionary holding the
+"script" path, its "source" and the "verbosity" of the client. The server
+answers with a sequence of messages:
+
+* ("output", stream, text) for console output, where stream is either
+  "stdout" or "stderr",
+* ("record", record) for log records,
+* ("finished", failed) once the script ended.
+"""
+import logging
+import multiprocessing
+import os
+import sys
+import traceback
+import types
+from contextlib import redirect_stderr, redirect_stdout
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.data_container import DataContainer
+from hifis_surveyval.hifis_surveyval import HIFISSurveyval
+
+
+class _StreamSender(object):
+    """A text stream forwarding everything written to it to a client."""
+
+    def __init__(self, connection: Connection, stream: str) -> None:
+        """
+        Set up a stream for the connection to a client.
+
+        Args:
+            connection:
+                The connection to the client.
+            stream:
+                The name of the stream on the client side.
+        """
+        self._connection: Connection = connection
+        self._stream: str = stream
+
+    def write(self, text: str) -> int:
+        """
+        Send text to the client.
+
+        Args:
+            text:
+                The text to be written.
+        Returns:
+            The number of characters written.
+        """
+        if text:
+            self._connection.send(("output", self._stream, text))
+        return len(text)
+
+    def flush(self) -> None:
+        """Do nothing, since text is sent right away."""
+
+
+class _RecordSender(logging.Handler):
+    """Forwards log records to a client."""
+
+    def __init__(self, connection: Connection) -> None:
+        """
+        Set up a handler for the connection to a client.
+
+        Args:
+            connection:
+                The connection to the client.
+        """
+        super(_RecordSender, self).__init__()
+        self._connection: Connection = connection
+        self.failed: bool = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Send a log record in a form that can be pickled.
+
+        Args:
+            record:
+                The log record to be sent. Its message arguments and
+                exception information are resolved into text.
+        """
+        self.failed = self.failed or record.levelno >= logging.ERROR
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        self._connection.send(("record", record))
+
+
+class AnalysisServer(object):
+    """Runs submitted analysis scripts against the data it holds."""
+
+    def __init__(self, surveyval: HIFISSurveyval) -> None:
+        """
+        Set up a server.
+
+        Args:
+            surveyval:
+                The framework object to be passed to the analysis scripts.
+        """
+        self.surveyval: HIFISSurveyval = surveyval
+        self.data: Optional[DataContainer] = None
+        self._listener: Optional[Listener] = None
+
+    def listen(self) -> None:
+        """
+        Start listening on the socket given in the settings.
+
+        Clients connecting before serve() is called wait until then, so the
+        data can be loaded after the socket has been claimed.
+        A socket file left behind by a server that is no longer running is
+        replaced.
+
+        Raises:
+            RuntimeError:
+                If another server is listening on the socket already or
+                running scripts in child processes is not supported on this
+                platform.
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError(
+                "Serving analysis scripts is not supported on this platform."
+            )
+
+        socket_path: Path = self.surveyval.settings.SERVER_SOCKET
+        if socket_path.exists():
+            try:
+                Client(str(socket_path), family="AF_UNIX").close()
+            except OSError:
+                logging.info(f"Removing stale socket {socket_path}.")
+                socket_path.unlink()
+            else:
+                raise RuntimeError(
+                    f"Another server is listening on {socket_path} already."
+                )
+
+        # Only the current user may submit scripts
+        umask: int = os.umask(0o177)
+        try:
+            self._listener = Listener(str(socket_path), family="AF_UNIX")
+        finally:
+            os.umask(umask)
+        logging.info(f"Listening on {socket_path}.")
+
+    def serve(self, data: DataContainer) -> None:
+        """
+        Run submitted analysis scripts against the given data.
+
+        Make sure to run listen() beforehand. This blocks until interrupted
+        and closes the socket afterwards.
+
+        Args:
+            data:
+                The preprocessed data to be passed to the analysis scripts.
+        """
+        self.data = data
+        context = multiprocessing.get_context("fork")
+        try:
+            while True:
+                connection: Connection = self._listener.accept()
+                process = context.Process(
+                    target=self._serve_client, args=(connection,)
+                )
+                process.start()
+                connection.close()
+                # Clean up child processes that finished in the meantime
+                multiprocessing.active_children()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop listening and remove the socket."""
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def _serve_client(self, connection: Connection) -> None:
+        """
+        Run the script submitted by a client and stream back its outputs.
+
+        This is run in a child process for each client.
+
+        Args:
+            connection:
+                The connection to the client.
+        """
+        try:
+            request: Dict[str, Any] = connection.recv()
+        except EOFError:
+            return
+
+        script: Path = Path(request["script"])
+        sender: _RecordSender = _RecordSender(connection)
+        root_logger: logging.Logger = logging.getLogger()
+        root_logger.handlers = [sender]
+        root_logger.setLevel(request["verbosity"])
+
+        logging.info(f"Running Module {script.stem}.")
+        failed: bool = False
+        try:
+            with redirect_stdout(_StreamSender(connection, "stdout")), \
+                    redirect_stderr(_StreamSender(connection, "stderr")):
+                self._run_script(script, request["source"])
+        except Exception:
+            logging.exception(f"Module {script.stem} raised an error.")
+            failed = True
+
+        try:
+            connection.send(("finished", failed or sender.failed))
+        except OSError:
+            # The client went away, nobody is interested in the outcome
+            pass
+        connection.close()
+
+    def _run_script(self, script: Path, source: str) -> None:
+        """
+        Run an analysis script in the current process.
+
+        Each run writes its outputs to a fresh sub-folder of the output
+        folder, like a run of the analyze command would.
+
+        Args:
+            script:
+                The path of the script on the client side.
+            source:
+                The source code of the script.
+        """
+        settings: Settings = self.surveyval.settings
+        settings.RUN_TIMESTAMP = Settings.set_timestamp(None)
+        settings.ANALYSIS_OUTPUT_PATH = Settings.assemble_output_path(
+            None, settings.__dict__
+        )
+        settings.ANALYSIS_OUTPUT_PATH.mkdir(parents=True, exist_ok=True)
+        # Allow the script to import modules placed next to it
+        sys.path.insert(0, str(script.parent))
+
+        module = types.ModuleType(script.stem)
+        module.__file__ = str(script)
+        exec(compile(source, str(script), "exec"), module.__dict__)
+
+        try:
+            module.run(hifis_surveyval=self.surveyval, data=self.data)
+        except AttributeError as error:
+            traceback.print_exc()
+            logging.error(
+                f"Module {script.stem}: "
+                f"Error when calling run() - method: "
+                f"{error}."
+            )
+
+    @classmethod
+    def submit(cls, settings: Settings, script: Path) -> bool:
+        """
+        Run an analysis script on a running server.
+
+        The console output and log records of the script are reproduced
+        locally while the script is running.
+
+        Args:
+            settings:
+                The settings naming the socket of the server.
+            script:
+                The analysis script to be run.
+        Returns:
+            True if the script finished successfully, False otherwise.
+        Raises:
+            ConnectionError:
+                If no server is listening on the socket.
+        """
+        try:
+            connection: Connection = Client(
+                str(settings.SERVER_SOCKET), family="AF_UNIX"
+            )
+        except (FileNotFoundError, ConnectionRefusedError):
+            raise ConnectionError(
+                f"No analysis server is listening on "
+                f"{settings.SERVER_SOCKET}."
+            )
+
+        streams: Dict[str, TextIO] = {
+            "stdout": sys.stdout, "stderr": sys.stderr
+        }
+        with connection:
+            connection.send({
+                "script": str(script.resolve()),
+                "source": script.read_text(),
+                "verbosity": logging.getLogger().getEffectiveLevel(),
+            })
+            while True:
+                try:
+                    message: Tuple[Any, ...] = connection.recv()
+                except EOFError:
+                    logging.error(
+                        f"Module {script.stem}: The server closed the "
+                        f"connection unexpectedly."
+                    )
+                    return False
+
+                if message[0] == "output":
+                    streams[message[1]].write(message[2])
+                    streams[message[1]].flush()
+                elif message[0] == "record":
+                    record: logging.LogRecord = message[1]
+                    logger = logging.getLogger(record.name)
+                    if logger.isEnabledFor(record.levelno):
+                        logger.handle(record)
+                elif message[0] == "finished":
+                    return not message[1]
@@ -21,15 +21,143 @@
 """This module allows discovery and dispatch of analysis functions."""
 import copy
 import importlib.util
+import io
 import logging
+import multiprocessing
+import pickle
+import time
 import traceback
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from multiprocessing.connection import Connection, wait
 from pathlib import Path
-from typing import List
+from typing import (
+    Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple,
+)
 
+from hifis_surveyval.core.memory_report import MemoryStages
+from hifis_surveyval.core.run_cache import RunCache
+from hifis_surveyval.core.script_budget import ScriptBudget
+from hifis_surveyval.core.script_graph import ScriptGraph
+from hifis_surveyval.core.script_profiler import (
+    ProfileReport, ScriptProfile, ScriptProfiler,
+)
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.tracer import Tracer
 from hifis_surveyval.data_container import DataContainer
 from hifis_surveyval.hifis_surveyval import HIFISSurveyval
 
 
+class ScriptReport(object):
+    """Holds what an analysis script produced when run in a worker process."""
+
+    def __init__(
+        self,
+        module_name: str,
+        failed: bool,
+        records: List[logging.LogRecord],
+        output: str,
+        results: Dict[str, Any],
+        profile: Optional[ScriptProfile] = None,
+        spans: Optional[List[Dict[str, Any]]] = None,
+        memory_peak: Optional[int] = None,
+    ) -> None:
+        """
+        Set up a report for a finished analysis script.
+
+        Args:
+            module_name:
+                The name of the module containing the analysis script.
+            failed:
+                Whether the script raised an error or logged one.
+            records:
+                The log records emitted while the script was running.
+            output:
+                Everything the script wrote to the console.
+            results:
+                The results the script provides to other scripts.
+            profile:
+                The resources used by the script, if it was profiled.
+            spans:
+                The trace events recorded while the script was running, if
+                tracing is enabled.
+            memory_peak:
+                The peak of the memory traced in the worker process in
+                bytes, if the memory of the pipeline stages is sampled.
+        """
+        self.module_name: str = module_name
+        self.failed: bool = failed
+        self.records: List[logging.LogRecord] = records
+        self.output: str = output
+        self.results: Dict[str, Any] = results
+        self.profile: Optional[ScriptProfile] = profile
+        self.spans: List[Dict[str, Any]] = spans or []
+        self.memory_peak: Optional[int] = memory_peak
+
+
+class _RecordCollector(logging.Handler):
+    """Collects log records so they can be sent to another process."""
+
+    def __init__(self) -> None:
+        """Set up a collector without any records."""
+        super(_RecordCollector, self).__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Store a log record in a form that can be pickled.
+
+        Args:
+            record:
+                The log record to be stored. Its message arguments and
+                exception information are resolved into text.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        self.records.append(record)
+
+
+class _ErrorDetector(logging.Handler):
+    """Notices whether any errors are logged."""
+
+    def __init__(self) -> None:
+        """Set up a detector that did not notice any errors yet."""
+        super(_ErrorDetector, self).__init__(level=logging.ERROR)
+        self.detected: bool = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Note that an error was logged.
+
+        Args:
+            record:
+                The log record of the error.
+        """
+        self.detected = True
+
+
+@contextmanager
+def _collecting_records(collector: _RecordCollector) -> Iterator[None]:
+    """
+    Send all log records to a collector instead of the usual handlers.
+
+    Args:
+        collector:
+            The collector that is to receive the log records.
+    """
+    root_logger: logging.Logger = logging.getLogger()
+    handlers: List[logging.Handler] = root_logger.handlers
+    root_logger.handlers = [collector]
+    try:
+        yield
+    finally:
+        root_logger.handlers = handlers
+
+
 class Dispatcher(object):
     """
     Provides analysis function module and execution facilities.
@@ -38,7 +166,12 @@ class Dispatcher(object):
     module names to be given at initialization.
     """
 
-    def __init__(self, surveyval: HIFISSurveyval, data: DataContainer) -> None:
+    def __init__(
+        self,
+        surveyval: HIFISSurveyval,
+        data: DataContainer,
+        run_cache: Optional[RunCache] = None,
+    ) -> None:
         """
         Initialize the Dispatcher.
 
@@ -46,6 +179,10 @@ class Dispatcher(object):
             surveyval (HIFISSurveyval): Passing HIFISSurveyval object in in
                                         order to pass it through to
                                         particular analysis scripts.
+            data (DataContainer): The data to be passed to the scripts.
+            run_cache (Optional[RunCache]): If given, scripts that did not
+                change since the previous run are not run again. Instead,
+                their previous outputs are re-used.
         """
         self.surveyval: HIFISSurveyval = surveyval
         self.data: DataContainer = data
@@ -53,6 +190,10 @@ class Dispatcher(object):
         self.module_names: List[str] = self.surveyval.settings.SCRIPT_NAMES
         self.module_name_paths: List[Path] = []
         self._discovered_modules: List[str] = []
+        self._graph: ScriptGraph = ScriptGraph()
+        self._run_cache: Optional[RunCache] = run_cache
+        self._profiles: Dict[str, ScriptProfile] = {}
+        self._budgets: Dict[str, ScriptBudget] = {}
 
         self.__validate_config()
 
@@ -91,6 +232,10 @@ class Dispatcher(object):
         Iterate over all modules in the module folder (non-recursive) or
         selected modules only and cache the names of those python (.py) files.
         Exception: __init__.py is excluded.
+        The results the modules provide to or require from other modules are
+        read as well, see hifis_surveyval.core.script_graph for details, and
+        so are their time and memory limits, see
+        hifis_surveyval.core.script_budget.
         """
         # Execute all scripts in scripts folder or selected scripts only.
         for name_path in self.module_name_paths:
@@ -99,8 +244,20 @@ class Dispatcher(object):
                 and name_path.suffix == ".py"
                 and not name_path.stem == "__init__"
             ):
+                try:
+                    (provides, requires) = ScriptGraph.read_declarations(
+                        name_path
+                    )
+                    budget: ScriptBudget = ScriptBudget.for_module(
+                        self.surveyval.settings, name_path
+                    )
+                except ValueError as error:
+                    logging.error(f"Module {name_path.stem} skipped: {error}")
+                    continue
                 logging.info(f"Discovered module {name_path.stem}.")
                 self._discovered_modules.append(name_path.stem)
+                self._graph.add(name_path.stem, provides, requires)
+                self._budgets[name_path.stem] = budget
 
     def load_all_modules(self) -> None:
         """
@@ -108,6 +265,9 @@ class Dispatcher(object):
 
         Make sure to run discover() beforehand.
         If no modules have been discovered, a warning will be logged.
+        Modules providing results to other modules are run before these.
+        If a module fails to provide a result, the modules requiring it are
+        skipped.
         See Also: load_module()
 
         """
@@ -115,10 +275,540 @@ class Dispatcher(object):
             logging.warning("No modules have been discovered - Nothing to do.")
             return
 
-        for module_name in self._discovered_modules:
-            self.load_module(module_name)
+        self._run_modules(self._graph.order())
+
+    def load_changed_modules(self, module_names: Iterable[str]) -> None:
+        """
+        Run discovered modules again after they changed.
+
+        Modules requiring results of the changed modules are run again as
+        well, since their inputs may have changed too. Modules providing
+        results to any of these are also run, since results are not kept
+        between runs.
+        Make sure to run discover() beforehand. Modules that were not
+        discovered are ignored.
+
+        Args:
+            module_names:
+                The names of the changed modules.
+        """
+        order: List[str] = self._graph.order()
+        changed: Set[str] = set(module_names).intersection(order)
+        for module_name in order:
+            if self._graph.dependencies(module_name) & changed:
+                changed.add(module_name)
+        to_run: Set[str] = self._including_providers(order, changed)
+        self._run_modules(
+            [module_name for module_name in order if module_name in to_run]
+        )
+
+    def _including_providers(
+        self, order: List[str], module_names: Set[str]
+    ) -> Set[str]:
+        """
+        Add the modules providing results to the given ones.
+
+        Args:
+            order:
+                All modules that can be run, as obtained from
+                ScriptGraph.order().
+            module_names:
+                The modules whose providers are to be added.
+        Returns:
+            The given modules together with all modules they require results
+            from, directly or indirectly.
+        """
+        selected: Set[str] = set(module_names)
+        for module_name in reversed(order):
+            if module_name in selected:
+                selected.update(self._graph.dependencies(module_name))
+        return selected
+
+    def _run_modules(self, order: List[str]) -> None:
+        """
+        Run modules, either one after another or in parallel.
 
-    def load_module(self, module_name: str) -> None:
+        Args:
+            order:
+                The modules to be run, in an order respecting their
+                dependencies.
+        """
+        self._profiles = {}
+        if self._run_cache is not None:
+            order = self._reuse_unchanged_modules(order)
+
+        workers: int = self.surveyval.settings.SCRIPT_WORKERS
+        # Limits can only be enforced on scripts running in a process of
+        # their own
+        supervised: bool = any(
+            self._budgets[module_name].limited for module_name in order
+        )
+        parallel: bool = (workers > 1 and len(order) > 1) or supervised
+        if parallel:
+            try:
+                context = multiprocessing.get_context("fork")
+            except ValueError:
+                logging.warning(
+                    "Running analysis scripts in parallel is not supported "
+                    "on this platform, running them one after another."
+                )
+                if supervised:
+                    logging.warning(
+                        "Time and memory limits of analysis scripts are not "
+                        "enforced on this platform."
+                    )
+                parallel = False
+
+        if parallel:
+            self._load_modules_in_workers(context, workers, order)
+        else:
+            self._load_modules_in_order(order)
+
+        if self._run_cache is not None:
+            self._run_cache.save()
+
+        if self._profiles:
+            ProfileReport.write(self.surveyval.settings, self.profiles)
+
+    @property
+    def profiles(self) -> List[ScriptProfile]:
+        """
+        Get the profiles of the modules run last.
+
+        Modules are only profiled if PROFILE_SCRIPTS is enabled.
+
+        Returns:
+            The profiles of the modules run by the last call to
+            load_all_modules() or load_changed_modules().
+        """
+        return list(self._profiles.values())
+
+    def _reuse_unchanged_modules(self, order: List[str]) -> List[str]:
+        """
+        Re-use the outputs of modules that did not change since the last run.
+
+        Modules providing results to modules that need to be run are run as
+        well, even if they did not change.
+
+        Args:
+            order:
+                The modules to be run, as obtained from ScriptGraph.order().
+        Returns:
+            The modules that still need to be run, in the given order.
+        """
+        reusable: Dict[str, List[Path]] = {}
+        for module_name in order:
+            self._run_cache.fingerprint(
+                module_name,
+                self.module_folder / f"{module_name}.py",
+                self._graph.dependencies(module_name),
+            )
+            outputs = self._run_cache.reusable_outputs(module_name)
+            if outputs is not None:
+                reusable[module_name] = outputs
+
+        to_run: Set[str] = self._including_providers(
+            order, set(order) - set(reusable)
+        )
+
+        for module_name in order:
+            if module_name not in to_run:
+                self._run_cache.reuse(module_name, reusable[module_name])
+                logging.info(
+                    f"Module {module_name} did not change, re-using its "
+                    f"{len(reusable[module_name])} previous outputs."
+                )
+        return [module_name for module_name in order if module_name in to_run]
+
+    def _load_modules_in_order(self, order: List[str]) -> None:
+        """
+        Run modules one after another in the current process.
+
+        Args:
+            order:
+                The modules to be run, as obtained from ScriptGraph.order().
+        """
+        results: Dict[str, Any] = {}
+        for module_name in order:
+            required: Optional[Dict[str, Any]] = self._required_results(
+                module_name, results
+            )
+            if required is None:
+                continue
+
+            detector: _ErrorDetector = _ErrorDetector()
+            logging.getLogger().addHandler(detector)
+            succeeded: bool = False
+            try:
+                # Each module gets copies of the results, so modifications
+                # do not leak into other modules requiring the same results
+                results.update(
+                    self.load_module(module_name, copy.deepcopy(required))
+                )
+                succeeded = True
+            finally:
+                logging.getLogger().removeHandler(detector)
+                if self._run_cache is not None:
+                    self._run_cache.collect(
+                        module_name, succeeded and not detector.detected
+                    )
+
+    def _required_results(
+        self, module_name: str, results: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Collect the results a module requires.
+
+        Args:
+            module_name:
+                The name of the module to collect the results for.
+            results:
+                All results provided by the modules run so far.
+        Returns:
+            The required results, which are empty if the module does not
+            require any, or None if some of them are not available. In the
+            latter case, an error is logged.
+        """
+        required_names: List[str] = self._graph.requires(module_name)
+        missing: List[str] = [
+            result_name
+            for result_name in required_names
+            if result_name not in results
+        ]
+        if missing:
+            logging.error(
+                f"Module {module_name} skipped: Required results {missing} "
+                f"were not provided."
+            )
+            return None
+        return {
+            result_name: results[result_name]
+            for result_name in required_names
+        }
+
+    def _load_modules_in_workers(
+        self,
+        context: multiprocessing.context.BaseContext,
+        workers: int,
+        order: List[str],
+    ) -> None:
+        """
+        Run modules in parallel worker processes.
+
+        Each module runs in a fresh process forked from the current one, so
+        the loaded data and the results of the modules it depends on are
+        shared without copying or parsing them again. Any memory the module
+        accumulates (e.g. in matplotlib) is released once it finished.
+        A module is started as soon as all modules it depends on finished,
+        so independent modules run concurrently.
+        The log records and console output of each module are collected in
+        its process and reported here, in the given order.
+        Modules exceeding their time limit are stopped, their memory limit is
+        applied within their process.
+
+        Args:
+            context:
+                A multiprocessing context using the fork start method.
+            workers:
+                The maximum amount of modules to be run at the same time.
+            order:
+                The modules to be run, as obtained from ScriptGraph.order().
+        """
+        pending: List[str] = list(order)
+        running: Dict[
+            Connection, Tuple[str, multiprocessing.Process, Optional[float]]
+        ] = {}
+        reports: Dict[str, ScriptReport] = {}
+        results: Dict[str, Any] = {}
+        next_to_report: int = 0
+
+        while pending or running:
+            for module_name in list(pending):
+                if len(running) >= workers:
+                    break
+                if not self._graph.dependencies(module_name).issubset(
+                    reports
+                ):
+                    continue
+                pending.remove(module_name)
+
+                collector: _RecordCollector = _RecordCollector()
+                with _collecting_records(collector):
+                    required = self._required_results(module_name, results)
+                if required is None:
+                    reports[module_name] = ScriptReport(
+                        module_name=module_name,
+                        failed=True,
+                        records=collector.records,
+                        output="",
+                        results={},
+                    )
+                    continue
+
+                (receiver, sender) = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=self._run_module_in_worker,
+                    args=(module_name, required, sender),
+                    name=f"surveyval-{module_name}",
+                )
+                process.start()
+                sender.close()  # Only the worker writes into the pipe
+                timeout: Optional[float] = self._budgets[module_name].timeout
+                running[receiver] = (
+                    module_name,
+                    process,
+                    time.monotonic() + timeout if timeout is not None
+                    else None,
+                )
+
+            if running:
+                deadlines: List[float] = [
+                    deadline
+                    for (_, _, deadline) in running.values()
+                    if deadline is not None
+                ]
+                finished: List[ScriptReport] = []
+                for receiver in wait(
+                    list(running.keys()),
+                    max(0.0, min(deadlines) - time.monotonic())
+                    if deadlines else None,
+                ):
+                    (module_name, process, _) = running.pop(receiver)
+                    finished.append(
+                        self._receive_report(module_name, receiver, process)
+                    )
+
+                now: float = time.monotonic()
+                for (receiver, (module_name, process, deadline)) in list(
+                    running.items()
+                ):
+                    if deadline is not None and deadline <= now:
+                        del running[receiver]
+                        finished.append(
+                            self._stop_worker(module_name, receiver, process)
+                        )
+
+                for report in finished:
+                    module_name = report.module_name
+                    results.update(report.results)
+                    reports[module_name] = report
+                    if report.profile is not None:
+                        self._profiles[module_name] = report.profile
+                    Tracer.add_events(report.spans)
+                    if report.memory_peak is not None:
+                        MemoryStages.add_worker_peak(report.memory_peak)
+                    if self._run_cache is not None:
+                        self._run_cache.collect(module_name, not report.failed)
+
+            # Report in the given order, as far as the modules are finished
+            while (
+                next_to_report < len(order)
+                and order[next_to_report] in reports
+            ):
+                self._report(reports[order[next_to_report]])
+                next_to_report += 1
+
+        failed_modules: List[str] = [
+            report.module_name for report in reports.values() if report.failed
+        ]
+        if failed_modules:
+            logging.error(
+                f"{len(failed_modules)} of {len(reports)} modules failed: "
+                f"{', '.join(failed_modules)}"
+            )
+
+    def _run_module_in_worker(
+        self,
+        module_name: str,
+        required: Dict[str, Any],
+        sender: Connection,
+    ) -> None:
+        """
+        Run a module in a worker process and send back a report.
+
+        Args:
+            module_name:
+                The name of the module to be run.
+            required:
+                The results of other modules the module requires.
+            sender:
+                The connection through which the report is sent.
+        """
+        collector: _RecordCollector = _RecordCollector()
+        output: io.StringIO = io.StringIO()
+        failed: bool = False
+        results: Dict[str, Any] = {}
+        budget: ScriptBudget = self._budgets[module_name]
+        # Only hand back the spans recorded in this process
+        Tracer.take_events()
+
+        with _collecting_records(collector):
+            budget.apply_memory_limit()
+            try:
+                with redirect_stdout(output), redirect_stderr(output):
+                    results = self.load_module(module_name, required)
+            except MemoryError:
+                if budget.memory_limit is None:
+                    logging.exception(
+                        f"Module {module_name} ran out of memory."
+                    )
+                else:
+                    logging.error(
+                        f"Module {module_name} exceeded its memory limit of "
+                        f"{budget.memory_limit} MiB."
+                    )
+                failed = True
+            except Exception:
+                logging.exception(f"Module {module_name} raised an error.")
+                failed = True
+
+            try:
+                # Make sure the results can be handed to the main process
+                pickle.dumps(results)
+            except Exception as error:
+                logging.error(
+                    f"Module {module_name}: Provided results can not be "
+                    f"passed on to other modules: {error}"
+                )
+                results = {}
+
+        failed = failed or any(
+            record.levelno >= logging.ERROR for record in collector.records
+        )
+        sender.send(
+            ScriptReport(
+                module_name=module_name,
+                failed=failed,
+                records=collector.records,
+                output=output.getvalue(),
+                results=results,
+                profile=self._profiles.get(module_name),
+                spans=Tracer.take_events(),
+                memory_peak=(
+                    MemoryStages.peak() if MemoryStages.enabled else None
+                ),
+            )
+        )
+        sender.close()
+
+    @staticmethod
+    def _receive_report(
+        module_name: str,
+        receiver: Connection,
+        process: multiprocessing.Process,
+    ) -> ScriptReport:
+        """
+        Obtain the report of a finished worker process.
+
+        Args:
+            module_name:
+                The name of the module that ran in the worker process.
+            receiver:
+                The connection through which the report is received.
+            process:
+                The worker process.
+        Returns:
+            The report sent by the worker, or a report of the failure if
+            the worker ended without sending one.
+        """
+        try:
+            report: Optional[ScriptReport] = receiver.recv()
+        except EOFError:
+            report = None
+        receiver.close()
+        process.join()
+
+        if report is None:
+            report = Dispatcher._failure_report(
+                module_name,
+                f"Worker process ended unexpectedly with exit code "
+                f"{process.exitcode}.",
+            )
+        return report
+
+    def _stop_worker(
+        self,
+        module_name: str,
+        receiver: Connection,
+        process: multiprocessing.Process,
+    ) -> ScriptReport:
+        """
+        Stop a worker process whose module exceeded its time limit.
+
+        Args:
+            module_name:
+                The name of the module running in the worker process.
+            receiver:
+                The connection through which the report would be received.
+            process:
+                The worker process.
+        Returns:
+            A report of the failure.
+        """
+        process.kill()
+        process.join()
+        receiver.close()
+        return self._failure_report(
+            module_name,
+            f"Module {module_name} exceeded its time limit of "
+            f"{self._budgets[module_name].timeout} seconds and was stopped.",
+        )
+
+    @staticmethod
+    def _failure_report(module_name: str, message: str) -> ScriptReport:
+        """
+        Create the report of a module whose worker did not send one.
+
+        Args:
+            module_name:
+                The name of the module that ran in the worker process.
+            message:
+                The error message describing the failure.
+        Returns:
+            A report of the failure.
+        """
+        return ScriptReport(
+            module_name=module_name,
+            failed=True,
+            records=[
+                logging.makeLogRecord({
+                    "levelno": logging.ERROR,
+                    "levelname": logging.getLevelName(logging.ERROR),
+                    "module": Path(__file__).stem,
+                    "funcName": "_load_modules_in_workers",
+                    "msg": message,
+                })
+            ],
+            output="",
+            results={},
+        )
+
+    @staticmethod
+    def _report(report: ScriptReport) -> None:
+        """
+        Output the log records and console output of a finished module.
+
+        Args:
+            report:
+                The report obtained from the worker process.
+        """
+        logging.info(f"Output of module {report.module_name}:")
+        if report.output:
+            print(report.output, end="")
+        for record in report.records:
+            logger = logging.getLogger(record.name)
+            if logger.isEnabledFor(record.levelno):
+                logger.handle(record)
+        if report.failed:
+            logging.error(f"Module {report.module_name} failed.")
+        else:
+            logging.info(f"Module {report.module_name} finished.")
+
+    def load_module(
+        self,
+        module_name: str,
+        results: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """
         Attempt to load a module given by name.
 
@@ -127,6 +817,15 @@ class Dispatcher(object):
 
         Args:
             module_name (str): The name of the module, without the .py ending
+            results (Optional[Dict[str, Any]]): The results of other modules
+                required by the module. If the module requires any, they are
+                passed to its run() method as keyword argument "results".
+
+        Returns:
+            The results the module provides to other modules, as returned
+            from its run() method. Results the module did not declare to
+            provide are ignored. If the module does not declare any, the
+            returned dictionary is empty.
 
         Raises:
             ImportError: Exception thrown if script could not be loaded.
@@ -135,6 +834,43 @@ class Dispatcher(object):
         """
         # TODO if the module_name has a .py ending, remove it beforehand
 
+        settings: Settings = self.surveyval.settings
+        with Tracer.span(module_name, "scripts"):
+            if not settings.PROFILE_SCRIPTS:
+                return self._load_module(module_name, results)
+
+            # Profiles are kept out of the outputs of the module, which may be
+            # re-used in later runs
+            profiler: ScriptProfiler = ScriptProfiler(
+                module_name,
+                dump=(
+                    settings.ANALYSIS_OUTPUT_PATH / "profiles"
+                    / f"{module_name}.prof"
+                ) if settings.PROFILE_FUNCTIONS else None,
+                trace_memory=settings.PROFILE_MEMORY,
+            )
+            try:
+                with profiler:
+                    return self._load_module(module_name, results)
+            finally:
+                self._profiles[module_name] = profiler.profile
+
+    def _load_module(
+        self,
+        module_name: str,
+        results: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Load a module given by name and run it.
+
+        Args:
+            module_name (str): The name of the module, without the .py ending
+            results (Optional[Dict[str, Any]]): The results of other modules
+                required by the module.
+
+        Returns:
+            The results the module provides to other modules.
+        """
         module_path: Path = self.module_folder / module_name
         logging.info(f"Running Module {module_name}.")
 
@@ -147,10 +883,25 @@ class Dispatcher(object):
         except ImportError as error:
             logging.error(f"Failed to load module {module_name}." f"{error}")
 
+        arguments: Dict[str, Any] = {}
+        if self._graph.requires(module_name):
+            arguments["results"] = results if results is not None else {}
+
+        surveyval: HIFISSurveyval = copy.deepcopy(self.surveyval)
+        if self._run_cache is not None:
+            # Collect the outputs separately, so they can be attributed to
+            # the module even if several modules run at the same time
+            output_path: Path = self._run_cache.staging_path(module_name)
+            output_path.mkdir(parents=True, exist_ok=True)
+            surveyval.settings.ANALYSIS_OUTPUT_PATH = output_path
+
         try:
-            module.run(
-                hifis_surveyval=copy.deepcopy(self.surveyval),
-                data=copy.deepcopy(self.data),
+            # Each module works on a snapshot of the data, so modifications
+            # do not leak into the modules run afterwards
+            returned = module.run(
+                hifis_surveyval=surveyval,
+                data=self.data.snapshot(),
+                **arguments,
             )
         except AttributeError as error:
             traceback.print_exc()
@@ -159,3 +910,43 @@ class Dispatcher(object):
                 f"Error when calling run() - method: "
                 f"{error}."
             )
+            return {}
+
+        return self._provided_results(module_name, returned)
+
+    def _provided_results(
+        self, module_name: str, returned: Any
+    ) -> Dict[str, Any]:
+        """
+        Pick the results a module declared to provide from its return value.
+
+        Args:
+            module_name:
+                The name of the module that was run.
+            returned:
+                The value returned from the module's run() method.
+        Returns:
+            The declared results that were returned. If any are missing, an
+            error is logged.
+        """
+        provides: List[str] = self._graph.provides(module_name)
+        if not provides:
+            return {}
+
+        if not isinstance(returned, dict):
+            returned = {}
+        missing: List[str] = [
+            result_name
+            for result_name in provides
+            if result_name not in returned
+        ]
+        if missing:
+            logging.error(
+                f"Module {module_name}: run() did not return the declared "
+                f"results {missing}."
+            )
+        return {
+            result_name: returned[result_name]
+            for result_name in provides
+            if result_name in returned
+        }
@@ -0,0 +1,139 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module detects changes to the analysis and preprocessing scripts.
+
+Changes are detected by periodically comparing the modification times and
+sizes of the watched files, so no additional dependencies are required.
+"""
+import importlib.util
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from hifis_surveyval.core.settings import Settings
+
+
+class FileWatcher(object):
+    """Detects modified, added or removed scripts of an analysis."""
+
+    def __init__(self, settings: Settings) -> None:
+        """
+        Start watching the script folder and the preprocessing script.
+
+        Files present at this point are considered to be unchanged.
+
+        Args:
+            settings:
+                The settings naming the script folder and the preprocessing
+                script.
+        """
+        self._settings: Settings = settings
+        self._states: Dict[Path, Tuple[int, int]] = self._scan()
+
+    def _watched_files(self) -> List[Path]:
+        """
+        Get the files currently present in the watched locations.
+
+        Returns:
+            The Python files in the script folder (non-recursive) and the
+            preprocessing script, if they exist.
+        """
+        files: List[Path] = []
+        if self._settings.SCRIPT_FOLDER.is_dir():
+            files.extend(
+                path
+                for path in self._settings.SCRIPT_FOLDER.iterdir()
+                if path.is_file() and path.suffix == ".py"
+            )
+        if self._settings.PREPROCESSING_FILENAME.is_file():
+            files.append(self._settings.PREPROCESSING_FILENAME)
+        return files
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        """
+        Record the modification time and size of each watched file.
+
+        Returns:
+            A mapping from each watched file to its modification time in
+            nanoseconds and its size in bytes.
+        """
+        states: Dict[Path, Tuple[int, int]] = {}
+        for path in self._watched_files():
+            try:
+                status = path.stat()
+            except FileNotFoundError:
+                # Removed between listing and inspecting the folder
+                continue
+            states[path] = (status.st_mtime_ns, status.st_size)
+        return states
+
+    def changed_files(self) -> List[Path]:
+        """
+        Get the files that changed since the last check.
+
+        Outdated compiled byte code of changed files is removed so the
+        changed source is picked up when the file is loaded again, even if
+        the change did not affect the recorded modification time.
+
+        Returns:
+            The files that were modified, added or removed, sorted by path.
+        """
+        states: Dict[Path, Tuple[int, int]] = self._scan()
+        changed: List[Path] = sorted(
+            path
+            for path in set(states).union(self._states)
+            if states.get(path) != self._states.get(path)
+        )
+        self._states = states
+
+        for path in changed:
+            byte_code: Path = Path(importlib.util.cache_from_source(str(path)))
+            if byte_code.exists():
+                byte_code.unlink()
+        return changed
+
+    def wait_for_changes(self, interval: float = 0.5) -> List[Path]:
+        """
+        Block until at least one of the watched files changed.
+
+        Once a change is detected, the watcher waits until the files stayed
+        unchanged for one more interval, so a file that is still being
+        written is reported only once.
+
+        Args:
+            interval:
+                The time in seconds between two checks for changes.
+        Returns:
+            The files that were modified, added or removed, sorted by path.
+        """
+        changed: List[Path] = []
+        while not changed:
+            time.sleep(interval)
+            changed = self.changed_files()
+
+        settling: List[Path] = changed
+        while settling:
+            time.sleep(interval)
+            settling = self.changed_files()
+            changed = sorted(set(changed).union(settling))
+        return changed
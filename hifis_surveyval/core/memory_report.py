@@ -0,0 +1,487 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module accounts for the memory held by survey data.
+
+The memory held by a data container is broken down by question collection
+and question, and within each into the answers, the metadata, the
+translations and cached data frames. Sizes are estimated by following the
+references of each object, counting each object only once.
+
+Additionally, the peak memory allocated during each stage of the pipeline
+can be sampled with tracemalloc.
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import numpy
+from pandas import DataFrame, Index, Series
+
+from hifis_surveyval.core.settings import Settings
+
+CATEGORIES: List[str] = ["answers", "metadata", "translations", "frames"]
+"""The categories the memory of each part of the survey data is split into."""
+
+# Objects of these types are shared program state rather than data
+_SKIPPED_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType,
+)
+_SCALAR_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def deep_size(value: Any, seen: Set[int]) -> int:
+    """
+    Estimate the memory held by an object and the objects it references.
+
+    Args:
+        value:
+            The object whose memory is to be estimated.
+        seen:
+            The IDs of objects already counted elsewhere. They are not
+            counted again. The IDs of all counted objects are added.
+    Returns:
+        The estimated size in bytes.
+    """
+    if id(value) in seen or isinstance(value, _SKIPPED_TYPES):
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, _SCALAR_TYPES):
+        return sys.getsizeof(value)
+    if isinstance(value, (Series, DataFrame)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, Series) else usage)
+    if isinstance(value, Index):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, numpy.ndarray):
+        # Views do not own their data, it is counted with their base array
+        size: int = sys.getsizeof(value)
+        if value.base is not None:
+            size += deep_size(value.base, seen)
+        if value.dtype == object:
+            for item in value.ravel():
+                size += deep_size(item, seen)
+        return size
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for (key, item) in value.items():
+            size += deep_size(key, seen) + deep_size(item, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += deep_size(item, seen)
+    if hasattr(value, "__dict__"):
+        size += deep_size(vars(value), seen)
+    for slot in getattr(type(value), "__slots__", ()):
+        if hasattr(value, slot):
+            size += deep_size(getattr(value, slot), seen)
+    return size
+
+
+class MemoryUsage(object):
+    """Holds the memory held by a part of the survey data."""
+
+    def __init__(
+        self,
+        name: str,
+        sizes: Dict[str, int],
+        parts: Optional[List["MemoryUsage"]] = None,
+    ) -> None:
+        """
+        Set up the memory usage of a part of the survey data.
+
+        Args:
+            name:
+                The name of the part, e.g. the full ID of a question.
+            sizes:
+                The memory held by the part itself in bytes, per category
+                listed in CATEGORIES. Missing categories count as 0.
+            parts:
+                The memory usage of the parts this part consists of, e.g. the
+                questions of a question collection.
+        """
+        self.name: str = name
+        self.sizes: Dict[str, int] = {
+            category: sizes.get(category, 0) for category in CATEGORIES
+        }
+        self.parts: List[MemoryUsage] = parts or []
+
+    def size_of(self, category: str) -> int:
+        """
+        Get the memory held in a category, including all parts.
+
+        Args:
+            category:
+                One of the categories listed in CATEGORIES.
+        Returns:
+            The memory in bytes.
+        """
+        return self.sizes[category] + sum(
+            part.size_of(category) for part in self.parts
+        )
+
+    @property
+    def total(self) -> int:
+        """
+        Get the memory held in all categories, including all parts.
+
+        Returns:
+            The memory in bytes.
+        """
+        return sum(self.size_of(category) for category in CATEGORIES)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the memory usage in a form that can be serialized as JSON.
+
+        Returns:
+            A dictionary holding the name, the total and per category memory
+            including all parts, and the memory usage of the parts.
+        """
+        usage: Dict[str, Any] = {"name": self.name, "total": self.total}
+        usage.update(
+            {category: self.size_of(category) for category in CATEGORIES}
+        )
+        if self.parts:
+            usage["parts"] = [part.as_dict() for part in self.parts]
+        return usage
+
+
+class MemoryReport(object):
+    """Breaks down the memory held by a data container."""
+
+    JSON_FILE: str = "memory.json"
+    """The name of the file holding the report and the stages."""
+
+    TEXT_FILE: str = "memory.txt"
+    """The name of the file holding the summary of the report."""
+
+    def __init__(
+        self, container: MemoryUsage, collections: List[MemoryUsage]
+    ) -> None:
+        """
+        Set up a memory report.
+
+        Args:
+            container:
+                The memory held by the data container itself, e.g. the
+                participant IDs, apart from the question collections.
+            collections:
+                The memory held by each question collection, with its
+                questions as parts.
+        """
+        self.container: MemoryUsage = container
+        self.collections: List[MemoryUsage] = collections
+
+    def size_of(self, category: str) -> int:
+        """
+        Get the memory held in a category by the data container.
+
+        Args:
+            category:
+                One of the categories listed in CATEGORIES.
+        Returns:
+            The memory in bytes.
+        """
+        return self.container.size_of(category) + sum(
+            collection.size_of(category) for collection in self.collections
+        )
+
+    @property
+    def total(self) -> int:
+        """
+        Get the memory held by the data container.
+
+        Returns:
+            The memory in bytes.
+        """
+        return sum(self.size_of(category) for category in CATEGORIES)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the report in a form that can be serialized as JSON.
+
+        Returns:
+            A dictionary holding the totals, the memory held by the container
+            itself and by each collection.
+        """
+        report: Dict[str, Any] = {"total": self.total}
+        report.update(
+            {category: self.size_of(category) for category in CATEGORIES}
+        )
+        report["container"] = self.container.as_dict()
+        report["collections"] = [
+            collection.as_dict() for collection in self.collections
+        ]
+        return report
+
+    def summary(self, count: int = 10) -> str:
+        """
+        Summarize the report as tables of the largest parts.
+
+        Args:
+            count:
+                The amount of largest collections and questions to list.
+        Returns:
+            A text listing the totals and the largest collections and
+            questions with their memory per category.
+        """
+        header: str = (
+            "".join(f"{category.capitalize():>14}" for category in CATEGORIES)
+            + f"{'Total':>14}"
+        )
+
+        def row(sizes: List[int], name: str) -> str:
+            return (
+                "".join(f"{size / 2**20:>14.3f}" for size in sizes)
+                + f"  {name}"
+            )
+
+        def usage_row(usage: MemoryUsage) -> str:
+            return row(
+                [usage.size_of(category) for category in CATEGORIES]
+                + [usage.total],
+                usage.name,
+            )
+
+        lines: List[str] = [
+            "Memory of the data container [MiB]:",
+            header,
+            row(
+                [self.size_of(category) for category in CATEGORIES]
+                + [self.total],
+                "all",
+            ),
+            usage_row(self.container),
+        ]
+        for (title, usages) in [
+            ("Largest collections [MiB]:", self.collections),
+            (
+                "Largest questions [MiB]:",
+                [
+                    question
+                    for collection in self.collections
+                    for question in collection.parts
+                ],
+            ),
+        ]:
+            lines.extend(["", title, header])
+            for usage in sorted(usages, key=lambda usage: -usage.total)[
+                :count
+            ]:
+                lines.append(usage_row(usage))
+        return "\n".join(lines) + "\n"
+
+    def write(
+        self, settings: Settings, stages: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Write the report into the output folder of the run.
+
+        Args:
+            settings:
+                The settings naming the output folder.
+            stages:
+                (Optional) The memory sampled during the stages of the
+                pipeline, as obtained from MemoryStages.take_stages().
+        """
+        settings.ANALYSIS_OUTPUT_PATH.mkdir(parents=True, exist_ok=True)
+
+        json_path: Path = settings.ANALYSIS_OUTPUT_PATH / self.JSON_FILE
+        temporary: Path = json_path.with_name(f".{json_path.name}.tmp")
+        temporary.write_text(
+            json.dumps(
+                {"stages": stages or [], "container": self.as_dict()},
+                indent=2,
+            )
+        )
+        os.replace(temporary, json_path)
+
+        text: str = self.summary(count=len(self.collections))
+        if stages:
+            text = MemoryStages.summary(stages) + "\n" + text
+        text_path: Path = settings.ANALYSIS_OUTPUT_PATH / self.TEXT_FILE
+        temporary = text_path.with_name(f".{text_path.name}.tmp")
+        temporary.write_text(text)
+        os.replace(temporary, text_path)
+
+
+class MemoryStages(object):
+    """Samples the memory allocated during the stages of the pipeline."""
+
+    enabled: bool = False
+    """Whether stages are sampled."""
+
+    _stages: List[Dict[str, Any]] = []
+    _started_tracing: bool = False
+    # The largest peak of the current stage before the peak was last reset
+    _peak: int = 0
+    # The largest peak reported by a worker process during the current stage
+    _worker_peak: Optional[int] = None
+
+    @classmethod
+    def enable(cls) -> None:
+        """Start tracing memory allocations, discarding earlier stages."""
+        cls._stages = []
+        cls._started_tracing = not tracemalloc.is_tracing()
+        if cls._started_tracing:
+            tracemalloc.start()
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls) -> None:
+        """Stop tracing memory allocations if they were started here."""
+        if cls.enabled and cls._started_tracing:
+            tracemalloc.stop()
+        cls.enabled = False
+
+    @classmethod
+    @contextmanager
+    def stage(cls, name: str) -> Iterator[None]:
+        """
+        Sample the memory allocated during a stage while enabled.
+
+        Args:
+            name:
+                The name of the stage.
+        Yields:
+            Nothing, the stage runs within the context.
+        """
+        if not cls.enabled:
+            yield
+            return
+
+        if hasattr(tracemalloc, "reset_peak"):
+            # Available from Python 3.9 on, otherwise the peak may stem from
+            # an earlier stage
+            tracemalloc.reset_peak()
+        cls._peak = 0
+        cls._worker_peak = None
+        before: int = tracemalloc.get_traced_memory()[0]
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls._stages.append({
+                "stage": name,
+                "duration": time.perf_counter() - start,
+                "before": before,
+                "after": tracemalloc.get_traced_memory()[0],
+                "peak": cls.peak(),
+                "worker_peak": cls._worker_peak,
+            })
+
+    @classmethod
+    def peak(cls) -> int:
+        """
+        Get the largest amount of memory traced during the current stage.
+
+        Returns:
+            The peak of the traced memory in bytes, including the peaks
+            before the peak was reset by reset_peak().
+        """
+        return max(cls._peak, tracemalloc.get_traced_memory()[1])
+
+    @classmethod
+    def reset_peak(cls) -> None:
+        """
+        Reset the peak of the traced memory, keeping it for the stage.
+
+        Use this instead of tracemalloc.reset_peak() while tracing, so the
+        peak of the current stage is not lost.
+        """
+        cls._peak = cls.peak()
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    @classmethod
+    def add_worker_peak(cls, peak: int) -> None:
+        """
+        Record the peak of the traced memory in a worker process.
+
+        The memory allocated in worker processes is not traced in this
+        process, so workers report their peak when they finish.
+
+        Args:
+            peak:
+                The peak of the memory traced in the worker process in
+                bytes, as obtained from peak() within it.
+        """
+        cls._worker_peak = max(cls._worker_peak or 0, peak)
+
+    @classmethod
+    def take_stages(cls) -> List[Dict[str, Any]]:
+        """
+        Remove the sampled stages.
+
+        Returns:
+            For each stage in the order they finished, its name, its
+            duration in seconds and the memory traced before and after it
+            and at its peak, in bytes. If worker processes ran during the
+            stage, the largest peak among them is given as well.
+        """
+        (stages, cls._stages) = (cls._stages, [])
+        return stages
+
+    @staticmethod
+    def summary(stages: List[Dict[str, Any]]) -> str:
+        """
+        Summarize the memory sampled during stages as a table.
+
+        Args:
+            stages:
+                The stages as obtained from take_stages().
+        Returns:
+            A text listing the memory before, after and at the peak of
+            each stage, and the largest peak of a worker process if any
+            ran during the stage.
+        """
+        lines: List[str] = [
+            "Memory of the pipeline stages [MiB]:",
+            f"{'Before':>14}{'After':>14}{'Peak':>14}{'Worker peak':>14}"
+            f"{'Time [s]':>14}  Stage",
+        ]
+        for stage in stages:
+            worker_peak: Optional[int] = stage.get("worker_peak")
+            lines.append(
+                f"{stage['before'] / 2**20:>14.3f}"
+                f"{stage['after'] / 2**20:>14.3f}"
+                f"{stage['peak'] / 2**20:>14.3f}"
+                + (
+                    f"{worker_peak / 2**20:>14.3f}" if worker_peak is not None
+                    else f"{'-':>14}"
+                )
+                + f"{stage['duration']:>14.3f}  {stage['stage']}"
+            )
+        if any(stage.get("worker_peak") is not None for stage in stages):
+            lines.append(
+                "Worker peak is the largest peak of a single worker process, "
+                "workers running at the same time are not added up."
+            )
+        return "\n".join(lines) + "\n"
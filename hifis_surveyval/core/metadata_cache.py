@@ -0,0 +1,194 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module caches the validated contents of metadata files.
+
+Parsing and validating large metadata files takes considerable time. The
+cache keeps the validated contents of each file, so files that did not
+change since the last run are neither parsed nor validated again.
+A file is considered unchanged if its modification time and size are the
+same as when it was cached, or, failing that, if its content hash is.
+"""
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import yaml
+
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.models.mixins.yaml_constructable import (
+    YamlList, YamlLoader,
+)
+from hifis_surveyval.models.question_collection import QuestionCollection
+
+
+class MetadataCache(object):
+    """Provides loading validated metadata with a per-file cache."""
+
+    FORMAT_VERSION: int = 1
+    """Changes whenever the layout of the cache entries changes."""
+
+    FOLDER_NAME: str = "metadata"
+    """The sub-folder of the cache folder holding the cache entries."""
+
+    @classmethod
+    def _entry_path(cls, settings: Settings, metadata_file: Path) -> Path:
+        """
+        Get the file in which the cache entry for a metadata file is stored.
+
+        Args:
+            settings (Settings): The settings of the run.
+            metadata_file (Path): The metadata file to be cached.
+
+        Returns:
+            Path: The path of the cache entry.
+        """
+        path_hash: str = hashlib.sha256(
+            str(metadata_file.resolve()).encode("utf-8")
+        ).hexdigest()
+        return (
+            settings.CACHE_FOLDER / cls.FOLDER_NAME
+            / f"{metadata_file.stem}-{path_hash[:16]}.pickle"
+        )
+
+    @classmethod
+    def _read_entry(cls, entry_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read a cache entry.
+
+        Args:
+            entry_path (Path): The path of the cache entry.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cache entry, or None if it does not
+            exist or can not be used.
+        """
+        try:
+            with entry_path.open(mode="rb") as io_stream:
+                entry: Dict[str, Any] = pickle.load(io_stream)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError) as error:
+            logging.warning(f"Ignoring broken cache entry {entry_path}: "
+                            f"{error}")
+            return None
+
+        if entry.get("format") != cls.FORMAT_VERSION:
+            return None
+        return entry
+
+    @classmethod
+    def _write_entry(cls, entry_path: Path, entry: Dict[str, Any]) -> None:
+        """
+        Write a cache entry.
+
+        Errors while writing are logged and otherwise ignored.
+
+        Args:
+            entry_path (Path): The path of the cache entry.
+            entry (Dict[str, Any]): The contents of the cache entry.
+        """
+        temporary: Path = entry_path.with_suffix(".tmp")
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            with temporary.open(mode="wb") as io_stream:
+                pickle.dump(entry, io_stream, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, entry_path)
+        except OSError as error:
+            logging.warning(f"Could not write cache entry {entry_path}: "
+                            f"{error}")
+
+    @classmethod
+    def load(cls, settings: Settings, metadata_file: Path) -> YamlList:
+        """
+        Get the validated question collections defined in a metadata file.
+
+        If the file did not change since it was cached, the cached data is
+        returned right away. Otherwise, the file is parsed and each question
+        collection is validated. Collections that fail to validate are
+        logged as a warning and left out, just like in
+        DataContainer.load_metadata(). The validated data is only cached if
+        all collections were valid.
+
+        Args:
+            settings (Settings): The settings of the run.
+            metadata_file (Path): The metadata file to be loaded.
+
+        Returns:
+            YamlList: The validated question collections, which may be passed
+            to DataContainer.load_metadata() without validating them again.
+        """
+        entry_path: Path = cls._entry_path(settings, metadata_file)
+        entry: Optional[Dict[str, Any]] = cls._read_entry(entry_path)
+        status: os.stat_result = metadata_file.stat()
+
+        if (
+            entry is not None
+            and entry["mtime"] == status.st_mtime_ns
+            and entry["size"] == status.st_size
+        ):
+            logging.debug(f"Using cached metadata for {metadata_file}")
+            return entry["collections"]
+
+        content: bytes = metadata_file.read_bytes()
+        content_hash: str = hashlib.sha256(content).hexdigest()
+
+        if entry is not None and entry["hash"] == content_hash:
+            # The file was touched without changing its contents
+            logging.debug(f"Using cached metadata for {metadata_file}")
+            entry["mtime"] = status.st_mtime_ns
+            entry["size"] = status.st_size
+            cls._write_entry(entry_path, entry)
+            return entry["collections"]
+
+        logging.debug(f"Parsing and validating metadata in {metadata_file}")
+        metadata_yaml = yaml.load(content.decode("utf-8"), Loader=YamlLoader)
+        if not isinstance(metadata_yaml, list):
+            metadata_yaml = [metadata_yaml]
+
+        collections: YamlList = []
+        complete: bool = True
+        for collection_yaml in metadata_yaml:
+            try:
+                collections.append(
+                    QuestionCollection.validate_yaml(collection_yaml)
+                )
+            except Exception as thrown_exception:
+                logging.warning(
+                    f"Error while parsing metadata: {thrown_exception}"
+                )
+                complete = False
+
+        if complete:
+            cls._write_entry(
+                entry_path,
+                {
+                    "format": cls.FORMAT_VERSION,
+                    "mtime": status.st_mtime_ns,
+                    "size": status.st_size,
+                    "hash": content_hash,
+                    "collections": collections,
+                },
+            )
+        return collections
@@ -0,0 +1,158 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module loads the metadata files into a data container.
+
+The files are parsed with the libyaml-based loader if available. Since the
+files are independent of each other, they may be parsed in a pool of worker
+processes. Their contents are always added to the data container in the
+order in which the files are given.
+"""
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import yaml
+
+from hifis_surveyval.core.metadata_cache import MetadataCache
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.tracer import Tracer
+from hifis_surveyval.data_container import DataContainer
+from hifis_surveyval.models.mixins.yaml_constructable import (
+    YamlDict, YamlList, YamlLoader,
+)
+
+# The contents of a metadata file and whether they were validated already
+ParsedMetadata = Tuple[Union[YamlList, YamlDict], bool]
+
+
+class MetadataLoader(object):
+    """Provides loading metadata files into a data container."""
+
+    @classmethod
+    def parse(cls, settings: Settings, metadata_file: Path) -> ParsedMetadata:
+        """
+        Parse a single metadata file.
+
+        If the metadata cache is enabled, the validated contents are
+        obtained from the cache instead.
+
+        Args:
+            settings (Settings): The settings of the run.
+            metadata_file (Path): The metadata file to be parsed.
+
+        Returns:
+            ParsedMetadata: The contents of the file and whether they have
+            been validated already.
+
+        Raises:
+            yaml.YAMLError: Exception thrown if the file is no valid YAML.
+        """
+        if settings.METADATA_CACHE:
+            return MetadataCache.load(settings, metadata_file), True
+
+        with metadata_file.open(mode="r", encoding="utf-8") as io_stream:
+            return yaml.load(io_stream, Loader=YamlLoader), False
+
+    @classmethod
+    def _parse_all(
+        cls, settings: Settings, metadata_files: List[Path]
+    ) -> List[Union[ParsedMetadata, yaml.YAMLError]]:
+        """
+        Parse many metadata files, in parallel if configured.
+
+        Args:
+            settings (Settings): The settings of the run.
+            metadata_files (List[Path]): The metadata files to be parsed.
+
+        Returns:
+            List[Union[ParsedMetadata, yaml.YAMLError]]: For each file in
+            the given order either its parsed contents or the error that
+            occurred while parsing it.
+        """
+        outcomes: List[Union[ParsedMetadata, yaml.YAMLError]] = []
+
+        worker_count: int = min(settings.METADATA_WORKERS, len(metadata_files))
+        if worker_count < 2:
+            for metadata_file in metadata_files:
+                try:
+                    outcomes.append(cls.parse(settings, metadata_file))
+                except yaml.YAMLError as error:
+                    outcomes.append(error)
+            return outcomes
+
+        with ProcessPoolExecutor(max_workers=worker_count) as executor:
+            futures: List[Future] = [
+                executor.submit(cls.parse, settings, metadata_file)
+                for metadata_file in metadata_files
+            ]
+            for future in futures:
+                error: Optional[BaseException] = future.exception()
+                outcomes.append(
+                    error if isinstance(error, yaml.YAMLError)
+                    else future.result()  # Raises any other error
+                )
+        return outcomes
+
+    @classmethod
+    @Tracer.traced("loading")
+    def load(
+        cls,
+        settings: Settings,
+        metadata_files: List[Path],
+        data: DataContainer,
+    ) -> None:
+        """
+        Load metadata files into a data container.
+
+        If more than one metadata worker is configured in the settings, the
+        files are parsed in parallel. Files that can not be parsed are
+        reported individually. In that case, no metadata is loaded at all
+        and the error of the first such file is raised.
+
+        Args:
+            settings (Settings): The settings of the run.
+            metadata_files (List[Path]): The metadata files to be loaded, in
+                the order in which they are to be added.
+            data (DataContainer): The data container to load the metadata
+                into.
+
+        Raises:
+            yaml.YAMLError: Exception thrown if any file is no valid YAML.
+        """
+        outcomes = cls._parse_all(settings, metadata_files)
+
+        errors: List[Tuple[Path, yaml.YAMLError]] = [
+            (metadata_file, outcome)
+            for (metadata_file, outcome) in zip(metadata_files, outcomes)
+            if isinstance(outcome, yaml.YAMLError)
+        ]
+        for (metadata_file, error) in errors:
+            logging.error(f"Could not parse metadata file {metadata_file}: "
+                          f"{error}")
+        if errors:
+            raise errors[0][1]
+
+        for (metadata_file, outcome) in zip(metadata_files, outcomes):
+            logging.debug(f"Loading Metadata from {metadata_file}")
+            (metadata_yaml, validated) = outcome
+            data.load_metadata(metadata_yaml, validate=not validated)
@@ -24,6 +24,7 @@ import logging
 import traceback
 
 from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.tracer import Tracer
 from hifis_surveyval.data_container import DataContainer
 
 
@@ -31,6 +32,7 @@ class Preprocessor(object):
     """Provides running a preprocessing script."""
 
     @classmethod
+    @Tracer.traced("preprocessing")
     def preprocess(
         cls, settings: Settings, data: DataContainer
     ) -> DataContainer:
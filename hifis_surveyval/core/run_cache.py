@@ -0,0 +1,338 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module allows re-using the outputs of unchanged analysis scripts.
+
+Each analysis script is identified by a fingerprint over its source code,
+the survey data, the metadata, the preprocessing script, the plot styles,
+the settings affecting the outputs, and the fingerprints of the scripts it
+requires results from. If a script has the same fingerprint as in the
+previous run, the files it wrote back then are linked (or copied) into the
+output folder of the current run instead of running the script again.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.snapshot_cache import SnapshotCache
+
+
+class RunCache(object):
+    """Keeps track of the outputs of analysis scripts across runs."""
+
+    FORMAT_VERSION: int = 1
+    """Changes whenever the layout of the index or the fingerprints change."""
+
+    INDEX_FILE: str = "runs.json"
+    """The file in the cache folder holding the index of previous outputs."""
+
+    STAGING_PREFIX: str = ".incomplete-"
+    """Prefix of the folders in which outputs are collected while running."""
+
+    RELEVANT_SETTINGS: List[str] = [
+        "OUTPUT_FORMAT",
+        "CUSTOM_PLOT_STYLE",
+        "ID_COLUMN_NAME",
+        "ANONYMOUS_QUESTION_ID",
+        "HIERARCHY_SEPARATOR",
+        "DATA_ID_SEPARATOR",
+        "TRUE_VALUES",
+        "FALSE_VALUES",
+    ]
+    """The settings that affect the outputs of analysis scripts."""
+
+    PLOT_STYLE_FOLDERS: List[Path] = [
+        Path("hifis_surveyval/plotting/plot_styles"),
+        Path("custom_plot_styles"),
+    ]
+    """The folders from which plot styles are loaded by the plotter."""
+
+    def __init__(self, settings: Settings, data_fingerprint: str) -> None:
+        """
+        Set up the cache and read the index of the previous run.
+
+        Args:
+            settings:
+                The settings of the current run.
+            data_fingerprint:
+                A fingerprint of all inputs shared by the analysis scripts,
+                as obtained from data_fingerprint_for().
+        """
+        self._settings: Settings = settings
+        self._data_fingerprint: str = data_fingerprint
+        self._previous: Dict[str, Dict[str, Any]] = self._read_index()
+        self._current: Dict[str, Dict[str, Any]] = {}
+        self._fingerprints: Dict[str, str] = {}
+
+    @classmethod
+    def data_fingerprint_for(
+        cls,
+        settings: Settings,
+        survey_data: Path,
+        metadata_files: List[Path],
+    ) -> str:
+        """
+        Calculate a fingerprint of all inputs shared by the analysis scripts.
+
+        Args:
+            settings:
+                The settings of the run.
+            survey_data:
+                The CSV file holding the survey data.
+            metadata_files:
+                The metadata files to be loaded.
+        Returns:
+            A hash over the survey data, the metadata, the preprocessing
+            script, the available plot styles and the relevant settings.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"format {cls.FORMAT_VERSION}\n".encode("utf-8"))
+        digest.update(
+            SnapshotCache.key_for(
+                settings=settings,
+                survey_data=survey_data,
+                metadata_files=metadata_files,
+            ).encode("utf-8")
+        )
+
+        for name in cls.RELEVANT_SETTINGS:
+            value = getattr(settings, name)
+            if isinstance(value, (set, frozenset)):
+                value = sorted(value)
+            digest.update(f"{name}={value!r}\n".encode("utf-8"))
+
+        files: List[Path] = [settings.PREPROCESSING_FILENAME]
+        for folder in cls.PLOT_STYLE_FOLDERS:
+            if folder.is_dir():
+                files.extend(sorted(folder.glob("*.mplstyle")))
+        for file in files:
+            if file.is_file():
+                digest.update(f"file {file}\n".encode("utf-8"))
+                digest.update(file.read_bytes())
+
+        return digest.hexdigest()
+
+    @property
+    def _index_path(self) -> Path:
+        """
+        Get the path of the index file.
+
+        Returns:
+            The path of the index of previous outputs in the cache folder.
+        """
+        return self._settings.CACHE_FOLDER / self.INDEX_FILE
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the index of the outputs of the previous run.
+
+        Returns:
+            A mapping from module names to their entries. Empty if there is
+            no usable index.
+        """
+        try:
+            with self._index_path.open(mode="r", encoding="utf-8") as stream:
+                index: Dict[str, Any] = json.load(stream)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            logging.warning(f"Ignoring broken index of previous runs "
+                            f"{self._index_path}: {error}")
+            return {}
+
+        if index.get("format") != self.FORMAT_VERSION:
+            return {}
+        return index.get("modules", {})
+
+    def save(self) -> None:
+        """
+        Write the index of the outputs of the current run.
+
+        Modules that did not run successfully are left out, so they will be
+        run again next time.
+        """
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path: Path = self._index_path.with_suffix(".tmp")
+        with temporary_path.open(mode="w", encoding="utf-8") as stream:
+            json.dump(
+                {"format": self.FORMAT_VERSION, "modules": self._current},
+                stream,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(temporary_path, self._index_path)
+
+    def fingerprint(
+        self, module_name: str, module_path: Path, dependencies: Iterable[str]
+    ) -> str:
+        """
+        Calculate the fingerprint of an analysis script.
+
+        The fingerprints of the dependencies must have been calculated
+        before.
+
+        Args:
+            module_name:
+                The name of the module containing the script.
+            module_path:
+                The path of the script file.
+            dependencies:
+                The names of the modules the script requires results from.
+        Returns:
+            A hash over the script, the shared inputs and the fingerprints
+            of the dependencies.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"data {self._data_fingerprint}\n".encode("utf-8"))
+        for dependency in sorted(dependencies):
+            digest.update(
+                f"requires {self._fingerprints[dependency]}\n".encode("utf-8")
+            )
+        digest.update(module_path.read_bytes())
+
+        fingerprint: str = digest.hexdigest()
+        self._fingerprints[module_name] = fingerprint
+        return fingerprint
+
+    def reusable_outputs(self, module_name: str) -> Optional[List[Path]]:
+        """
+        Find the outputs of a script that can be re-used from the last run.
+
+        Args:
+            module_name:
+                The name of the module containing the script. Its fingerprint
+                must have been calculated before.
+        Returns:
+            The paths of the output files of the previous run, if the script
+            did not change and all of them still exist. None otherwise.
+            Scripts that did not write any files are never re-used, since
+            there would be nothing to show for them.
+        """
+        entry: Optional[Dict[str, Any]] = self._previous.get(module_name)
+        if not entry or entry["fingerprint"] != self._fingerprints.get(
+            module_name
+        ):
+            return None
+
+        outputs: List[Path] = [
+            Path(entry["output_path"]) / output for output in entry["outputs"]
+        ]
+        if not outputs or not all(output.is_file() for output in outputs):
+            return None
+        return outputs
+
+    def reuse(self, module_name: str, outputs: List[Path]) -> None:
+        """
+        Place the outputs of a previous run into the current output folder.
+
+        The files are hard-linked if possible, or copied otherwise.
+
+        Args:
+            module_name:
+                The name of the module that wrote the files.
+            outputs:
+                The files as obtained from reusable_outputs().
+        """
+        previous_path = Path(self._previous[module_name]["output_path"])
+        relative_outputs: List[str] = []
+        for output in outputs:
+            relative_output: Path = output.relative_to(previous_path)
+            target: Path = (
+                self._settings.ANALYSIS_OUTPUT_PATH / relative_output
+            )
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                target.unlink()
+            try:
+                os.link(output, target)
+            except OSError:
+                shutil.copy2(output, target)
+            relative_outputs.append(relative_output.as_posix())
+
+        self._record(module_name, relative_outputs)
+
+    def staging_path(self, module_name: str) -> Path:
+        """
+        Get the folder in which a script's outputs are collected while running.
+
+        Args:
+            module_name:
+                The name of the module containing the script.
+        Returns:
+            A folder within the output folder of the current run.
+        """
+        return (
+            self._settings.ANALYSIS_OUTPUT_PATH
+            / f"{self.STAGING_PREFIX}{module_name}"
+        )
+
+    def collect(self, module_name: str, succeeded: bool) -> None:
+        """
+        Move the outputs of a finished script into the output folder.
+
+        If the script succeeded, its outputs are recorded for re-use.
+
+        Args:
+            module_name:
+                The name of the module containing the script.
+            succeeded:
+                Whether the script ran without errors.
+        """
+        staging_path: Path = self.staging_path(module_name)
+        if not staging_path.is_dir():
+            return
+
+        relative_outputs: List[str] = []
+        for output in sorted(staging_path.rglob("*")):
+            if not output.is_file():
+                continue
+            relative_output: Path = output.relative_to(staging_path)
+            target: Path = (
+                self._settings.ANALYSIS_OUTPUT_PATH / relative_output
+            )
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(output, target)
+            relative_outputs.append(relative_output.as_posix())
+        shutil.rmtree(staging_path, ignore_errors=True)
+
+        if succeeded:
+            self._record(module_name, relative_outputs)
+
+    def _record(self, module_name: str, relative_outputs: List[str]) -> None:
+        """
+        Note the outputs of a script in the index of the current run.
+
+        Args:
+            module_name:
+                The name of the module that wrote the outputs.
+            relative_outputs:
+                The paths of the outputs, relative to the output folder.
+        """
+        self._current[module_name] = {
+            "fingerprint": self._fingerprints[module_name],
+            "output_path": str(self._settings.ANALYSIS_OUTPUT_PATH.resolve()),
+            "outputs": relative_outputs,
+        }
@@ -0,0 +1,201 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module describes the time and memory analysis scripts may use.
+
+Default limits are given in the settings. Analysis scripts may set their own
+limits by assigning numbers (or 0 for no limit) to the module-level
+variables TIMEOUT (in seconds) and MEMORY_LIMIT (in MiB):
+
+    TIMEOUT = 600
+    MEMORY_LIMIT = 4096
+
+    def run(hifis_surveyval, data):
+        ...
+
+The declarations are read without executing the scripts. Limited scripts are
+run in a process of their own, which is stopped once the script exceeds its
+time limit. The memory limit is enforced by the operating system, so
+allocations beyond it fail with a MemoryError.
+"""
+import ast
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from hifis_surveyval.core.settings import Settings
+
+# Limiting the memory of a process is only possible on Unix systems
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class ScriptBudget(object):
+    """The time and memory an analysis script may use."""
+
+    TIMEOUT_TOKEN: str = "TIMEOUT"
+    """The module-level variable holding the time limit of a script."""
+
+    MEMORY_LIMIT_TOKEN: str = "MEMORY_LIMIT"
+    """The module-level variable holding the memory limit of a script."""
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+    ) -> None:
+        """
+        Set up a budget.
+
+        Args:
+            timeout:
+                The time in seconds after which the script is stopped, None
+                for no limit.
+            memory_limit:
+                The amount of memory in MiB the script may allocate, None for
+                no limit.
+        """
+        self.timeout: Optional[float] = timeout
+        self.memory_limit: Optional[int] = memory_limit
+
+    @property
+    def limited(self) -> bool:
+        """
+        Check whether the script is limited at all.
+
+        Returns:
+            True if the script has a time or memory limit, False otherwise.
+        """
+        return self.timeout is not None or self.memory_limit is not None
+
+    @classmethod
+    def for_module(
+        cls, settings: Settings, module_path: Path
+    ) -> "ScriptBudget":
+        """
+        Determine the budget of a script.
+
+        Limits declared in the script take precedence over those given in
+        the settings. A limit of 0 means that the script is not limited.
+        The script is parsed, but not executed. Scripts that can not be
+        parsed get the limits given in the settings.
+
+        Args:
+            settings:
+                The settings holding the default limits.
+            module_path:
+                The path to the script file.
+        Returns:
+            The budget of the script.
+        Raises:
+            ValueError:
+                If a declared limit is not a number or negative.
+        """
+        limits: Dict[str, float] = {
+            cls.TIMEOUT_TOKEN: settings.SCRIPT_TIMEOUT,
+            cls.MEMORY_LIMIT_TOKEN: settings.SCRIPT_MEMORY_LIMIT,
+        }
+        try:
+            tree = ast.parse(
+                module_path.read_text(encoding="utf-8"),
+                filename=str(module_path),
+            )
+        except SyntaxError:
+            tree = None
+
+        for statement in tree.body if tree is not None else []:
+            if isinstance(statement, ast.Assign):
+                targets = statement.targets
+            elif isinstance(statement, ast.AnnAssign) and statement.value:
+                targets = [statement.target]
+            else:
+                continue
+
+            for target in targets:
+                if not (isinstance(target, ast.Name) and target.id in limits):
+                    continue
+                try:
+                    limit = ast.literal_eval(statement.value)
+                except ValueError:
+                    limit = None
+                if (
+                    isinstance(limit, bool)
+                    or not isinstance(limit, (int, float))
+                    or limit < 0
+                ):
+                    raise ValueError(
+                        f"{target.id} in {module_path.name} must be a "
+                        f"number of at least 0"
+                    )
+                limits[target.id] = limit
+
+        return cls(
+            timeout=limits[cls.TIMEOUT_TOKEN] or None,
+            memory_limit=limits[cls.MEMORY_LIMIT_TOKEN] or None,
+        )
+
+    def apply_memory_limit(self) -> None:
+        """
+        Limit the memory the current process may allocate from now on.
+
+        The limit applies to the address space of the process, on top of
+        the address space it already uses. If the limit can not be applied
+        on this platform, a warning is logged.
+        """
+        if self.memory_limit is None:
+            return
+        if resource is None:
+            logging.warning(
+                "Memory limits can not be enforced on this platform."
+            )
+            return
+
+        limit: int = self._address_space() + int(self.memory_limit * 2**20)
+        (_, hard_limit) = resource.getrlimit(resource.RLIMIT_AS)
+        if hard_limit != resource.RLIM_INFINITY:
+            limit = min(limit, hard_limit)
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard_limit))
+        except (ValueError, OSError) as error:
+            logging.warning(
+                f"Memory limits can not be enforced on this platform: "
+                f"{error}"
+            )
+
+    @staticmethod
+    def _address_space() -> int:
+        """
+        Determine the size of the address space of the current process.
+
+        Returns:
+            The size in bytes, or 0 if it can not be determined on this
+            platform.
+        """
+        try:
+            with open("/proc/self/statm") as statm:
+                pages: int = int(statm.read().split()[0])
+        except (OSError, ValueError, IndexError):
+            return 0
+        return pages * os.sysconf("SC_PAGE_SIZE")
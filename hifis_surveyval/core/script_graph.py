@@ -0,0 +1,264 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module tracks the dependencies between analysis scripts.
+
+Analysis scripts may declare intermediate results they provide to other
+scripts and results of other scripts they require, by assigning lists of
+result names to the module-level variables PROVIDES and REQUIRES:
+
+    PROVIDES = ["cleaned_cross_tabulation"]
+
+    def run(hifis_surveyval, data):
+        ...
+        return {"cleaned_cross_tabulation": frame}
+
+Scripts that require results receive them as an additional keyword
+argument:
+
+    REQUIRES = ["cleaned_cross_tabulation"]
+
+    def run(hifis_surveyval, data, results):
+        frame = results["cleaned_cross_tabulation"]
+
+The declarations are read without executing the scripts.
+"""
+import ast
+import logging
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+
+class ScriptGraph(object):
+    """
+    Describes which analysis scripts provide results to which other scripts.
+
+    Scripts are added in the order in which they were discovered. This order
+    is kept as far as the dependencies between the scripts allow.
+    """
+
+    PROVIDES_TOKEN: str = "PROVIDES"
+    """The module-level variable listing the results a script provides."""
+
+    REQUIRES_TOKEN: str = "REQUIRES"
+    """The module-level variable listing the results a script requires."""
+
+    def __init__(self) -> None:
+        """Set up a graph without any scripts."""
+        self._modules: List[str] = []
+        self._provides: Dict[str, List[str]] = {}
+        self._requires: Dict[str, List[str]] = {}
+        self._providers: Dict[str, str] = {}
+
+    @classmethod
+    def read_declarations(
+        cls, module_path: Path
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Read the results a script provides and requires.
+
+        The script is parsed, but not executed. Scripts that can not be
+        parsed are treated as if they did not declare anything, the error
+        will surface once they are loaded.
+
+        Args:
+            module_path:
+                The path to the script file.
+        Returns:
+            A tuple of the names of the provided and the required results.
+        Raises:
+            ValueError:
+                If a declaration is not a literal list of strings.
+        """
+        declarations: Dict[str, List[str]] = {
+            cls.PROVIDES_TOKEN: [],
+            cls.REQUIRES_TOKEN: [],
+        }
+        try:
+            tree = ast.parse(
+                module_path.read_text(encoding="utf-8"),
+                filename=str(module_path),
+            )
+        except SyntaxError:
+            return [], []
+
+        for statement in tree.body:
+            if isinstance(statement, ast.Assign):
+                targets = statement.targets
+            elif isinstance(statement, ast.AnnAssign) and statement.value:
+                targets = [statement.target]
+            else:
+                continue
+
+            for target in targets:
+                if not (
+                    isinstance(target, ast.Name)
+                    and target.id in declarations
+                ):
+                    continue
+                try:
+                    names = ast.literal_eval(statement.value)
+                except ValueError:
+                    names = None
+                if not (
+                    isinstance(names, (list, tuple))
+                    and all(isinstance(name, str) for name in names)
+                ):
+                    raise ValueError(
+                        f"{target.id} in {module_path.name} must be a "
+                        f"literal list of result names"
+                    )
+                declarations[target.id] = list(names)
+
+        return (
+            declarations[cls.PROVIDES_TOKEN],
+            declarations[cls.REQUIRES_TOKEN],
+        )
+
+    def add(
+        self, module_name: str, provides: List[str], requires: List[str]
+    ) -> None:
+        """
+        Add a script to the graph.
+
+        Args:
+            module_name:
+                The name of the module containing the script.
+            provides:
+                The names of the results the script provides.
+            requires:
+                The names of the results the script requires.
+        """
+        self._modules.append(module_name)
+        self._provides[module_name] = provides
+        self._requires[module_name] = requires
+
+    def provides(self, module_name: str) -> List[str]:
+        """
+        Get the names of the results a script provides.
+
+        Args:
+            module_name:
+                The name of the module containing the script.
+        Returns:
+            The names of the provided results, which may be empty.
+        """
+        return self._provides.get(module_name, [])
+
+    def requires(self, module_name: str) -> List[str]:
+        """
+        Get the names of the results a script requires.
+
+        Args:
+            module_name:
+                The name of the module containing the script.
+        Returns:
+            The names of the required results, which may be empty.
+        """
+        return self._requires.get(module_name, [])
+
+    def dependencies(self, module_name: str) -> Set[str]:
+        """
+        Get the scripts providing the results a script requires.
+
+        Only valid after order() has been called.
+
+        Args:
+            module_name:
+                The name of the module containing the script.
+        Returns:
+            The names of the modules the script depends on.
+        """
+        return {
+            self._providers[result_name]
+            for result_name in self.requires(module_name)
+            if result_name in self._providers
+        }
+
+    def order(self) -> List[str]:
+        """
+        Determine the order in which the scripts are to be run.
+
+        Each script is placed after all scripts providing results it
+        requires. Scripts whose requirements can not be met are left out and
+        logged as errors. This is the case if a required result is not
+        provided by any script, if a result is provided by a script that
+        was discovered earlier already, or if scripts depend on each other
+        in a cycle. Scripts depending on left out scripts are left out too.
+
+        Returns:
+            The names of all scripts that can be run, in an order respecting
+            their dependencies and otherwise the discovery order.
+        """
+        excluded: Set[str] = set()
+        self._providers = {}
+        for module_name in self._modules:
+            for result_name in self.provides(module_name):
+                if result_name in self._providers:
+                    logging.error(
+                        f"Module {module_name} skipped: Result {result_name} "
+                        f"is already provided by module "
+                        f"{self._providers[result_name]}."
+                    )
+                    excluded.add(module_name)
+                    continue
+                self._providers[result_name] = module_name
+
+        for module_name in self._modules:
+            for result_name in self.requires(module_name):
+                if result_name not in self._providers:
+                    logging.error(
+                        f"Module {module_name} skipped: Required result "
+                        f"{result_name} is not provided by any module."
+                    )
+                    excluded.add(module_name)
+
+        ordered: List[str] = []
+        remaining: List[str] = [
+            module_name
+            for module_name in self._modules
+            if module_name not in excluded
+        ]
+        while remaining:
+            for module_name in remaining:
+                dependencies = self.dependencies(module_name)
+                if dependencies & excluded:
+                    logging.error(
+                        f"Module {module_name} skipped: It depends on "
+                        f"skipped modules {sorted(dependencies & excluded)}."
+                    )
+                    excluded.add(module_name)
+                    remaining.remove(module_name)
+                    break
+                if dependencies.issubset(ordered):
+                    ordered.append(module_name)
+                    remaining.remove(module_name)
+                    break
+            else:
+                # None of the remaining modules can be run, since they all
+                # wait for each other.
+                logging.error(
+                    f"Modules {remaining} skipped: Their required results "
+                    f"depend on each other in a cycle."
+                )
+                break
+
+        return ordered
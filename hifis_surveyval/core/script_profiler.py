@@ -0,0 +1,335 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This module measures the resources used by analysis scripts.
+
+For each script, the wall time and the CPU time are recorded. Optionally,
+the peak amount of memory allocated by Python is traced and the script is
+run under cProfile to find the functions it spends its time in. The
+measurements of all scripts are written as a report into the output folder
+of the run.
+"""
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from hifis_surveyval.core.memory_report import MemoryStages
+from hifis_surveyval.core.settings import Settings
+
+
+class ScriptProfile(object):
+    """Holds the resources used by an analysis script."""
+
+    def __init__(
+        self,
+        module_name: str,
+        wall_time: float,
+        cpu_time: float,
+        peak_memory: Optional[int] = None,
+        functions: Optional[List[Dict[str, Any]]] = None,
+        dump: Optional[Path] = None,
+    ) -> None:
+        """
+        Set up the profile of a finished analysis script.
+
+        Args:
+            module_name:
+                The name of the module containing the analysis script.
+            wall_time:
+                The time in seconds it took to run the script.
+            cpu_time:
+                The processor time in seconds the script used.
+            peak_memory:
+                The largest amount of memory in bytes the script allocated
+                at once, beyond what was allocated before it started, if
+                its memory was traced.
+            functions:
+                The functions the script spent the most time in, slowest
+                first, if the script was run under cProfile.
+            dump:
+                The file holding the cProfile statistics of the script, if
+                it was run under cProfile.
+        """
+        self.module_name: str = module_name
+        self.wall_time: float = wall_time
+        self.cpu_time: float = cpu_time
+        self.peak_memory: Optional[int] = peak_memory
+        self.functions: List[Dict[str, Any]] = functions or []
+        self.dump: Optional[Path] = dump
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Represent the profile by types that can be written as JSON.
+
+        Returns:
+            A dictionary holding the measurements of the profile.
+        """
+        return {
+            "module": self.module_name,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "peak_memory": self.peak_memory,
+            "functions": self.functions,
+            "dump": str(self.dump) if self.dump is not None else None,
+        }
+
+
+class ScriptProfiler(object):
+    """
+    Measures the resources used by an analysis script.
+
+    Use it as a context manager around running the script. Afterwards, the
+    measurements are available as profile.
+    """
+
+    FUNCTION_COUNT: int = 10
+    """The amount of slowest functions recorded per script."""
+
+    def __init__(
+        self,
+        module_name: str,
+        dump: Optional[Path] = None,
+        trace_memory: bool = False,
+    ) -> None:
+        """
+        Set up a profiler for an analysis script.
+
+        Args:
+            module_name:
+                The name of the module containing the analysis script.
+            dump:
+                If given, the script is run under cProfile and the collected
+                statistics are written into this file.
+            trace_memory:
+                Whether to trace the memory allocated by the script.
+                Tracing slows down allocations, which inflates the measured
+                times of allocation-heavy scripts. (Default: False)
+        """
+        self.module_name: str = module_name
+        self.dump: Optional[Path] = dump
+        self.trace_memory: bool = trace_memory
+        self.profile: Optional[ScriptProfile] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._started_tracing: bool = False
+        self._memory_before: int = 0
+        self._wall_start: float = 0.0
+        self._cpu_start: float = 0.0
+
+    def __enter__(self) -> "ScriptProfiler":
+        """
+        Start measuring.
+
+        Returns:
+            The profiler itself.
+        """
+        if self.trace_memory:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            else:
+                # The peak may stem from before the script started otherwise,
+                # while the peak of the current memory stage is kept
+                MemoryStages.reset_peak()
+            self._memory_before = tracemalloc.get_traced_memory()[0]
+
+        if self.dump is not None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, *exception_info: Any) -> None:
+        """
+        Stop measuring and record the profile.
+
+        Args:
+            exception_info:
+                Information about an exception raised by the script, which
+                is not suppressed.
+        """
+        wall_time: float = time.perf_counter() - self._wall_start
+        cpu_time: float = time.process_time() - self._cpu_start
+        functions: List[Dict[str, Any]] = []
+        if self._profiler is not None:
+            self._profiler.disable()
+            functions = self._slowest_functions(self._profiler)
+            self.dump.parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(str(self.dump))
+
+        peak_memory: Optional[int] = None
+        if self.trace_memory:
+            peak_memory = max(
+                0, tracemalloc.get_traced_memory()[1] - self._memory_before
+            )
+            if self._started_tracing:
+                tracemalloc.stop()
+
+        self.profile = ScriptProfile(
+            module_name=self.module_name,
+            wall_time=wall_time,
+            cpu_time=cpu_time,
+            peak_memory=peak_memory,
+            functions=functions,
+            dump=self.dump,
+        )
+
+    @classmethod
+    def _slowest_functions(
+        cls, profiler: cProfile.Profile
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract the functions a profiled script spent the most time in.
+
+        Args:
+            profiler:
+                The profiler the script ran under.
+        Returns:
+            The functions, ordered by the time spent in the function itself
+            (excluding the functions it called), slowest first.
+        """
+        statistics: Dict[Any, Any] = pstats.Stats(profiler).stats
+        functions: List[Dict[str, Any]] = [
+            {
+                "function": pstats.func_std_string(function),
+                "calls": calls,
+                "own_time": own_time,
+                "cumulative_time": cumulative_time,
+            }
+            for (function, (_, calls, own_time, cumulative_time, _))
+            in statistics.items()
+        ]
+        functions.sort(key=lambda function: -function["own_time"])
+        return functions[:cls.FUNCTION_COUNT]
+
+
+class ProfileReport(object):
+    """Writes and summarizes the profiles of the analysis scripts of a run."""
+
+    JSON_FILE: str = "profile.json"
+    """The machine-readable report in the output folder."""
+
+    TEXT_FILE: str = "profile.txt"
+    """The human-readable report in the output folder."""
+
+    @classmethod
+    def write(cls, settings: Settings, profiles: List[ScriptProfile]) -> None:
+        """
+        Write the profiles into the output folder of the run.
+
+        Args:
+            settings:
+                The settings naming the output folder.
+            profiles:
+                The profiles of the analysis scripts that ran.
+        """
+        ordered: List[ScriptProfile] = cls._slowest_first(profiles)
+        settings.ANALYSIS_OUTPUT_PATH.mkdir(parents=True, exist_ok=True)
+
+        json_path: Path = settings.ANALYSIS_OUTPUT_PATH / cls.JSON_FILE
+        temporary: Path = json_path.with_name(f".{json_path.name}.tmp")
+        temporary.write_text(
+            json.dumps(
+                {"scripts": [profile.as_dict() for profile in ordered]},
+                indent=2,
+            )
+        )
+        os.replace(temporary, json_path)
+
+        text_path: Path = settings.ANALYSIS_OUTPUT_PATH / cls.TEXT_FILE
+        temporary = text_path.with_name(f".{text_path.name}.tmp")
+        temporary.write_text(cls.summary(ordered, count=len(ordered)))
+        os.replace(temporary, text_path)
+
+    @classmethod
+    def summary(cls, profiles: List[ScriptProfile], count: int = 5) -> str:
+        """
+        Summarize the slowest scripts and functions of a run.
+
+        Args:
+            profiles:
+                The profiles of the analysis scripts that ran.
+            count:
+                The amount of slowest scripts and functions to list.
+        Returns:
+            A text listing the slowest scripts and, if available, the
+            slowest functions, each as a table.
+        """
+        traced: bool = any(
+            profile.peak_memory is not None for profile in profiles
+        )
+        lines: List[str] = [
+            "Slowest scripts (times include the overhead of tracing memory):"
+            if traced else "Slowest scripts:",
+            f"{'Wall [s]':>10} {'CPU [s]':>10} {'Memory [MiB]':>13}  Script",
+        ]
+        for profile in cls._slowest_first(profiles)[:count]:
+            lines.append(
+                f"{profile.wall_time:>10.3f} {profile.cpu_time:>10.3f} "
+                + (
+                    f"{profile.peak_memory / 2**20:>13.1f}  "
+                    if profile.peak_memory is not None else f"{'-':>13}  "
+                )
+                + f"{profile.module_name}"
+            )
+
+        functions: List[Dict[str, Any]] = sorted(
+            (
+                dict(function, module=profile.module_name)
+                for profile in profiles
+                for function in profile.functions
+            ),
+            key=lambda function: -function["own_time"],
+        )
+        if functions:
+            lines.extend([
+                "",
+                "Slowest functions:",
+                f"{'Own [s]':>10} {'Total [s]':>10} {'Calls':>10}  "
+                f"Script: Function",
+            ])
+            for function in functions[:count]:
+                lines.append(
+                    f"{function['own_time']:>10.3f} "
+                    f"{function['cumulative_time']:>10.3f} "
+                    f"{function['calls']:>10}  "
+                    f"{function['module']}: {function['function']}"
+                )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _slowest_first(profiles: List[ScriptProfile]) -> List[ScriptProfile]:
+        """
+        Order profiles by the wall time of their scripts.
+
+        Args:
+            profiles:
+                The profiles to be ordered.
+        Returns:
+            The profiles, slowest script first.
+        """
+        return sorted(profiles, key=lambda profile: -profile.wall_time)
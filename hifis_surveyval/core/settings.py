@@ -35,6 +35,7 @@ from typing import Any, Dict, List, Optional, Set
 import yaml
 from pydantic import BaseSettings, validator
 
+from hifis_surveyval.core.supported_csv_engine import SupportedCsvEngine
 from hifis_surveyval.plotting.supported_output_format import (
     SupportedOutputFormat,
 )
@@ -204,6 +205,173 @@ class FileSettings(BaseSettings):
     # and Question ID.
     DATA_ID_SEPARATOR: str = "_"
 
+    # Amount of CSV rows that are read and decoded at once when loading the
+    # survey data. Smaller values lower the peak memory usage while loading.
+    CSV_CHUNK_SIZE: int = 10000
+
+    @validator("CSV_CHUNK_SIZE")
+    def validate_csv_chunk_size(cls, to_validate: int) -> int:
+        """
+        Ensure the CSV chunk size is a positive number.
+
+        Args:
+            to_validate:
+                The amount of rows to be processed at once.
+
+        Returns:
+            The amount of rows if it is valid.
+
+        Raises:
+            ValueError:
+                If the given amount is less than one.
+        """
+        if to_validate < 1:
+            raise ValueError("CSV chunk size must be at least 1")
+        return to_validate
+
+    # Amount of worker processes used to decode the survey data. Columns are
+    # spread across the workers, which speeds up loading surveys with many
+    # questions. A value of 1 decodes all columns in the main process.
+    DECODE_WORKERS: int = 1
+
+    # Amount of worker processes used to parse and validate the metadata
+    # files. A value of 1 processes all files in the main process.
+    METADATA_WORKERS: int = 1
+
+    # Amount of analysis scripts that are run at the same time. Each script
+    # then runs in a process of its own, forked from the main process once
+    # the survey data is loaded. A value of 1 runs all scripts one after
+    # another in the main process.
+    SCRIPT_WORKERS: int = 1
+
+    @validator("DECODE_WORKERS", "METADATA_WORKERS", "SCRIPT_WORKERS")
+    def validate_worker_count(cls, to_validate: int) -> int:
+        """
+        Ensure the amount of worker processes is a positive number.
+
+        Args:
+            to_validate:
+                The amount of worker processes to be used.
+
+        Returns:
+            The amount of worker processes if it is valid.
+
+        Raises:
+            ValueError:
+                If the given amount is less than one.
+        """
+        if to_validate < 1:
+            raise ValueError("Amount of worker processes must be at least 1")
+        return to_validate
+
+    # Time in seconds after which an analysis script is stopped, 0 for no
+    # limit. Analysis scripts may set a different limit by assigning a number
+    # to the module-level variable TIMEOUT.
+    SCRIPT_TIMEOUT: float = 0
+
+    # Amount of memory in MiB an analysis script may allocate in addition to
+    # what the main process holds when the script is started, 0 for no limit.
+    # Analysis scripts may set a different limit by assigning a number to the
+    # module-level variable MEMORY_LIMIT.
+    # If either limit is set, each script runs in a process of its own, even
+    # if SCRIPT_WORKERS is 1.
+    SCRIPT_MEMORY_LIMIT: int = 0
+
+    @validator("SCRIPT_TIMEOUT", "SCRIPT_MEMORY_LIMIT")
+    def validate_script_limit(cls, to_validate: float) -> float:
+        """
+        Ensure a limit for analysis scripts is not negative.
+
+        Args:
+            to_validate:
+                The limit to be used, 0 if scripts are not limited.
+
+        Returns:
+            The limit if it is valid.
+
+        Raises:
+            ValueError:
+                If the given limit is negative.
+        """
+        if to_validate < 0:
+            raise ValueError("Limits for analysis scripts must be at least 0")
+        return to_validate
+
+    # The parser used to read the survey data CSV. PANDAS and PYARROW hand
+    # whole columns to the data container, which is faster for large files.
+    # PYARROW requires the optional pyarrow package to be installed.
+    CSV_ENGINE: SupportedCsvEngine = SupportedCsvEngine.CSV
+
+    # Whether to keep a snapshot of the loaded survey data in the CACHE_FOLDER.
+    # As long as neither the survey data, the metadata nor the settings
+    # affecting their interpretation change, later runs restore the data
+    # from the snapshot instead of parsing it again.
+    SNAPSHOT_CACHE: bool = False
+
+    # Whether to keep the validated contents of each metadata file in the
+    # CACHE_FOLDER. Metadata files that did not change since they were cached
+    # are neither parsed nor validated again.
+    METADATA_CACHE: bool = False
+
+    # Whether to construct question collections only on first access. The
+    # metadata is then indexed by collection ID and each collection is
+    # validated once it is requested, which shortens the startup for runs
+    # that only use a few collections of a large survey.
+    LAZY_METADATA: bool = False
+
+    # Amount of memory in MiB taken up by the pandas series and data frames
+    # of questions and question collections that are kept for re-use, 0 to
+    # build them anew on each call. The least recently used ones are dropped
+    # first once the limit is reached.
+    FRAME_CACHE_SIZE: int = 256
+
+    @validator("FRAME_CACHE_SIZE")
+    def validate_frame_cache_size(cls, to_validate: int) -> int:
+        """
+        Ensure the size of the frame cache is not negative.
+
+        Args:
+            to_validate:
+                The size of the frame cache in MiB.
+
+        Returns:
+            The size if it is valid.
+
+        Raises:
+            ValueError:
+                If the given size is negative.
+        """
+        if to_validate < 0:
+            raise ValueError("Frame cache size must be at least 0")
+        return to_validate
+
+    # Whether to re-use the outputs of analysis scripts from the previous run
+    # if neither the scripts nor their inputs changed. The index of previous
+    # outputs is kept in the CACHE_FOLDER.
+    INCREMENTAL: bool = False
+
+    # Whether to measure the wall time and CPU time of each analysis script.
+    # A report is written into the ANALYSIS_OUTPUT_PATH and the slowest
+    # scripts are listed at the end of the run.
+    PROFILE_SCRIPTS: bool = False
+
+    # Whether to additionally trace the peak memory of each analysis script
+    # while profiling. Tracing slows down allocations, so the times of
+    # allocation-heavy scripts are inflated.
+    PROFILE_MEMORY: bool = False
+
+    # Whether to additionally run each analysis script under cProfile while
+    # profiling. The statistics are written into the folder "profiles" in the
+    # ANALYSIS_OUTPUT_PATH and the slowest functions are listed as well.
+    PROFILE_FUNCTIONS: bool = False
+
+    # Unix socket on which "hifis-surveyval serve" accepts analysis scripts
+    # submitted by "hifis-surveyval run".
+    SERVER_SOCKET: Path = Path(".surveyval.sock")
+
+    # Folder in which cached data is stored
+    CACHE_FOLDER: Path = Path(".surveyval-cache")
+
     # Specify a custom plot style globally for all scripts.
     # A plot style which is explicitly specified in scripts
     # take precedence over this option.
@@ -228,8 +396,8 @@ class Settings(SystemSettings, FileSettings):
         config_dict = {}
         for key in FileSettings.__fields__:
             value = self.__getattribute__(key)
-            if isinstance(value, Path) or isinstance(
-                value, SupportedOutputFormat
+            if isinstance(
+                value, (Path, SupportedOutputFormat, SupportedCsvEngine)
             ):
                 config_dict[key] = str(value)
             else:
@@ -299,6 +467,8 @@ class Settings(SystemSettings, FileSettings):
                     self.__setattr__(
                         key, SupportedOutputFormat.from_str(value)
                     )
+                elif setting_type == SupportedCsvEngine:
+                    self.__setattr__(key, SupportedCsvEngine.from_str(value))
                 else:
                     self.__setattr__(key, setting_type(value))
 
@@ -0,0 +1,304 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module stores loaded survey data on disk to speed up later runs.
+
+A snapshot holds a fully loaded data container, i.e. all metadata objects
+and answer columns. It is identified by a hash over the survey data, the
+metadata files and those settings that affect how they are interpreted.
+The answer arrays are stored as aligned raw buffers next to the pickled
+objects, so they can be memory-mapped instead of being read and copied.
+"""
+import hashlib
+import io
+import logging
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.data_container import DataContainer
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickles a data container while leaving out the settings."""
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        """
+        Replace the settings by a placeholder.
+
+        Args:
+            obj:
+                The object about to be pickled.
+        Returns:
+            A placeholder for the settings, None for all other objects.
+        """
+        return "settings" if isinstance(obj, Settings) else None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickles a data container, injecting the current settings."""
+
+    def __init__(self, settings: Settings, *args, **kwargs) -> None:
+        """
+        Set up the unpickler.
+
+        Args:
+            settings:
+                The settings object to be referenced by the restored objects.
+            *args:
+                Forwarded to pickle.Unpickler.
+            **kwargs:
+                Forwarded to pickle.Unpickler.
+        """
+        super(_SnapshotUnpickler, self).__init__(*args, **kwargs)
+        self._settings: Settings = settings
+
+    def persistent_load(self, pid: str) -> Any:
+        """
+        Resolve the placeholder for the settings.
+
+        Args:
+            pid:
+                The placeholder as given by the pickler.
+        Returns:
+            The current settings.
+        Raises:
+            pickle.UnpicklingError:
+                If the placeholder is unknown.
+        """
+        if pid == "settings":
+            return self._settings
+        raise pickle.UnpicklingError(f"Unknown persistent ID {pid}")
+
+
+class SnapshotCache(object):
+    """Provides storing and restoring snapshots of loaded survey data."""
+
+    FORMAT_VERSION: int = 2
+    """Changes whenever the layout of the stored data changes."""
+
+    MAGIC: bytes = b"HSVSNAP\x00"
+    """Marks the beginning of a snapshot file."""
+
+    SUFFIX: str = ".snapshot"
+
+    ALIGNMENT: int = 64
+    """Buffers are aligned to this many bytes within the snapshot file."""
+
+    RELEVANT_SETTINGS: List[str] = [
+        "ID_COLUMN_NAME",
+        "ANONYMOUS_QUESTION_ID",
+        "HIERARCHY_SEPARATOR",
+        "DATA_ID_SEPARATOR",
+        "TRUE_VALUES",
+        "FALSE_VALUES",
+    ]
+    """The settings that affect how survey data and metadata are loaded."""
+
+    _HEADER = struct.Struct("<8sQ")
+    # The magic bytes and the offset of the table of contents
+
+    @classmethod
+    def is_supported(cls) -> bool:
+        """
+        Check whether snapshots can be used with this Python version.
+
+        Snapshots rely on out-of-band buffers of pickle protocol 5.
+
+        Returns:
+            True if snapshots are supported, False otherwise.
+        """
+        return pickle.HIGHEST_PROTOCOL >= 5
+
+    @classmethod
+    def key_for(
+        cls, settings: Settings, survey_data: Path, metadata_files: List[Path]
+    ) -> str:
+        """
+        Calculate the key identifying a snapshot.
+
+        Args:
+            settings (Settings): The settings of the run.
+            survey_data (Path): The CSV file holding the survey data.
+            metadata_files (List[Path]): The metadata files to be loaded.
+
+        Returns:
+            str: A hash over the contents of all given files and the settings
+            that affect loading them.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"format {cls.FORMAT_VERSION}\n".encode("utf-8"))
+
+        for name in cls.RELEVANT_SETTINGS:
+            value = getattr(settings, name)
+            if isinstance(value, (set, frozenset)):
+                value = sorted(value)
+            digest.update(f"{name}={value!r}\n".encode("utf-8"))
+
+        for file in [survey_data, *sorted(metadata_files)]:
+            digest.update(f"file {file.name}\n".encode("utf-8"))
+            with file.open(mode="rb") as io_stream:
+                for block in iter(lambda: io_stream.read(1 << 20), b""):
+                    digest.update(block)
+
+        return digest.hexdigest()
+
+    @classmethod
+    def _path_for(cls, settings: Settings, key: str) -> Path:
+        """
+        Get the file in which the snapshot for a key is stored.
+
+        Args:
+            settings (Settings): The settings of the run.
+            key (str): The key identifying the snapshot.
+
+        Returns:
+            Path: The path of the snapshot file.
+        """
+        return settings.CACHE_FOLDER / f"{key}{cls.SUFFIX}"
+
+    @classmethod
+    def store(cls, settings: Settings, key: str, data: DataContainer) -> None:
+        """
+        Store a snapshot of a loaded data container.
+
+        Other snapshots in the cache folder are removed, since they refer to
+        outdated data. Errors while writing are logged and otherwise ignored.
+
+        Args:
+            settings (Settings): The settings of the run.
+            key (str): The key identifying the snapshot.
+            data (DataContainer): The data container to be stored.
+        """
+        if not cls.is_supported():
+            logging.warning(
+                "Snapshots require Python 3.8 or later - not storing one"
+            )
+            return
+
+        buffers: List[pickle.PickleBuffer] = []
+        payload = io.BytesIO()
+        _SnapshotPickler(
+            payload,
+            protocol=5,
+            buffer_callback=buffers.append,
+        ).dump(data)
+
+        target: Path = cls._path_for(settings, key)
+        temporary: Path = target.with_suffix(".tmp")
+        try:
+            settings.CACHE_FOLDER.mkdir(parents=True, exist_ok=True)
+            with temporary.open(mode="wb") as io_stream:
+                io_stream.write(cls._HEADER.pack(cls.MAGIC, 0))
+
+                locations: List[List[int]] = []
+                for buffer in buffers:
+                    raw = buffer.raw()
+                    cls._pad(io_stream)
+                    locations.append([io_stream.tell(), raw.nbytes])
+                    io_stream.write(raw)
+
+                table_offset: int = io_stream.tell()
+                pickle.dump(
+                    {
+                        "buffers": locations,
+                        "payload": payload.getvalue(),
+                    },
+                    io_stream,
+                    protocol=5,
+                )
+                io_stream.seek(0)
+                io_stream.write(cls._HEADER.pack(cls.MAGIC, table_offset))
+
+            os.replace(temporary, target)
+        except OSError as error:
+            logging.warning(f"Could not store snapshot {target}: {error}")
+            return
+
+        for stale in settings.CACHE_FOLDER.glob(f"*{cls.SUFFIX}"):
+            if stale != target:
+                stale.unlink()
+        logging.info(f"Stored snapshot of the survey data in {target}")
+
+    @classmethod
+    def _pad(cls, io_stream: io.BufferedIOBase) -> None:
+        """
+        Write zeros until the stream position is aligned.
+
+        Args:
+            io_stream: The stream to be padded.
+        """
+        misalignment: int = io_stream.tell() % cls.ALIGNMENT
+        if misalignment:
+            io_stream.write(bytes(cls.ALIGNMENT - misalignment))
+
+    @classmethod
+    def load(cls, settings: Settings, key: str) -> Optional[DataContainer]:
+        """
+        Restore a data container from its snapshot.
+
+        The answer arrays are memory-mapped from the snapshot file. They may
+        be modified, but changes are never written back into the snapshot.
+
+        Args:
+            settings (Settings): The settings of the run.
+            key (str): The key identifying the snapshot.
+
+        Returns:
+            Optional[DataContainer]: The restored data container or None if
+            there is no usable snapshot for the given key.
+        """
+        source: Path = cls._path_for(settings, key)
+        if not cls.is_supported() or not source.is_file():
+            return None
+
+        try:
+            with source.open(mode="rb") as io_stream:
+                # Copy-on-write mapping: the arrays are writable in memory
+                # while the file remains untouched.
+                mapped = mmap.mmap(
+                    io_stream.fileno(), 0, access=mmap.ACCESS_COPY
+                )
+
+            (magic, table_offset) = cls._HEADER.unpack_from(mapped)
+            if magic != cls.MAGIC:
+                raise pickle.UnpicklingError("Not a snapshot file")
+
+            table: Dict[str, Any] = pickle.loads(mapped[table_offset:])
+            view = memoryview(mapped)
+            buffers = [
+                view[offset:offset + length]
+                for (offset, length) in table["buffers"]
+            ]
+            data: DataContainer = _SnapshotUnpickler(
+                settings, io.BytesIO(table["payload"]), buffers=buffers
+            ).load()
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError,
+                AttributeError, ImportError) as error:
+            logging.warning(f"Could not restore snapshot {source}: {error}")
+            return None
+
+        logging.info(f"Restored survey data from snapshot {source}")
+        return data
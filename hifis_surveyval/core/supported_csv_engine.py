@@ -0,0 +1,84 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module provides a way of selecting the parser for the survey data.
+
+.. currentmodule:: hifis_surveyval.core.supported_csv_engine
+.. moduleauthor:: HIFIS Software <software@hifis.net>
+"""
+from enum import Enum, auto, unique
+from typing import Set
+
+
+@unique
+class SupportedCsvEngine(Enum):
+    """An abstraction of the supported parsers for the survey data CSV."""
+
+    # Python's built-in csv.reader, always available
+    CSV = auto()
+    # The C parser of pandas
+    PANDAS = auto()
+    # The multithreaded CSV reader of pyarrow, if installed
+    PYARROW = auto()
+
+    def __str__(self) -> str:
+        """
+        Get a string representation of a supported CSV engine.
+
+        Returns:
+            str: String representation of a supported CSV engine.
+        """
+        return self.name
+
+    @classmethod
+    def list(cls) -> Set:
+        """
+        Generate a set listing the supported CSV engines.
+
+        Returns:
+            Set: Set of supported CSV engines.
+        """
+        return set(value.name for value in SupportedCsvEngine)
+
+    @classmethod
+    def from_str(cls, enum_entry: str) -> Enum:
+        """
+        Generate an enum object from a string.
+
+        Args:
+            enum_entry (str): String to be converted into a supported CSV
+                              engine.
+
+        Returns:
+            Enum: Enumeration entry that has been selected.
+
+        Raises:
+            NotImplementedError: Exception thrown if the CSV engine is not
+                                 supported.
+        """
+        engine: SupportedCsvEngine
+        for engine in SupportedCsvEngine:
+            if engine.name == enum_entry:
+                return engine
+        raise NotImplementedError(
+            f"{enum_entry} is currently not implemented."
+            f"Only {SupportedCsvEngine.list()} may be chosen."
+        )
@@ -0,0 +1,211 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module reads the survey data CSV into a data container.
+
+Depending on the configured CSV engine the data is either parsed row by row
+with Python's csv.reader or column by column with pandas or pyarrow. The
+column-wise engines hand their columns directly to the data container,
+skipping the intermediate row-of-strings form.
+"""
+import logging
+from csv import reader
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+import numpy
+from pandas import read_csv
+
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.supported_csv_engine import SupportedCsvEngine
+from hifis_surveyval.core.tracer import Tracer
+from hifis_surveyval.data_container import DataContainer
+
+
+class SurveyDataReader(object):
+    """Provides loading the survey data with the configured CSV engine."""
+
+    @classmethod
+    @Tracer.traced("loading")
+    def read(
+        cls, settings: Settings, survey_data: Path, data: DataContainer
+    ) -> None:
+        """
+        Load the survey data from a CSV file into a data container.
+
+        If the pyarrow engine is selected but pyarrow is not installed, an
+        error is logged and the csv.reader engine is used instead.
+
+        Args:
+            settings (Settings): The settings of the run.
+            survey_data (Path): The CSV file holding the survey data.
+            data (DataContainer): The container to load the data into.
+
+        Raises:
+            ValueError: Exception thrown if the CSV file is empty.
+        """
+        engine: SupportedCsvEngine = settings.CSV_ENGINE
+
+        if engine == SupportedCsvEngine.PYARROW:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                logging.error(
+                    "CSV engine PYARROW requires the pyarrow package, "
+                    "falling back to CSV engine."
+                )
+                engine = SupportedCsvEngine.CSV
+
+        logging.debug(f"Reading survey data with CSV engine {engine}")
+        if engine == SupportedCsvEngine.PANDAS:
+            cls._read_with_pandas(settings, survey_data, data)
+        elif engine == SupportedCsvEngine.PYARROW:
+            cls._read_with_pyarrow(settings, survey_data, data)
+        else:
+            cls._read_with_csv(settings, survey_data, data)
+
+    @classmethod
+    def _read_header(cls, survey_data: Path) -> List[str]:
+        """
+        Read only the header row of a CSV file.
+
+        Args:
+            survey_data (Path): The CSV file holding the survey data.
+
+        Returns:
+            List[str]: The entries of the header row.
+
+        Raises:
+            ValueError: Exception thrown if the CSV file is empty.
+        """
+        with survey_data.open(mode="r", encoding="utf-8") as data_io_stream:
+            header: List[str] = next(reader(data_io_stream), [])
+        if not header:
+            raise ValueError("CSV data is empty, expected at least a header")
+        return header
+
+    @classmethod
+    def _read_with_csv(
+        cls, settings: Settings, survey_data: Path, data: DataContainer
+    ) -> None:
+        """
+        Load the survey data row by row using csv.reader.
+
+        Args:
+            settings (Settings): The settings of the run.
+            survey_data (Path): The CSV file holding the survey data.
+            data (DataContainer): The container to load the data into.
+        """
+        with survey_data.open(mode="r", encoding="utf-8") as data_io_stream:
+            data.load_survey_data(
+                csv_data=reader(data_io_stream),
+                chunk_size=settings.CSV_CHUNK_SIZE,
+            )
+
+    @classmethod
+    def _read_with_pandas(
+        cls, settings: Settings, survey_data: Path, data: DataContainer
+    ) -> None:
+        """
+        Load the survey data column by column using the pandas C parser.
+
+        All values are read as strings without any NA detection, so the
+        questions decode exactly the same text as with csv.reader.
+
+        Args:
+            settings (Settings): The settings of the run.
+            survey_data (Path): The CSV file holding the survey data.
+            data (DataContainer): The container to load the data into.
+        """
+        header: List[str] = cls._read_header(survey_data)
+
+        def column_blocks() -> Iterator[Sequence[numpy.ndarray]]:
+            # The header is read as data as well to keep pandas from renaming
+            # duplicate column names; it is dropped from the first block.
+            chunks = read_csv(
+                survey_data,
+                header=None,
+                dtype=str,
+                keep_default_na=False,
+                na_filter=False,
+                engine="c",
+                encoding="utf-8",
+                chunksize=settings.CSV_CHUNK_SIZE,
+            )
+            skip: int = 1
+            for chunk in chunks:
+                yield [
+                    chunk.iloc[skip:, index].to_numpy(dtype=object)
+                    for index in range(len(header))
+                ]
+                skip = 0
+
+        data.load_survey_columns(header=header, column_blocks=column_blocks())
+
+    @classmethod
+    def _read_with_pyarrow(
+        cls, settings: Settings, survey_data: Path, data: DataContainer
+    ) -> None:
+        """
+        Load the survey data column by column using pyarrow.
+
+        The file is parsed by pyarrow's multithreaded reader and streamed in
+        record batches. All values are read as non-nullable strings. Quoted
+        values may span several lines, as free-text answers often do.
+
+        Args:
+            settings (Settings): The settings of the run.
+            survey_data (Path): The CSV file holding the survey data.
+            data (DataContainer): The container to load the data into.
+        """
+        import pyarrow
+        from pyarrow import csv as pyarrow_csv
+
+        header: List[str] = cls._read_header(survey_data)
+        # Generic names avoid trouble with duplicate column names
+        column_names: List[str] = [f"f{index}" for index in range(len(header))]
+
+        def column_blocks() -> Iterator[Sequence[numpy.ndarray]]:
+            batches = pyarrow_csv.open_csv(
+                str(survey_data),
+                read_options=pyarrow_csv.ReadOptions(
+                    column_names=column_names, use_threads=True
+                ),
+                parse_options=pyarrow_csv.ParseOptions(
+                    newlines_in_values=True
+                ),
+                convert_options=pyarrow_csv.ConvertOptions(
+                    column_types={
+                        name: pyarrow.string() for name in column_names
+                    },
+                    strings_can_be_null=False,
+                ),
+            )
+            # The header is read as data as well; drop it from the first batch
+            skip: int = 1
+            for batch in batches:
+                yield [
+                    column.to_numpy(zero_copy_only=False)[skip:]
+                    for column in batch.columns
+                ]
+                skip = 0
+
+        data.load_survey_columns(header=header, column_blocks=column_blocks())
@@ -0,0 +1,228 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module records spans of the pipeline for inspection as a timeline.
+
+Spans mark how long a stage of the pipeline took, like loading the metadata,
+decoding the survey data or running an analysis script. They are exported
+in the Chrome trace event format, which can be viewed in chrome://tracing or
+the Perfetto UI. Tracing is disabled by default; spans then cost a single
+attribute check.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List, TypeVar
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+# Handed out if tracing is disabled, nullcontext can be re-used
+_NO_SPAN: ContextManager[None] = nullcontext()
+
+
+class _Span(object):
+    """Records the time between entering and leaving it as trace event."""
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        """
+        Set up a span.
+
+        Args:
+            name:
+                The name of the span, shown in the timeline.
+            category:
+                The stage of the pipeline the span belongs to.
+            args:
+                Additional information shown for the span.
+        """
+        self.name: str = name
+        self.category: str = category
+        self.args: Dict[str, Any] = args
+        self.start: int = 0
+
+    def __enter__(self) -> None:
+        """Start measuring the span."""
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, exception_type, exception, exception_traceback):
+        """
+        Stop measuring the span and record it.
+
+        Args:
+            exception_type:
+                The type of the exception raised within the span, if any.
+            exception:
+                The exception raised within the span, if any.
+            exception_traceback:
+                The traceback of the exception, if any.
+        """
+        end: int = time.perf_counter_ns()
+        if exception_type is not None:
+            self.args["error"] = exception_type.__name__
+        Tracer.add_events([{
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self.start / 1000,
+            "dur": (end - self.start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self.args,
+        }])
+
+
+class Tracer(object):
+    """Collects the spans of the pipeline in the running process."""
+
+    enabled: bool = False
+    """Whether spans are recorded."""
+
+    _events: List[Dict[str, Any]] = []
+
+    @classmethod
+    def enable(cls) -> None:
+        """Start recording spans, discarding any recorded before."""
+        cls._events = []
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls) -> None:
+        """Stop recording spans and discard the recorded ones."""
+        cls.enabled = False
+        cls._events = []
+
+    @classmethod
+    def span(cls, name: str, category: str, **args: Any) -> ContextManager:
+        """
+        Get a context manager recording a span while tracing is enabled.
+
+        Args:
+            name:
+                The name of the span, shown in the timeline.
+            category:
+                The stage of the pipeline the span belongs to.
+            **args:
+                Additional information shown for the span.
+        Returns:
+            A context manager recording the span, or one doing nothing if
+            tracing is disabled.
+        """
+        if not cls.enabled:
+            return _NO_SPAN
+        return _Span(name, category, args)
+
+    @classmethod
+    def traced(cls, category: str) -> Callable[[Function], Function]:
+        """
+        Get a decorator recording a span for each call of a function.
+
+        The span is named after the qualified name of the function. Since the
+        decorator adds a frame to the call stack, it must not be used on
+        functions inspecting their caller.
+
+        Args:
+            category:
+                The stage of the pipeline the function belongs to.
+        Returns:
+            The decorator.
+        """
+
+        def decorator(function: Function) -> Function:
+            name: str = function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not cls.enabled:
+                    return function(*args, **kwargs)
+                with _Span(name, category, {}):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    def add_events(cls, events: List[Dict[str, Any]]) -> None:
+        """
+        Add trace events, e.g. those recorded in another process.
+
+        Args:
+            events:
+                The trace events to be added.
+        """
+        cls._events.extend(events)
+
+    @classmethod
+    def take_events(cls) -> List[Dict[str, Any]]:
+        """
+        Remove the recorded trace events.
+
+        Worker processes hand over their events this way. It also discards
+        the events a forked process inherited from its parent.
+
+        Returns:
+            The trace events recorded so far.
+        """
+        (events, cls._events) = (cls._events, [])
+        return events
+
+    @classmethod
+    def write(cls, path: Path) -> None:
+        """
+        Write the recorded spans into a Chrome trace file.
+
+        Args:
+            path:
+                The file to be written. It is replaced if it exists.
+        """
+        main_process: int = os.getpid()
+        processes: List[int] = sorted(
+            {event["pid"] for event in cls._events} | {main_process}
+        )
+        names: List[Dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": process,
+                "args": {
+                    "name": "hifis-surveyval"
+                    if process == main_process
+                    else f"worker {process}"
+                },
+            }
+            for process in processes
+        ]
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary: Path = path.with_name(f".{path.name}.tmp")
+        temporary.write_text(
+            json.dumps(
+                {
+                    "traceEvents": names + cls._events,
+                    "displayTimeUnit": "ms",
+                }
+            )
+        )
+        os.replace(temporary, path)
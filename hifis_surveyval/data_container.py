@@ -27,18 +27,35 @@ functions.
 .. currentmodule:: hifis_surveyval.data_container
 .. moduleauthor:: HIFIS Software <software@hifis.net>
 """
+import copy
 import logging
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice, zip_longest
 from logging import debug, warning
-from typing import Dict, List, Set, Union
+from typing import (
+    ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Set,
+    Tuple, Union
+)
 
-import pandas
-from pandas import DataFrame
+import numpy
+from pandas import DataFrame, Index
 
+from hifis_surveyval.core.memory_report import (
+    MemoryReport, MemoryUsage, deep_size,
+)
 from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.tracer import Tracer
+from hifis_surveyval.models.answer_decoder import (
+    decode_column_group, pack_column,
+)
 from hifis_surveyval.models.mixins.yaml_constructable import YamlDict, YamlList
+from hifis_surveyval.models.participant_index import ParticipantIndex
 from hifis_surveyval.models.question import Question
 from hifis_surveyval.models.question_collection import QuestionCollection
 
+PendingAnswers = Tuple[numpy.ndarray, numpy.ndarray, Dict[str, numpy.ndarray]]
+
 
 class DataContainer(object):
     """
@@ -60,40 +77,95 @@ class DataContainer(object):
                 An object representing the current application settings.
         """
         self._survey_questions: Dict[str, QuestionCollection] = {}
-        self._participant_ids: Set[str] = set()
-        """ All participant IDs encountered while loading survey data. """
+
+        self._pending_collections: Dict[str, Tuple[YamlDict, bool]] = {}
+        """
+        The YAML data of question collections that have not been constructed
+        yet, indexed by their IDs, together with whether the data still needs
+        to be validated. This is only used if LAZY_METADATA is enabled.
+        """
+
+        self._pending_answers: Dict[str, List[PendingAnswers]] = {}
+        """
+        The undecoded answers to pending question collections, indexed by
+        collection ID. Each block holds the participant IDs, their positions
+        in the participant index and the raw columns by full question ID.
+        The answers are decoded once the collection is constructed.
+        """
+
+        self._participant_index: ParticipantIndex = ParticipantIndex(
+            name=settings.ID_COLUMN_NAME
+        )
+        """
+        All participant IDs encountered while loading survey data.
+        The answers of all questions are aligned to the positions assigned
+        in this index.
+        """
 
         self._invalid_answer_sets: Set[str] = set()
         # Track participant IDs with invalid answer sets.
         self._settings = settings
 
-    def _frame_for_id(self, piece_id) -> DataFrame:
+    def snapshot(self) -> "DataContainer":
         """
-        Obtain a data frame representation for a Question (Collection) ID.
+        Create a copy-on-write snapshot of the data container.
 
-        This is a helper method used to transform either questions or
-        question collections into data frames based on their ID. It a
-        shortcut to be used in data_frame_for_ids() and not meant to be
-        called by the user. Use the appropriate functions of questions and
-        collections instead.
+        The snapshot can be modified without affecting this container and
+        vice versa, just like a deep copy. However, the stored answers and
+        the registered participants are not copied until either side
+        actually modifies them, which makes creating a snapshot cheap even
+        for large amounts of survey data. Only the comparatively small
+        objects describing the collections, questions and answer options
+        are copied right away.
+
+        Returns:
+            A new data container holding the same metadata and survey data.
+        """
+        settings: Settings = copy.deepcopy(self._settings)
+        participant_index: ParticipantIndex = self._participant_index.share()
+
+        snapshot = DataContainer.__new__(DataContainer)
+        snapshot._settings = settings
+        snapshot._participant_index = participant_index
+        snapshot._survey_questions = {
+            collection_id: collection.snapshot(settings, participant_index)
+            for (collection_id, collection) in self._survey_questions.items()
+        }
+        snapshot._pending_collections = dict(self._pending_collections)
+        snapshot._pending_answers = {
+            collection_id: list(blocks)
+            for (collection_id, blocks) in self._pending_answers.items()
+        }
+        snapshot._invalid_answer_sets = set(self._invalid_answer_sets)
+        return snapshot
+
+    def _questions_for_id(self, piece_id) -> List[Question]:
+        """
+        Obtain the questions referred to by a Question (Collection) ID.
+
+        This is a helper method used to resolve the IDs of either questions
+        or question collections into the questions whose answers are to be
+        put into data frames. It a shortcut to be used in
+        data_frame_for_ids() and not meant to be called by the user. Use the
+        appropriate functions of questions and collections instead.
         Args:
             piece_id:
                 The full ID of either a question or question collection.
         Returns:
-            A data frame matching the answers given per participant for the
-            question or question collection identified by the provided ID.
+            A list with either the single question or all questions of the
+            question collection identified by the provided ID.
         Raises:
             ValueError:
                 When no Question or QuestionCollection with the given ID
                 exists.
         """
         try:
-            return self.collection_for_id(piece_id).as_data_frame()
+            return self.collection_for_id(piece_id).questions
         except KeyError:
             pass
 
         try:
-            return DataFrame(self.question_for_id(piece_id).as_series())
+            return [self.question_for_id(piece_id)]
         except KeyError:
             pass
 
@@ -101,16 +173,24 @@ class DataContainer(object):
             f"{piece_id} is not a valid " f"question / collection ID"
         )
 
-    def _add_collection_from_yaml(self, new_collection_yaml: YamlDict) -> None:
+    def _add_collection_from_yaml(
+        self, new_collection_yaml: YamlDict, validate: bool = True
+    ) -> None:
         """
         Create a new question collection from YAML and add it to survey data.
 
         Args:
             new_collection_yaml:
                 A YAML mapping containing the data for one question collection.
+            validate:
+                (Optional, Default=True) Whether the YAML data needs to be
+                validated.
         """
         new_collection = QuestionCollection.from_yaml_dictionary(
-            new_collection_yaml, settings=self._settings
+            new_collection_yaml,
+            validate=validate,
+            settings=self._settings,
+            participant_index=self._participant_index,
         )
         if new_collection.full_id in self._survey_questions:
             raise ValueError(
@@ -119,7 +199,9 @@ class DataContainer(object):
         self._survey_questions[new_collection.full_id] = new_collection
         debug(f"{new_collection.full_id} added successfully")
 
-    def load_metadata(self, yaml: Union[YamlList, YamlDict]) -> None:
+    def load_metadata(
+        self, yaml: Union[YamlList, YamlDict], validate: bool = True
+    ) -> None:
         """
         Load additional metadata from YAML data.
 
@@ -135,6 +217,11 @@ class DataContainer(object):
                 Either a list of YamlDictionaries or a single YamlDictionary.
                 Each YamlDictionary is expected to hold a QuestionCollection,
                 Otherwise parsing will fail.
+            validate:
+                (Optional, Default=True) Whether to validate the YAML data.
+                This may only be skipped for data obtained from
+                QuestionCollection.validate_yaml(), e.g. via the metadata
+                cache.
         """
         if not isinstance(yaml, list):
             # in case this is a single value put it in the list for the
@@ -143,21 +230,160 @@ class DataContainer(object):
 
         for new_collection_data in yaml:
             try:
-                self._add_collection_from_yaml(new_collection_data)
+                if self._settings.LAZY_METADATA:
+                    self._defer_collection_from_yaml(
+                        new_collection_data, validate=validate
+                    )
+                else:
+                    self._add_collection_from_yaml(
+                        new_collection_data, validate=validate
+                    )
             except Exception as thrown_exception:
                 warning(f"Error while parsing metadata: {thrown_exception}")
 
-    def load_survey_data(self, csv_data: List[List[str]]) -> None:
+    def _defer_collection_from_yaml(
+        self, new_collection_yaml: YamlDict, validate: bool = True
+    ) -> None:
         """
-        Load survey data as given in a CSV file.
+        Index the YAML data of a question collection for later construction.
+
+        The collection will be constructed on first access. If the YAML data
+        does not provide a usable ID, it can not be indexed and the
+        collection is constructed right away instead.
 
-        The data is expected to be given in such a way that the outer list
-        represents the rows and the inner list the columns within each row
+        Args:
+            new_collection_yaml:
+                A YAML mapping containing the data for one question collection.
+            validate:
+                (Optional, Default=True) Whether the YAML data needs to be
+                validated upon construction.
         """
-        # Separate the header so it does not get in the way of processing later
-        header: List[str] = csv_data[0]
-        body: List[List[str]] = csv_data[1:]
+        try:
+            collection_id = new_collection_yaml[QuestionCollection.token_ID]
+        except (KeyError, TypeError):
+            collection_id = None
+        if not isinstance(collection_id, str):
+            self._add_collection_from_yaml(
+                new_collection_yaml, validate=validate
+            )
+            return
+
+        if (
+            collection_id in self._survey_questions
+            or collection_id in self._pending_collections
+        ):
+            raise ValueError(
+                "Attempt to add QuestionCollection " "with duplicate ID"
+            )
+        self._pending_collections[collection_id] = (
+            new_collection_yaml, validate
+        )
+        debug(f"{collection_id} deferred until first access")
+
+    def _construct_pending_collection(self, collection_id: str) -> None:
+        """
+        Construct a question collection whose construction was deferred.
+
+        Collections that fail to parse are dropped and the exception is
+        logged as a warning, just like when loading the metadata eagerly.
+
+        Args:
+            collection_id:
+                The ID of the pending question collection.
+        """
+        (collection_yaml, validate) = self._pending_collections.pop(
+            collection_id
+        )
+        blocks: List[PendingAnswers] = self._pending_answers.pop(
+            collection_id, []
+        )
+        try:
+            self._add_collection_from_yaml(collection_yaml, validate=validate)
+        except Exception as thrown_exception:
+            warning(f"Error while parsing metadata: {thrown_exception}")
+            return
+        self._load_pending_answers(blocks)
+
+    def _load_pending_answers(self, blocks: List[PendingAnswers]) -> None:
+        """
+        Decode the answers read for a collection before it was constructed.
+
+        Args:
+            blocks:
+                The undecoded answers to the collection, in the order they
+                were read.
+        """
+        for (_, positions, raw_columns) in blocks:
+            for (question_id, raw_column) in raw_columns.items():
+                question: Question = self.question_for_id(question_id)
+                errors_before: int = question.decoder_statistics["errors"]
+                question.add_decoded_answers(
+                    positions=positions,
+                    decoded=question.decoder.decode(raw_column),
+                )
+                errors: int = (
+                    question.decoder_statistics["errors"] - errors_before
+                )
+                if errors:
+                    logging.warning(
+                        f"Could not decode {errors} value(s) for "
+                        f"{question_id}"
+                    )
+
+    def _pending_question_ids(self, collection_id: str) -> List[str]:
+        """
+        Look up the full IDs of the questions of a pending collection.
+
+        Args:
+            collection_id:
+                The ID of the pending question collection.
+        Returns:
+            The full IDs of the questions given in the collection's YAML
+            data, without validating it.
+        """
+        (collection_yaml, _) = self._pending_collections[collection_id]
+        return [
+            collection_id
+            + self._settings.HIERARCHY_SEPARATOR
+            + str(question_yaml.get(Question.token_ID))
+            for question_yaml in collection_yaml.get(
+                QuestionCollection.token_QUESTIONS, []
+            )
+            if isinstance(question_yaml, dict)
+        ]
 
+    def construct_pending_collections(self) -> None:
+        """
+        Construct and validate all question collections not accessed so far.
+
+        If LAZY_METADATA is enabled, this forces the validation of the whole
+        metadata, e.g. to report all errors in it before starting a long
+        analysis. Otherwise there is nothing to be done.
+        """
+        for collection_id in list(self._pending_collections):
+            self._construct_pending_collection(collection_id)
+
+    @Tracer.traced("loading")
+    def _resolve_header(
+        self, header: List[str]
+    ) -> Tuple[int, Dict[int, Question], Dict[int, str]]:
+        """
+        Find the columns holding the participant IDs and the questions.
+
+        Collections that are still pending are not constructed for this.
+        Their columns are only matched against the question IDs in their
+        YAML data.
+
+        Args:
+            header:
+                The header row of the CSV data. Question IDs in the header
+                are normalized in-place for later cross-referencing.
+        Returns:
+            A tuple of the index of the participant ID column, a mapping
+            from column indices to the questions found for the columns and a
+            mapping from column indices to the full IDs of questions in
+            pending collections.
+        """
         question_cache: Dict[int, Question] = {}
         """
             The question cache associates column indices with questions.
@@ -166,6 +392,12 @@ class DataContainer(object):
             questions are identical, which, given the input is CSV data,
             should be the case.
         """
+        pending_columns: Dict[int, str] = {}
+        pending_question_ids: Set[str] = {
+            question_id
+            for collection_id in self._pending_collections
+            for question_id in self._pending_question_ids(collection_id)
+        }
 
         # Step 0: Find the column for the participant IDs
         id_column_index = header.index(self._settings.ID_COLUMN_NAME)
@@ -205,6 +437,21 @@ class DataContainer(object):
                 potential_question_id += self._settings.ANONYMOUS_QUESTION_ID
                 header[index] = potential_question_id
 
+            # Keep pending collections pending, their answers are decoded
+            # once they are constructed
+            collection_id: str = potential_question_id.split(
+                self._settings.HIERARCHY_SEPARATOR
+            )[0]
+            if collection_id in self._pending_collections:
+                if potential_question_id in pending_question_ids:
+                    pending_columns[index] = potential_question_id
+                else:
+                    logging.error(
+                        f"While parsing answers for {potential_question_id}: "
+                        f"Question unknown, check the metadata"
+                    )
+                continue
+
             # Handle the regular case
             try:
                 question = self.question_for_id(potential_question_id)
@@ -219,34 +466,340 @@ class DataContainer(object):
         assert id_column_index not in question_cache
 
         # Step 2: Check if all questions are present in the header
-        for question_collection in self._survey_questions.values():
-            for question in question_collection.questions:
-                if question.full_id not in header:
-                    logging.warning(f"Question {question.full_id} was in "
-                                    f"metadata but not in the CSV file")
-
-        # Step 3: Iterate through each row and insert the values for answer
-        for row in body:
-            participant_id = row[id_column_index]
-            self._participant_ids.add(participant_id)
-
-            for (question_index, question) in question_cache.items():
-                answer: str = row[question_index]
-                try:
-                    question.add_answer(
-                        participant_id=participant_id,
-                        value_text=answer
-                    )
-                except (KeyError, ValueError) as error:
-                    warning(
-                        f"When loading CSV data for {question.full_id}:"
-                        f" {error}"
-                    )
+        # (Pending collections are not constructed for this, since the IDs of
+        # their questions can be looked up in their YAML data as well.)
+        known_question_ids: List[str] = [
+            question.full_id
+            for question_collection in self._survey_questions.values()
+            for question in question_collection.questions
+        ] + list(pending_question_ids)
+        header_ids: Set[str] = set(header)
+        for question_id in known_question_ids:
+            if question_id not in header_ids:
+                logging.warning(f"Question {question_id} was in "
+                                f"metadata but not in the CSV file")
+
+        return id_column_index, question_cache, pending_columns
+
+    @Tracer.traced("decoding")
+    def _load_answer_columns(
+        self,
+        columns: Sequence[Sequence[str]],
+        id_column_index: int,
+        question_cache: Dict[int, Question],
+        pending_columns: Dict[int, str],
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Insert the answers given in a block of CSV columns.
+
+        Args:
+            columns:
+                The columns of the block, without the header, in the same
+                order as in the header. All columns must be of equal length.
+            id_column_index:
+                The index of the column holding the participant IDs.
+            question_cache:
+                The mapping from column indices to questions as obtained from
+                _resolve_header().
+            pending_columns:
+                The mapping from column indices to questions of pending
+                collections as obtained from _resolve_header().
+            executor:
+                (Optional) A pool of worker processes to decode the columns
+                in. If not given, the columns are decoded one after another.
+        """
+        # Step 1: Assign a position to each participant once, so all answer
+        # columns can be allocated to their final size right away
+        participant_ids = numpy.asarray(
+            columns[id_column_index], dtype=object
+        )
+        if not len(participant_ids):
+            return
+        positions = self._participant_index.register_all(participant_ids)
+
+        # Step 2: Keep the answers to pending collections until they are
+        # constructed
+        pending_blocks: Dict[str, Dict[str, numpy.ndarray]] = {}
+        for (question_index, question_id) in pending_columns.items():
+            collection_id: str = question_id.split(
+                self._settings.HIERARCHY_SEPARATOR
+            )[0]
+            pending_blocks.setdefault(collection_id, {})[question_id] = (
+                numpy.asarray(columns[question_index], dtype=object)
+            )
+        for (collection_id, raw_columns) in pending_blocks.items():
+            self._pending_answers.setdefault(collection_id, []).append(
+                (participant_ids, positions, raw_columns)
+            )
+
+        # Step 3: Insert the values for the answers column by column
+        if executor is not None and len(question_cache) > 1:
+            self._decode_in_workers(
+                columns=columns,
+                positions=positions,
+                question_cache=question_cache,
+                executor=executor,
+            )
+            return
+
+        for (question_index, question) in question_cache.items():
+            question.add_decoded_answers(
+                positions=positions,
+                decoded=question.decoder.decode(columns[question_index]),
+            )
+
+    def _decode_in_workers(
+        self,
+        columns: Sequence[Sequence[str]],
+        positions: numpy.ndarray,
+        question_cache: Dict[int, Question],
+        executor: Executor,
+    ) -> None:
+        """
+        Decode the answer columns of a block in worker processes.
+
+        The columns are split into one group per worker. The columns of
+        each group are packed and submitted right away, so the workers start
+        decoding while the next groups are still being packed. Each worker
+        decodes its group with copies of the questions' decoders and hands
+        back the decoded arrays, which are then stored in the questions.
+
+        Args:
+            columns:
+                The columns of the block, without the header.
+            positions:
+                The positions of the block's participants in the shared
+                participant index.
+            question_cache:
+                The mapping from column indices to questions as obtained from
+                _resolve_header().
+            executor:
+                The pool of worker processes.
+        """
+        items: List[Tuple[int, Question]] = list(question_cache.items())
+        group_count: int = min(self._settings.DECODE_WORKERS, len(items))
+        groups: List[List[Tuple[int, Question]]] = [
+            items[start::group_count] for start in range(group_count)
+        ]
+
+        futures: List[Future] = [
+            executor.submit(
+                decode_column_group,
+                [question.decoder for (_, question) in group],
+                [
+                    pack_column(columns[question_index])
+                    for (question_index, _) in group
+                ],
+                len(positions),
+            )
+            for group in groups
+        ]
+
+        for (group, future) in zip(groups, futures):
+            results = future.result()
+            for ((_, question), (decoded, statistics)) in zip(group, results):
+                question.decoder.merge_statistics(statistics)
+                question.add_decoded_answers(
+                    positions=positions, decoded=decoded
+                )
+
+    def _decoding_pool(self) -> ContextManager[Optional[Executor]]:
+        """
+        Set up the worker processes for decoding the survey data.
+
+        Returns:
+            A context manager providing a process pool if more than one
+            decode worker is configured in the settings, None otherwise.
+        """
+        if self._settings.DECODE_WORKERS < 2:
+            return nullcontext()
+        return ProcessPoolExecutor(max_workers=self._settings.DECODE_WORKERS)
+
+    def _load_answer_rows(
+        self,
+        rows: List[List[str]],
+        column_count: int,
+        id_column_index: int,
+        question_cache: Dict[int, Question],
+        pending_columns: Dict[int, str],
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Insert the answers given in a block of CSV rows.
+
+        Args:
+            rows:
+                The rows to be processed, without the header.
+            column_count:
+                The amount of columns given in the header.
+            id_column_index:
+                The index of the column holding the participant IDs.
+            question_cache:
+                The mapping from column indices to questions as obtained from
+                _resolve_header().
+            pending_columns:
+                The mapping from column indices to questions of pending
+                collections as obtained from _resolve_header().
+            executor:
+                (Optional) A pool of worker processes to decode the columns
+                in. If not given, the columns are decoded one after another.
+        """
+        if not rows:
+            return
+
+        # Transpose the rows once, so each question can decode all of its
+        # answers in one go. Short rows are padded with empty values.
+        columns: List[Sequence[str]] = list(zip_longest(*rows, fillvalue=""))
+        columns.extend(
+            [("",) * len(rows)] * (column_count - len(columns))
+        )
+        self._load_answer_columns(
+            columns=columns,
+            id_column_index=id_column_index,
+            question_cache=question_cache,
+            pending_columns=pending_columns,
+            executor=executor,
+        )
+
+    def _report_decode_errors(
+        self,
+        header: List[str],
+        question_cache: Dict[int, Question],
+        errors_before: Dict[int, int],
+    ) -> None:
+        """
+        Log how many values could not be decoded in each CSV column.
+
+        Args:
+            header:
+                The header row of the CSV data.
+            question_cache:
+                The mapping from column indices to questions as obtained from
+                _resolve_header().
+            errors_before:
+                The decode error counts of the questions before loading,
+                mapped by column index.
+        """
+        for (question_index, question) in question_cache.items():
+            errors: int = (
+                question.decoder_statistics["errors"]
+                - errors_before[question_index]
+            )
+            if errors:
+                logging.warning(
+                    f"Could not decode {errors} value(s) in column "
+                    f"{header[question_index]} ({question.full_id})"
+                )
+
+    def load_survey_data(
+        self,
+        csv_data: Iterable[List[str]],
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        """
+        Load survey data as given in a CSV file.
+
+        The data is expected to be given in such a way that the outer
+        iterable represents the rows and the inner list the columns within
+        each row. The first row has to be the header.
+        The answers are decoded column by column, values that can not be
+        decoded are logged and skipped. If more than one decode worker is
+        configured in the settings, the columns are decoded in parallel.
+
+        Args:
+            csv_data:
+                The rows of the CSV file, e.g. a list or a csv.reader.
+            chunk_size:
+                (Optional) If given, the rows are consumed and processed in
+                blocks of at most this many rows, so the whole CSV data never
+                has to be held in memory at once. By default all rows are
+                processed in one block.
+        Raises:
+            ValueError:
+                If the CSV data is empty or the chunk size is not positive.
+        """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size must be a positive number")
+
+        rows: Iterator[List[str]] = iter(csv_data)
+
+        # Separate the header so it does not get in the way of processing later
+        try:
+            header: List[str] = next(rows)
+        except StopIteration:
+            raise ValueError("CSV data is empty, expected at least a header")
+
+        (id_column_index, question_cache, pending_columns) = \
+            self._resolve_header(header)
+        errors_before: Dict[int, int] = {
+            question_index: question.decoder_statistics["errors"]
+            for (question_index, question) in question_cache.items()
+        }
+
+        with self._decoding_pool() as executor:
+            while True:
+                block: List[List[str]] = list(islice(rows, chunk_size))
+                if not block:
+                    break
+                self._load_answer_rows(
+                    rows=block,
+                    column_count=len(header),
+                    id_column_index=id_column_index,
+                    question_cache=question_cache,
+                    pending_columns=pending_columns,
+                    executor=executor,
+                )
+
+        self._report_decode_errors(header, question_cache, errors_before)
+
+    def load_survey_columns(
+        self,
+        header: List[str],
+        column_blocks: Iterable[Sequence[Sequence[str]]],
+    ) -> None:
+        """
+        Load survey data that has already been split into columns.
+
+        This is meant for CSV parsers that produce columns rather than rows,
+        so the data does not have to be transposed before being decoded.
+        As in load_survey_data(), the columns are decoded in parallel if more
+        than one decode worker is configured in the settings.
+
+        Args:
+            header:
+                The header row of the CSV data.
+            column_blocks:
+                Blocks of consecutive rows, each given as a sequence of
+                columns in the same order as in the header. A single block
+                may hold all of the data.
+        """
+        (id_column_index, question_cache, pending_columns) = \
+            self._resolve_header(header)
+        errors_before: Dict[int, int] = {
+            question_index: question.decoder_statistics["errors"]
+            for (question_index, question) in question_cache.items()
+        }
+
+        with self._decoding_pool() as executor:
+            for columns in column_blocks:
+                self._load_answer_columns(
+                    columns=columns,
+                    id_column_index=id_column_index,
+                    question_cache=question_cache,
+                    pending_columns=pending_columns,
+                    executor=executor,
+                )
+
+        self._report_decode_errors(header, question_cache, errors_before)
 
     def collection_for_id(self, full_id: str) -> QuestionCollection:
         """
         Query for a given question collection given by its full ID.
 
+        If LAZY_METADATA is enabled and the collection has not been accessed
+        before, it is constructed and validated now.
+
         Args:
             full_id:
                 The full ID of the question collection to be returned.
@@ -255,6 +808,8 @@ class DataContainer(object):
         Raises:
             KeyError - if the collection for the given ID could not be found.
         """
+        if full_id in self._pending_collections:
+            self._construct_pending_collection(full_id)
         return self._survey_questions[full_id]
 
     def question_for_id(self, full_id: str) -> Question:
@@ -294,17 +849,20 @@ class DataContainer(object):
         Returns:
             A single data frame containing the answers of all participants
             for the given questions / question collections.
+        Raises:
+            ValueError:
+                If none of the requested IDs could be found.
         """
-        frame_pieces: List[DataFrame] = []
+        questions: List[Question] = []
 
         for piece_id in requested_ids:
             try:
-                frame_pieces.append(self._frame_for_id(piece_id))
+                questions.extend(self._questions_for_id(piece_id))
             except ValueError as error:
                 logging.debug(error)
                 continue
 
-        return pandas.concat(frame_pieces, axis=1)
+        return Question.frame_from_questions(questions)
 
     def mark_answers_valid(self, participant_ids: Set[str]) -> None:
         """
@@ -339,6 +897,21 @@ class DataContainer(object):
         for collection in self._survey_questions.values():
             collection.remove_answers(self._invalid_answer_sets)
 
+        # Answers to pending collections are dropped before being decoded
+        removed: List[str] = list(self._invalid_answer_sets)
+        for blocks in self._pending_answers.values():
+            for (block_index, block) in enumerate(blocks):
+                (participant_ids, positions, raw_columns) = block
+                kept = ~numpy.isin(participant_ids, removed)
+                blocks[block_index] = (
+                    participant_ids[kept],
+                    positions[kept],
+                    {
+                        question_id: raw_column[kept]
+                        for (question_id, raw_column) in raw_columns.items()
+                    },
+                )
+
     @property
     def participant_ids(self) -> List[str]:
         """
@@ -351,18 +924,87 @@ class DataContainer(object):
             property.
 
         Returns:
-            A list of all participant IDs as strings.
+            A list of all participant IDs as strings in the order they were
+            encountered.
+        """
+        return list(self._participant_index)
+
+    @property
+    def participant_index(self) -> Index:
+        """
+        Get the participant IDs as an index shared by all answer data.
+
+        The series and data frames obtained from questions and question
+        collections are indexed by this object (or subsets of it), so they
+        can be combined without having to align them first.
+
+        Note:
+            Like participant_ids, this is not affected by removing invalid
+            answer sets. The returned index must not be modified.
+
+        Returns:
+            A pandas.Index of all participant IDs.
         """
-        return list(self._participant_ids)
+        return self._participant_index.as_pandas_index()
+
+    @property
+    def decoder_statistics(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get statistics about decoding the answers to each question.
+
+        Returns:
+            A dictionary mapping the full ID of each question to its decoder
+            statistics. See Question.decoder_statistics for details.
+        """
+        return {
+            question.full_id: question.decoder_statistics
+            for collection in self._survey_questions.values()
+            for question in collection.questions
+        }
+
+    def memory_report(self) -> MemoryReport:
+        """
+        Break down the memory held by this data container.
+
+        Question collections not constructed yet, since LAZY_METADATA is
+        enabled, are not constructed for the report. Their metadata is
+        counted with the container itself.
+
+        Returns:
+            A report of the memory held by each question collection and
+            question, split into answers, metadata, translations and cached
+            data frames, and by the container itself, like the participant
+            IDs.
+        """
+        seen: Set[int] = {id(self._settings)}
+        sizes: Dict[str, int] = {
+            "answers": deep_size(self._participant_index, seen)
+            + deep_size(self._invalid_answer_sets, seen)
+            + deep_size(self._pending_answers, seen)
+        }
+        collections: List[MemoryUsage] = [
+            collection.memory_usage(seen)
+            for collection in self._survey_questions.values()
+        ]
+        # Everything not counted so far, e.g. pending collections
+        sizes["metadata"] = deep_size(self, seen)
+        return MemoryReport(
+            container=MemoryUsage(name="data container", sizes=sizes),
+            collections=collections,
+        )
 
     @property
     def question_collection_ids(self) -> List[str]:
         """
         Get the IDs of all question collections.
 
+        If LAZY_METADATA is enabled, this constructs all question collections
+        not accessed so far, so only the IDs of valid collections are listed.
+
         Returns:
             A list of question collection IDs as strings.
         """
+        self.construct_pending_collections()
         return list(self._survey_questions.keys())
 
     @property
@@ -370,10 +1012,14 @@ class DataContainer(object):
         """
         Obtain all survey questions stored in the data container.
 
+        If LAZY_METADATA is enabled, all question collections not accessed so
+        far are constructed first.
+
         Returns:
             A list of QuestionCollections that contain all the survey
             questions.
         """
+        self.construct_pending_collections()
         return list(self._survey_questions.values())
 
     @property
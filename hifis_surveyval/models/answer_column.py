@@ -0,0 +1,441 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module provides the columnar storage for the answers to a question.
+
+Answers are kept in a typed array together with masks indicating which
+entries hold no value and which entries are present at all. All arrays are
+aligned to a ParticipantIndex that can be shared between many columns.
+"""
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy
+from hifis_surveyval.models.participant_index import ParticipantIndex
+
+STORAGE_TYPES = {
+    bool: numpy.dtype(numpy.bool_),
+    int: numpy.dtype(numpy.int64),
+    float: numpy.dtype(numpy.float64),
+    str: numpy.dtype(object),
+}
+"""
+A mapping from the supported answer types to the array types used to store
+them. Types not listed here are stored as generic objects.
+"""
+
+_INT64_RANGE: numpy.iinfo = numpy.iinfo(numpy.int64)
+
+
+class AnswerColumn(Mapping):
+    """
+    Stores the answers of all participants to a single question.
+
+    Towards the outside, the column behaves like a read-only mapping from
+    participant ID to answer. Participants who gave an empty answer are
+    mapped to None, participants without an answer are not contained.
+    Modifications are only possible via set_answer() and remove_answers().
+    """
+
+    _MINIMUM_CAPACITY: int = 16
+
+    def __init__(
+        self, answer_type: type, participant_index: ParticipantIndex
+    ) -> None:
+        """
+        Create an empty answer column.
+
+        Args:
+            answer_type:
+                The type the answers in this column are expected to have.
+            participant_index:
+                The index to which the column is aligned. It may be shared
+                with other columns.
+        """
+        self._answer_type: type = answer_type
+        self._participant_index: ParticipantIndex = participant_index
+
+        self._dtype: numpy.dtype = STORAGE_TYPES.get(
+            answer_type, numpy.dtype(object)
+        )
+        self._values: numpy.ndarray = self._blank_values(0)
+        self._null: numpy.ndarray = numpy.ones(0, dtype=bool)
+        self._present: numpy.ndarray = numpy.zeros(0, dtype=bool)
+        self._present_count: int = 0
+        self._shared: bool = False
+        # Whether the arrays are shared with another column and need to be
+        # copied before writing into them.
+
+    def _blank_values(self, size: int) -> numpy.ndarray:
+        """
+        Create a value array in which each entry represents no value.
+
+        Args:
+            size:
+                The length of the array to be created.
+        Returns:
+            A new array of the column's storage type.
+        """
+        if self._dtype == numpy.float64:
+            return numpy.full(size, numpy.nan)
+        if self._dtype == object:
+            return numpy.full(size, None, dtype=object)
+        return numpy.zeros(size, dtype=self._dtype)
+
+    def _reserve(self, size: int) -> None:
+        """
+        Ensure the column can hold at least the given amount of entries.
+
+        The storage covers at least all participants known to the index
+        and grows geometrically beyond that, so repeatedly adding single
+        participants only causes occasional re-allocations.
+
+        Args:
+            size:
+                The minimum amount of entries the column must be able to hold.
+        """
+        capacity = len(self._values)
+        if size <= capacity:
+            return
+
+        new_capacity = max(
+            size,
+            len(self._participant_index),
+            2 * capacity,
+            self._MINIMUM_CAPACITY,
+        )
+
+        values = self._blank_values(new_capacity)
+        values[:capacity] = self._values
+        null = numpy.ones(new_capacity, dtype=bool)
+        null[:capacity] = self._null
+        present = numpy.zeros(new_capacity, dtype=bool)
+        present[:capacity] = self._present
+
+        self._values = values
+        self._null = null
+        self._present = present
+        self._shared = False
+
+    def _own(self) -> None:
+        """
+        Ensure the arrays of the column are not shared before writing.
+
+        If the arrays are shared with another column, they are copied, so
+        that modifications to this column do not affect the other one.
+        """
+        if not self._shared:
+            return
+        self._values = self._values.copy()
+        self._null = self._null.copy()
+        self._present = self._present.copy()
+        self._shared = False
+
+    def share(self, participant_index: ParticipantIndex) -> "AnswerColumn":
+        """
+        Create a copy of this column that shares the stored answers.
+
+        Nothing is copied right away. Whichever of the two columns is
+        modified first copies the stored answers at that point, so
+        modifications to one column never affect the other.
+
+        Args:
+            participant_index:
+                The index to which the copy is aligned. It must hold the same
+                participants at the same positions as the index of this
+                column, e.g. as obtained from ParticipantIndex.share().
+        Returns:
+            A new column holding the same answers.
+        """
+        shared = AnswerColumn(self._answer_type, participant_index)
+        shared._dtype = self._dtype
+        shared._values = self._values
+        shared._null = self._null
+        shared._present = self._present
+        shared._present_count = self._present_count
+        shared._shared = True
+        self._shared = True
+        return shared
+
+    def _accepts(self, value: Any) -> bool:
+        """
+        Check if a value can be stored without changing the storage type.
+
+        Args:
+            value:
+                The value to be checked. Must not be None.
+        Returns:
+            True if the value can be stored losslessly in the value array,
+            False otherwise.
+        """
+        if self._dtype == object:
+            return True
+        if isinstance(value, (bool, numpy.bool_)):
+            return self._dtype == numpy.bool_
+        if isinstance(value, (int, numpy.integer)):
+            return (
+                self._dtype != numpy.bool_
+                and _INT64_RANGE.min <= value <= _INT64_RANGE.max
+            )
+        if isinstance(value, (float, numpy.floating)):
+            return self._dtype == numpy.float64
+        return False
+
+    def _accepts_array(self, values: numpy.ndarray) -> bool:
+        """
+        Check if an array can be stored without changing the storage type.
+
+        Args:
+            values:
+                The array of values to be checked.
+        Returns:
+            True if all values can be stored losslessly in the value array,
+            False otherwise.
+        """
+        if self._dtype == object or values.dtype == self._dtype:
+            return True
+        if self._dtype == numpy.int64:
+            return values.dtype.kind in "iu"
+        if self._dtype == numpy.float64:
+            return values.dtype.kind in "iuf"
+        return False
+
+    def _generalize(self) -> None:
+        """
+        Switch the storage to generic objects.
+
+        This is required if values that do not match the answer type (e.g.
+        explicitly given answer option values) are to be stored.
+        """
+        values = self._values.astype(object)
+        values[self._null] = None
+        self._values = values
+        self._dtype = values.dtype
+
+    def _view(self, array: numpy.ndarray) -> numpy.ndarray:
+        """
+        Get a read-only view on the part of an array covered by the index.
+
+        Args:
+            array:
+                One of the arrays backing this column.
+        Returns:
+            A view on the array that can not be used to write into it.
+        """
+        view = array[:len(self._participant_index)]
+        view.flags.writeable = False
+        return view
+
+    def set_answer(self, participant_id: str, value: Optional[Any]) -> None:
+        """
+        Store the answer of a participant.
+
+        Participants unknown to the participant index will be registered.
+
+        Args:
+            participant_id:
+                The ID of the participant who gave the answer.
+            value:
+                The answer value or None if no value was given.
+        """
+        position = self._participant_index.register(participant_id)
+        self._reserve(position + 1)
+        self._own()
+
+        if value is None:
+            self._values[position] = self._blank_values(1)[0]
+            self._null[position] = True
+        else:
+            if not self._accepts(value):
+                self._generalize()
+            self._values[position] = value
+            self._null[position] = False
+
+        if not self._present[position]:
+            self._present[position] = True
+            self._present_count += 1
+
+    def set_answers(
+        self,
+        positions: numpy.ndarray,
+        values: numpy.ndarray,
+        null: numpy.ndarray,
+    ) -> None:
+        """
+        Store the answers of many participants at once.
+
+        Args:
+            positions:
+                The positions of the participants in the participant index.
+            values:
+                The answer values, one for each position. Entries marked as
+                null are ignored.
+            null:
+                A boolean mask indicating which of the given answers hold no
+                value.
+        """
+        if not len(positions):
+            return
+
+        self._reserve(int(positions.max()) + 1)
+        self._own()
+        if not self._accepts_array(values):
+            self._generalize()
+
+        given = ~null
+        self._values[positions[given]] = values[given]
+        self._values[positions[null]] = self._blank_values(1)[0]
+        self._null[positions] = null
+        # Only count the participants whose answers were not present before,
+        # each of them once, even if given repeatedly
+        added = numpy.unique(positions[~self._present[positions]])
+        self._present[positions] = True
+        self._present_count += len(added)
+
+    def remove_answers(self, participant_ids: Iterable[str]) -> None:
+        """
+        Remove the answers of the given participants.
+
+        Args:
+            participant_ids:
+                The IDs of the participants whose answers are to be removed.
+                Unknown IDs and IDs without answers are ignored.
+        """
+        for participant_id in participant_ids:
+            if participant_id not in self:
+                continue
+            self._own()
+            position = self._participant_index.position_for(participant_id)
+            self._values[position] = self._blank_values(1)[0]
+            self._null[position] = True
+            self._present[position] = False
+            self._present_count -= 1
+
+    @property
+    def participant_index(self) -> ParticipantIndex:
+        """
+        Get the index to which this column is aligned.
+
+        Returns:
+            The participant index of this column.
+        """
+        return self._participant_index
+
+    @property
+    def present(self) -> numpy.ndarray:
+        """
+        Get a mask indicating for which participants answers are present.
+
+        Returns:
+            A read-only boolean array aligned to the participant index.
+        """
+        self._reserve(len(self._participant_index))
+        return self._view(self._present)
+
+    def as_array(
+        self, selection: Optional[numpy.ndarray] = None
+    ) -> numpy.ndarray:
+        """
+        Get the answers of the indexed participants as an array.
+
+        The array is aligned to the participant index. Entries without a
+        value, including those of participants who did not answer at all,
+        are represented as None or NaN.
+        Without a selection, the array shares its memory with the column,
+        unless boolean or integer answers contain missing values. In that
+        case a copy as objects or floating point numbers respectively is
+        returned.
+
+        Args:
+            selection:
+                (Optional) A boolean mask aligned to the participant index.
+                If given, only the answers of the selected participants are
+                returned as a copy.
+        Returns:
+            A read-only array representing the answers.
+        """
+        self._reserve(len(self._participant_index))
+        values = self._view(self._values)
+        null = self._view(self._null)
+        if selection is not None:
+            values = values[selection]
+            null = null[selection]
+
+        if self._dtype == numpy.float64 or self._dtype == object:
+            # Missing entries are already stored as NaN or None respectively
+            return values
+        if not null.any():
+            return values
+
+        # Boolean and integer arrays can not represent missing values by
+        # themselves. Fall back to the representation pandas would choose
+        # for such data, which requires a copy.
+        if self._dtype == numpy.bool_:
+            converted = values.astype(object)
+            converted[null] = None
+        else:
+            converted = values.astype(numpy.float64)
+            converted[null] = numpy.nan
+        return converted
+
+    def __getitem__(self, participant_id: str) -> Optional[Any]:
+        """
+        Get the answer of a participant.
+
+        Args:
+            participant_id:
+                The ID of the participant whose answer is requested.
+        Returns:
+            The answer value or None if an empty answer was given.
+        Raises:
+            KeyError:
+                If the participant did not give an answer.
+        """
+        if participant_id not in self:
+            raise KeyError(participant_id)
+
+        position = self._participant_index.position_for(participant_id)
+        if self._null[position]:
+            return None
+
+        value = self._values[position]
+        if isinstance(value, numpy.generic):
+            # Hand out built-in Python types, not NumPy scalars
+            return value.item()
+        return value
+
+    def __contains__(self, participant_id: object) -> bool:
+        """Check whether an answer is present for a participant."""
+        if participant_id not in self._participant_index:
+            return False
+        position = self._participant_index.position_for(participant_id)
+        return (
+            position < len(self._present) and bool(self._present[position])
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the IDs of participants who gave an answer."""
+        for position in numpy.flatnonzero(self._present):
+            yield self._participant_index.id_at(position)
+
+    def __len__(self) -> int:
+        """Get the amount of participants who gave an answer."""
+        return self._present_count
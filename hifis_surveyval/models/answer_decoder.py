@@ -0,0 +1,543 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module provides decoders for the textual answers found in survey data.
+
+A decoder is compiled once per question from its metadata and then reused for
+every value of the question's column. Each decoder keeps statistics about the
+values it has processed, including how many of them could not be decoded.
+"""
+import logging
+from abc import ABC, abstractmethod
+from typing import (
+    Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+)
+
+import numpy
+from pandas import Index
+
+from hifis_surveyval.models.answer_column import STORAGE_TYPES
+
+DecodedValues = Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+"""
+The result of decoding an array of raw values: the decoded values, a mask of
+values that are None and a mask of the raw values that could be decoded.
+"""
+
+
+class AnswerDecoder(ABC):
+    """
+    An abstract decoder turning answer texts into answer values.
+
+    Empty texts indicate that no answer was given and are always decoded to
+    None. Inheriting classes only have to deal with non-empty texts.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize the decoder with empty statistics.
+
+        Args:
+            name:
+                The name of the decoded column, used in log messages.
+        """
+        self._name: str = name
+        self._calls: int = 0
+        self._values: int = 0
+        self._empty: int = 0
+        self._errors: int = 0
+
+    @property
+    def error_count(self) -> int:
+        """
+        Get the amount of values that could not be decoded so far.
+
+        Returns:
+            The amount of invalid values encountered by this decoder.
+        """
+        return self._errors
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        """
+        Get statistics about the values processed by this decoder.
+
+        Returns:
+            A dictionary holding the amount of decode calls ("calls"), the
+            amount of processed values ("values"), how many of these were
+            empty ("empty") and how many could not be decoded ("errors").
+        """
+        return {
+            "calls": self._calls,
+            "values": self._values,
+            "empty": self._empty,
+            "errors": self._errors,
+        }
+
+    def merge_statistics(self, statistics: Dict[str, int]) -> None:
+        """
+        Add the statistics gathered by a copy of this decoder.
+
+        This is used to account for values that were decoded elsewhere,
+        e.g. in a worker process.
+
+        Args:
+            statistics:
+                Counts as given by the statistics property.
+        """
+        self._calls += statistics["calls"]
+        self._values += statistics["values"]
+        self._empty += statistics["empty"]
+        self._errors += statistics["errors"]
+
+    def decode(self, raw_values: Iterable[str]) -> DecodedValues:
+        """
+        Decode many answer texts at once.
+
+        Args:
+            raw_values:
+                The texts of the answers as stored in the CSV.
+        Returns:
+            A tuple holding the decoded values, a mask of values that are
+            None and a mask of the raw values that could be decoded. All of
+            them are aligned to the given raw values.
+        """
+        raw = numpy.asarray(raw_values, dtype=object)
+        empty = ~raw.astype(bool)
+        # Empty strings indicate that no data was provided
+        given = ~empty
+
+        (given_values, given_null, given_valid) = self._decode_given(
+            raw[given]
+        )
+
+        values = numpy.empty(len(raw), dtype=given_values.dtype)
+        values[given] = given_values
+        null = empty.copy()
+        null[given] = given_null
+        valid = numpy.ones(len(raw), dtype=bool)
+        valid[given] = given_valid
+
+        self._calls += 1
+        self._values += len(raw)
+        self._empty += int(numpy.count_nonzero(empty))
+        return values, null, valid
+
+    def decode_one(self, raw_value: str) -> Any:
+        """
+        Decode a single answer text.
+
+        Args:
+            raw_value:
+                The text of the answer as stored in the CSV.
+        Returns:
+            The decoded value, or None if the text was empty.
+        """
+        self._calls += 1
+        self._values += 1
+        if not raw_value:
+            self._empty += 1
+            return None
+        return self._decode_given_one(raw_value)
+
+    @abstractmethod
+    def _decode_given(self, raw_values: numpy.ndarray) -> DecodedValues:
+        """
+        Decode an array of non-empty answer texts.
+
+        Args:
+            raw_values:
+                An array of non-empty answer texts.
+        Returns:
+            A tuple holding the decoded values, a mask of values that are
+            None and a mask of the raw values that could be decoded.
+        """
+        pass
+
+    @abstractmethod
+    def _decode_given_one(self, raw_value: str) -> Any:
+        """
+        Decode a single non-empty answer text.
+
+        Args:
+            raw_value:
+                A non-empty answer text.
+        Returns:
+            The decoded value.
+        """
+        pass
+
+
+class OptionDecoder(AnswerDecoder):
+    """
+    Decodes answer option IDs into the values of the answer options.
+
+    The IDs are looked up in a table that is built once from the known
+    answer options.
+    """
+
+    def __init__(
+        self, name: str, options: Mapping[str, Any], answer_type: type
+    ) -> None:
+        """
+        Compile the lookup table for the given answer options.
+
+        Args:
+            name:
+                The name of the decoded column, used in log messages.
+            options:
+                A mapping from the answer option IDs to their values.
+            answer_type:
+                The type the answer values are expected to have.
+        """
+        super(OptionDecoder, self).__init__(name=name)
+        self._lookup: Dict[str, Any] = dict(options)
+        self._codes: Index = Index(list(options.keys()))
+
+        option_values = list(options.values())
+        self._option_null: numpy.ndarray = numpy.array(
+            [value is None for value in option_values], dtype=bool
+        )
+        self._table: numpy.ndarray = numpy.empty(
+            len(option_values), dtype=object
+        )
+        self._table[:] = option_values
+
+        # Use a typed table for numbers and booleans, so the decoded values
+        # can be stored without conversion.
+        given_values = [value for value in option_values if value is not None]
+        if STORAGE_TYPES.get(answer_type) != object and given_values:
+            inferred = numpy.array(given_values)
+            if inferred.dtype.kind in "biuf":
+                self._table = numpy.zeros(
+                    len(option_values), dtype=inferred.dtype
+                )
+                self._table[~self._option_null] = inferred
+
+    def _decode_given(self, raw_values: numpy.ndarray) -> DecodedValues:
+        """
+        Look up the values for an array of answer option IDs.
+
+        Unknown IDs are logged and reported as not decodable.
+
+        Args:
+            raw_values:
+                An array of non-empty answer option IDs.
+        Returns:
+            A tuple holding the decoded values, a mask of values that are
+            None and a mask of the raw values that could be decoded.
+        """
+        codes = self._codes.get_indexer(raw_values)
+        valid = codes != -1
+        unknown = ~valid
+        if unknown.any():
+            self._errors += int(numpy.count_nonzero(unknown))
+            logging.warning(
+                f"When loading answers for {self._name}: "
+                f"Unknown answer option(s) {set(raw_values[unknown])}"
+            )
+        return self._table[codes], self._option_null[codes] | unknown, valid
+
+    def _decode_given_one(self, raw_value: str) -> Any:
+        """
+        Look up the value for a single answer option ID.
+
+        Args:
+            raw_value:
+                A non-empty answer option ID.
+        Returns:
+            The value of the answer option.
+        Raises:
+            KeyError:
+                If none of the answer options has the given ID.
+        """
+        try:
+            return self._lookup[raw_value]
+        except KeyError:
+            self._errors += 1
+            raise
+
+
+class TruthValueDecoder(AnswerDecoder):
+    """
+    Decodes textual truth values into booleans.
+
+    When casting to boolean values, Python casts any non-empty string to True
+    and only empty strings to False. Consequently, values are transformed
+    according to a frozen table of valid true and false values instead.
+    Invalid truth values are logged and treated as missing values.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        true_values: Iterable[str],
+        false_values: Iterable[str],
+    ) -> None:
+        """
+        Compile the truth table.
+
+        Args:
+            name:
+                The name of the decoded column, used in log messages.
+            true_values:
+                The texts accepted as True.
+            false_values:
+                The texts accepted as False. Texts that are also given as
+                true values are considered to be True.
+        """
+        super(TruthValueDecoder, self).__init__(name=name)
+        truth_table: Dict[str, bool] = {text: False for text in false_values}
+        truth_table.update({text: True for text in true_values})
+
+        self._lookup: Dict[str, bool] = truth_table
+        self._codes: Index = Index(list(truth_table.keys()))
+        self._table: numpy.ndarray = numpy.array(
+            list(truth_table.values()), dtype=bool
+        )
+
+    def _decode_given(self, raw_values: numpy.ndarray) -> DecodedValues:
+        """
+        Look up an array of truth values.
+
+        Args:
+            raw_values:
+                An array of non-empty truth values.
+        Returns:
+            A tuple holding the decoded values, a mask of values that are
+            None and a mask of the raw values that could be decoded.
+        """
+        codes = self._codes.get_indexer(raw_values)
+        invalid = codes == -1
+        if invalid.any():
+            self._errors += int(numpy.count_nonzero(invalid))
+            logging.error(f"Boolean data contains {invalid.sum()} invalid "
+                          f"truth value(s) in question {self._name}: "
+                          f"{set(raw_values[invalid])}.")
+        return (
+            self._table[codes],
+            invalid,
+            numpy.ones(len(raw_values), dtype=bool),
+        )
+
+    def _decode_given_one(self, raw_value: str) -> Optional[bool]:
+        """
+        Look up a single truth value.
+
+        Args:
+            raw_value:
+                A non-empty truth value.
+        Returns:
+            The boolean value, or None if the truth value is invalid.
+        """
+        value: Optional[bool] = self._lookup.get(raw_value)
+        if value is None:
+            self._errors += 1
+            logging.error(f"Boolean data is an invalid truth value "
+                          f"in question {self._name}: {raw_value}.")
+        return value
+
+
+class CastDecoder(AnswerDecoder):
+    """
+    Casts answer texts to the answer type of a question.
+
+    Strings are taken as they are. Numbers are parsed all at once if
+    possible. Only if this fails, each value is cast on its own to find
+    those that can not be parsed.
+    """
+
+    def __init__(self, name: str, answer_type: type) -> None:
+        """
+        Prepare the cast to the given answer type.
+
+        Args:
+            name:
+                The name of the decoded column, used in log messages.
+            answer_type:
+                The type the answer texts are cast to.
+        """
+        super(CastDecoder, self).__init__(name=name)
+        self._answer_type: type = answer_type
+        self._storage_type: numpy.dtype = STORAGE_TYPES.get(
+            answer_type, numpy.dtype(object)
+        )
+        self._is_numeric: bool = answer_type in (int, float)
+
+    def _decode_given(self, raw_values: numpy.ndarray) -> DecodedValues:
+        """
+        Cast an array of answer texts.
+
+        Values that can not be cast are logged and reported as not
+        decodable.
+
+        Args:
+            raw_values:
+                An array of non-empty answer texts.
+        Returns:
+            A tuple holding the decoded values, a mask of values that are
+            None and a mask of the raw values that could be decoded.
+        """
+        null = numpy.zeros(len(raw_values), dtype=bool)
+        valid = numpy.ones(len(raw_values), dtype=bool)
+
+        if self._answer_type == str:
+            return raw_values, null, valid
+
+        if self._is_numeric:
+            try:
+                values = raw_values.astype(str).astype(self._storage_type)
+                return values, null, valid
+            except (ValueError, OverflowError):
+                pass  # Find the culprits below
+
+        values = numpy.empty(len(raw_values), dtype=object)
+        for (position, raw_value) in enumerate(raw_values):
+            try:
+                values[position] = self._answer_type(raw_value)
+            except (TypeError, ValueError) as error:
+                valid[position] = False
+                logging.warning(
+                    f"When loading answers for {self._name}: {error}"
+                )
+        self._errors += int(numpy.count_nonzero(~valid))
+
+        if self._storage_type != object:
+            typed_values = numpy.zeros(
+                len(raw_values), dtype=self._storage_type
+            )
+            try:
+                typed_values[valid] = values[valid].astype(
+                    self._storage_type
+                )
+            except OverflowError:
+                # Keep numbers beyond the range of the storage type as they
+                # are, the answer column then switches to generic objects
+                return values, ~valid, valid
+            values = typed_values
+        return values, ~valid, valid
+
+    def _decode_given_one(self, raw_value: str) -> Any:
+        """
+        Cast a single answer text.
+
+        Args:
+            raw_value:
+                A non-empty answer text.
+        Returns:
+            The answer text cast to the answer type.
+        Raises:
+            ValueError:
+                If the text can not be cast to the answer type.
+        """
+        try:
+            return self._answer_type(raw_value)
+        except (TypeError, ValueError):
+            self._errors += 1
+            raise
+
+
+PackedColumn = Union[bytes, Sequence[str]]
+"""
+A column of answer texts prepared for handing it to a worker process, see
+pack_column().
+"""
+
+_PACKING_SEPARATOR: str = "\x00"
+
+
+def pack_column(raw_values: Sequence[str]) -> PackedColumn:
+    """
+    Prepare a column of answer texts for handing it to a worker process.
+
+    The texts are joined into a single UTF-8 encoded byte string, which is
+    transferred as one block instead of pickling each text on its own. This
+    takes most of the work off the main process, which has to prepare the
+    columns for all workers. Columns containing the separator character are
+    left as they are.
+
+    Args:
+        raw_values:
+            The column holding the answer texts as stored in the CSV.
+    Returns:
+        The packed column, to be unpacked in the worker by
+        decode_column_group().
+    """
+    joined: str = _PACKING_SEPARATOR.join(raw_values)
+    if joined.count(_PACKING_SEPARATOR) != max(len(raw_values) - 1, 0):
+        return raw_values
+    return joined.encode("utf-8")
+
+
+def _unpack_column(packed: PackedColumn, length: int) -> numpy.ndarray:
+    """
+    Restore a column of answer texts packed by pack_column().
+
+    Args:
+        packed:
+            The packed column.
+        length:
+            The amount of answer texts in the column, since an empty byte
+            string may stand for no text or a single empty one.
+    Returns:
+        The answer texts as an array of objects.
+    """
+    if not isinstance(packed, bytes):
+        return numpy.asarray(packed, dtype=object)
+    raw_values = numpy.empty(length, dtype=object)
+    if length:
+        raw_values[:] = packed.decode("utf-8").split(_PACKING_SEPARATOR)
+    return raw_values
+
+
+def decode_column_group(
+    decoders: List[AnswerDecoder],
+    packed_columns: List[PackedColumn],
+    length: int,
+) -> List[Tuple[DecodedValues, Dict[str, int]]]:
+    """
+    Decode a group of columns, intended to be run in a worker process.
+
+    Args:
+        decoders:
+            The decoders to use, one per column.
+        packed_columns:
+            The columns holding the answer texts, packed by pack_column().
+        length:
+            The amount of answer texts in each column.
+    Returns:
+        The decoded values for each column, each paired with the statistics
+        gathered while decoding it.
+    """
+    results: List[Tuple[DecodedValues, Dict[str, int]]] = []
+    for (decoder, packed) in zip(decoders, packed_columns):
+        # The decoders are copies which still carry the counts gathered
+        # before, so only the difference is reported back.
+        before: Dict[str, int] = decoder.statistics
+        decoded: DecodedValues = decoder.decode(
+            _unpack_column(packed, length)
+        )
+        statistics: Dict[str, int] = {
+            key: count - before[key]
+            for (key, count) in decoder.statistics.items()
+        }
+        results.append((decoded, statistics))
+    return results
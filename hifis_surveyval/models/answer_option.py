@@ -19,6 +19,7 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 """This module contains a class to represent survey answers."""
+import copy
 import logging
 from typing import Optional as typing_Optional, Generic
 
@@ -102,6 +103,22 @@ class AnswerOption(
         """
         return f"{self.full_id}: {self._label}"
 
+    def snapshot(self, settings: Settings) -> "AnswerOption[AnswerType]":
+        """
+        Create a copy of this answer option for use in an isolated context.
+
+        The translated texts are immutable and thus shared with the copy.
+
+        Args:
+            settings:
+                The settings to be used by the copy.
+        Returns:
+            A shallow copy of this answer option using the given settings.
+        """
+        snapshot = copy.copy(self)
+        snapshot._settings = settings
+        return snapshot
+
     @property
     def value(self) -> typing_Optional[AnswerType]:
         """
@@ -112,6 +129,23 @@ class AnswerOption(
         """
         return self._value
 
+    @classmethod
+    def _validate_nested_yaml(cls, yaml: YamlDict) -> YamlDict:
+        """
+        Validate the translated texts of the answer option.
+
+        Args:
+            yaml:
+                The YAML data of the answer option, already validated against
+                the schema.
+        Returns:
+            The YAML data with the validated texts.
+        """
+        yaml[HasText.YAML_TOKEN] = Translated.validate_yaml(
+            yaml[HasText.YAML_TOKEN]
+        )
+        return yaml
+
     @staticmethod
     def _from_yaml_dictionary(yaml: YamlDict, **kwargs) -> "AnswerOption":
         """
@@ -158,7 +192,7 @@ class AnswerOption(
             option_id=option_id,
             label=label,
             text=Translated.from_yaml_dictionary(
-                yaml[HasText.YAML_TOKEN]
+                yaml[HasText.YAML_TOKEN], validate=False
             ),
             settings=settings,
             value=value
@@ -0,0 +1,291 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module keeps pandas objects built from answers for re-use.
+
+Questions and question collections carry a cache key, which they renew
+whenever their answers or labels change. Entries are looked up by tuples
+starting with the key of their owner and are dropped once the key of their
+owner or of any other source they were built from is renewed. Beyond that,
+the least recently used entries are dropped once the cache runs full.
+"""
+import itertools
+import os
+from collections import OrderedDict
+from typing import (
+    Callable, Dict, Hashable, Iterable, Iterator, Set, Tuple, TypeVar, Union,
+)
+
+from pandas import DataFrame, Series
+
+from hifis_surveyval.core.settings import Settings
+
+Frame = TypeVar("Frame", Series, DataFrame)
+OwnerKey = Tuple[int, int]
+CacheKey = Tuple[Hashable, ...]
+Entry = Tuple[Union[Series, DataFrame], int, Tuple[OwnerKey, ...]]
+
+
+def _process_token() -> int:
+    """
+    Get a random number identifying the running process.
+
+    Returns:
+        A random 64 bit number.
+    """
+    return int.from_bytes(os.urandom(8), "little")
+
+
+class FrameCache(object):
+    """Keeps series and data frames in memory up to a size limit."""
+
+    # Owner keys are unique across processes, since their owners may be
+    # pickled, e.g. into the snapshot cache, and restored in another process
+    _process: int = _process_token()
+    _counter: Iterator[int] = itertools.count()
+
+    # Maps keys to the cached series or data frames, their sizes in bytes
+    # and the keys of the owners and sources they were built from
+    _entries: "OrderedDict[CacheKey, Entry]" = OrderedDict()
+    _size: int = 0
+    _owner_sizes: Dict[OwnerKey, int] = {}
+    # Maps keys of owners and sources to the entries built from them
+    _dependents: Dict[OwnerKey, Set[CacheKey]] = {}
+    _hits: int = 0
+    _misses: int = 0
+    _evictions: int = 0
+
+    @classmethod
+    def new_key(cls) -> OwnerKey:
+        """
+        Get a cache key for an owner of entries.
+
+        Returns:
+            A key that was not handed out before, in any process.
+        """
+        return (cls._process, next(cls._counter))
+
+    @classmethod
+    def renew_key(cls, key: OwnerKey) -> OwnerKey:
+        """
+        Drop the entries built from an owner and get a new key for it.
+
+        Args:
+            key:
+                The current cache key of the owner, which is outdated
+                afterwards.
+        Returns:
+            A key that was not handed out before, in any process.
+        """
+        for entry_key in list(cls._dependents.get(key, ())):
+            cls._remove(entry_key)
+        return cls.new_key()
+
+    @classmethod
+    def _renew_process(cls) -> None:
+        """Tell keys of a forked process apart from those of its parent."""
+        cls._process = _process_token()
+
+    @classmethod
+    def obtain(
+        cls,
+        settings: Settings,
+        key: CacheKey,
+        build: Callable[[], Frame],
+        sources: Iterable[OwnerKey] = (),
+    ) -> Frame:
+        """
+        Get a series or data frame from the cache or build it.
+
+        Callers may modify what they obtain, so each of them gets an object
+        of its own. The cache keeps the newly built object and hands out
+        copies of it. Copies keep the immutable indexes, so they still
+        share the participant index. Objects exceeding the size limit are
+        handed out as built.
+
+        Args:
+            settings:
+                The settings giving the size limit of the cache.
+            key:
+                Identifies the entry. The first element must be the cache
+                key of the owner.
+            build:
+                Builds the series or data frame if it is not cached.
+            sources:
+                The cache keys of other owners the entry is built from. The
+                entry is dropped once any of them is renewed, as well as
+                once the key of its owner is.
+        Returns:
+            The cached or newly built series or data frame.
+        """
+        limit: int = settings.FRAME_CACHE_SIZE * 2**20
+        if not limit:
+            return build()
+
+        entry = cls._entries.get(key)
+        if entry is None:
+            cls._misses += 1
+            frame: Frame = build()
+            if not cls._put(key, frame, (key[0], *sources), limit):
+                return frame
+        else:
+            cls._hits += 1
+            cls._entries.move_to_end(key)
+            frame = entry[0]
+        return cls._copy(frame)
+
+    @staticmethod
+    def _copy(frame: Frame) -> Frame:
+        """
+        Copy the data of a series or data frame.
+
+        Args:
+            frame:
+                The series or data frame to be copied.
+        Returns:
+            A copy that shares only the indexes with the given object.
+        """
+        copied: Frame = frame.copy()
+        copied.index = frame.index
+        if isinstance(frame, DataFrame):
+            copied.columns = frame.columns
+        return copied
+
+    @classmethod
+    def _put(
+        cls,
+        key: CacheKey,
+        frame: Union[Series, DataFrame],
+        owners: Tuple[OwnerKey, ...],
+        limit: int,
+    ) -> bool:
+        """
+        Add an entry, dropping the least recently used ones if necessary.
+
+        Args:
+            key:
+                Identifies the entry.
+            frame:
+                The series or data frame to be kept. It must not be
+                modified afterwards.
+            owners:
+                The keys of the owner and the sources of the entry.
+            limit:
+                The size limit of the cache in bytes. Entries exceeding it on
+                their own are not kept.
+        Returns:
+            Whether the entry was kept.
+        """
+        usage = frame.memory_usage(index=True, deep=False)
+        size: int = int(usage.sum() if isinstance(usage, Series) else usage)
+        if size > limit:
+            return False
+
+        cls._entries[key] = (frame, size, owners)
+        cls._resize(key[0], size)
+        for owner in owners:
+            cls._dependents.setdefault(owner, set()).add(key)
+        while cls._size > limit:
+            cls._remove(next(iter(cls._entries)))
+            cls._evictions += 1
+        return True
+
+    @classmethod
+    def _remove(cls, key: CacheKey) -> None:
+        """
+        Drop an entry.
+
+        Args:
+            key:
+                Identifies the entry.
+        """
+        (_, size, owners) = cls._entries.pop(key)
+        cls._resize(key[0], -size)
+        for owner in owners:
+            dependents: Set[CacheKey] = cls._dependents[owner]
+            dependents.discard(key)
+            if not dependents:
+                del cls._dependents[owner]
+
+    @classmethod
+    def _resize(cls, owner: OwnerKey, change: int) -> None:
+        """
+        Account for the size of an added or removed entry.
+
+        Args:
+            owner:
+                The cache key of the owner of the entry.
+            change:
+                The size of the entry in bytes, negative if it was removed.
+        """
+        cls._size += change
+        owner_size: int = cls._owner_sizes.get(owner, 0) + change
+        if owner_size:
+            cls._owner_sizes[owner] = owner_size
+        else:
+            cls._owner_sizes.pop(owner, None)
+
+    @classmethod
+    def size_of(cls, owner: OwnerKey) -> int:
+        """
+        Get the memory taken up by the entries of an owner.
+
+        Args:
+            owner:
+                The cache key of the owner.
+        Returns:
+            The size of the owner's entries in bytes.
+        """
+        return cls._owner_sizes.get(owner, 0)
+
+    @classmethod
+    def statistics(cls) -> Dict[str, int]:
+        """
+        Get statistics about the use of the cache in this process.
+
+        Returns:
+            A dictionary holding the amount of look-ups that found an entry
+            ("hits") or not ("misses"), the amount of entries dropped to
+            stay within the size limit ("evictions"), and the amount
+            ("entries") and size in bytes ("size") of the kept entries.
+        """
+        return {
+            "hits": cls._hits,
+            "misses": cls._misses,
+            "evictions": cls._evictions,
+            "entries": len(cls._entries),
+            "size": cls._size,
+        }
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all entries and reset the statistics."""
+        cls._entries = OrderedDict()
+        cls._size = 0
+        cls._owner_sizes = {}
+        cls._dependents = {}
+        cls._hits = 0
+        cls._misses = 0
+        cls._evictions = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=FrameCache._renew_process)
@@ -0,0 +1,284 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module provides a fast validator for the YAML data of the metadata.
+
+It checks the YAML data of a whole question collection, including all nested
+questions, answer options and translations, in a single pass. The checks
+are equivalent to the schemas of the respective model classes, but are
+precompiled into simple lookup tables instead of being interpreted by the
+schema library for each element. All errors are collected and reported
+together with the path of the offending element.
+"""
+import re
+from copy import copy
+from typing import Any, Callable, List, Tuple
+
+from hifis_surveyval.models.answer_types import VALID_ANSWER_TYPES
+from hifis_surveyval.models.mixins.yaml_constructable import YamlDict
+
+REQUIRED = object()
+"""Marks fields without a default value in the field tables below."""
+
+FieldTable = Tuple[Tuple[str, Callable[[Any], bool], str, Any], ...]
+"""
+A table of expected fields, each given by its key, a check for its value,
+a description of the expected value and its default value (or REQUIRED).
+"""
+
+_COLLECTION_FIELDS: FieldTable = (
+    ("id", lambda value: isinstance(value, str), "a string", REQUIRED),
+    ("label", lambda value: isinstance(value, str), "a string", REQUIRED),
+    ("text", lambda value: isinstance(value, dict), "a mapping", REQUIRED),
+    ("questions", lambda value: isinstance(value, list), "a list", []),
+    ("mandatory", lambda value: isinstance(value, bool), "a boolean", False),
+)
+
+_QUESTION_FIELDS: FieldTable = (
+    ("id", lambda value: isinstance(value, str), "a string", REQUIRED),
+    ("label", lambda value: isinstance(value, str), "a string", REQUIRED),
+    ("text", lambda value: isinstance(value, dict), "a mapping", REQUIRED),
+    (
+        "datatype",
+        lambda value: isinstance(value, str) and value in VALID_ANSWER_TYPES,
+        f"one of {sorted(VALID_ANSWER_TYPES)}",
+        REQUIRED,
+    ),
+    ("mandatory", lambda value: isinstance(value, bool), "a boolean", False),
+    ("answers", lambda value: isinstance(value, list), "a list", []),
+)
+
+_ANSWER_OPTION_FIELDS: FieldTable = (
+    ("id", lambda value: isinstance(value, str), "a string", REQUIRED),
+    ("label", lambda value: isinstance(value, str), "a string", REQUIRED),
+    ("text", lambda value: isinstance(value, dict), "a mapping", REQUIRED),
+    ("value", lambda value: True, "any value", None),
+)
+
+_LANGUAGE_CODE = re.compile(r"^[a-z]{2}(-[A-Z]{2,3})?$")
+
+
+def _check_fields(
+    yaml: Any,
+    fields: FieldTable,
+    allow_other_keys: bool,
+    path: str,
+    errors: List[str],
+) -> YamlDict:
+    """
+    Check a YAML mapping against a table of expected fields.
+
+    Args:
+        yaml:
+            The YAML data to be checked.
+        fields:
+            The table of expected fields.
+        allow_other_keys:
+            Whether string keys not listed in the table are accepted.
+        path:
+            The path of the checked element, used in error messages.
+        errors:
+            The list to which any found errors are appended.
+    Returns:
+        A copy of the YAML mapping with default values filled in for
+        missing optional fields. If the data is no mapping, an empty
+        dictionary is returned.
+    """
+    if not isinstance(yaml, dict):
+        errors.append(f"{path}: Expected a mapping, got {yaml!r}")
+        return {}
+
+    checked: YamlDict = dict(yaml)
+    for (key, check, description, default) in fields:
+        if key not in yaml:
+            if default is REQUIRED:
+                errors.append(f"{path}: Missing key {key!r}")
+            else:
+                checked[key] = copy(default)
+        elif not check(yaml[key]):
+            errors.append(
+                f"{path}/{key}: Expected {description}, got {yaml[key]!r}"
+            )
+
+    known_keys = {field[0] for field in fields}
+    for key in yaml:
+        if key in known_keys:
+            continue
+        if not allow_other_keys or not isinstance(key, str):
+            errors.append(f"{path}: Unexpected key {key!r}")
+    return checked
+
+
+def _check_translated(yaml: Any, path: str, errors: List[str]) -> YamlDict:
+    """
+    Check the YAML data of translated texts.
+
+    Args:
+        yaml:
+            The YAML data to be checked.
+        path:
+            The path of the checked element, used in error messages.
+        errors:
+            The list to which any found errors are appended.
+    Returns:
+        A copy of the translations.
+    """
+    if not isinstance(yaml, dict):
+        return {}  # Already reported as wrong type by the parent
+    if not yaml:
+        errors.append(f"{path}: Expected at least one translation")
+    for (language, translation) in yaml.items():
+        if not isinstance(language, str) or not _LANGUAGE_CODE.match(
+            language
+        ):
+            errors.append(f"{path}: Invalid language code {language!r}")
+        elif not isinstance(translation, str) or not translation:
+            errors.append(
+                f"{path}/{language}: "
+                f"Translation must neither be empty nor None"
+            )
+    return dict(yaml)
+
+
+def _element_path(parent_path: str, token: str, index: int, yaml: Any) -> str:
+    """
+    Build the path of a nested element for error messages.
+
+    Args:
+        parent_path:
+            The path of the parent element.
+        token:
+            The key under which the nested elements are listed.
+        index:
+            The position of the element in the list.
+        yaml:
+            The YAML data of the element, used to obtain its ID.
+    Returns:
+        The parent path extended by the element's ID if it has a valid one,
+        or by its position in the list otherwise.
+    """
+    if isinstance(yaml, dict) and isinstance(yaml.get("id"), str):
+        return f"{parent_path}/{yaml['id']}"
+    return f"{parent_path}/{token}[{index}]"
+
+
+def _check_answer_option(
+    yaml: Any, path: str, errors: List[str]
+) -> YamlDict:
+    """
+    Check the YAML data of an answer option.
+
+    Args:
+        yaml:
+            The YAML data to be checked.
+        path:
+            The path of the checked element, used in error messages.
+        errors:
+            The list to which any found errors are appended.
+    Returns:
+        The checked YAML data with defaults filled in.
+    """
+    checked = _check_fields(yaml, _ANSWER_OPTION_FIELDS, False, path, errors)
+    if "text" in checked:
+        checked["text"] = _check_translated(
+            checked["text"], f"{path}/text", errors
+        )
+    return checked
+
+
+def _check_question(yaml: Any, path: str, errors: List[str]) -> YamlDict:
+    """
+    Check the YAML data of a question, including its answer options.
+
+    Args:
+        yaml:
+            The YAML data to be checked.
+        path:
+            The path of the checked element, used in error messages.
+        errors:
+            The list to which any found errors are appended.
+    Returns:
+        The checked YAML data with defaults filled in.
+    """
+    checked = _check_fields(yaml, _QUESTION_FIELDS, True, path, errors)
+    if "text" in checked:
+        checked["text"] = _check_translated(
+            checked["text"], f"{path}/text", errors
+        )
+    if isinstance(checked.get("answers"), list):
+        checked["answers"] = [
+            _check_answer_option(
+                answer_yaml,
+                _element_path(path, "answers", index, answer_yaml),
+                errors,
+            )
+            for (index, answer_yaml) in enumerate(checked["answers"])
+        ]
+    return checked
+
+
+def validate_collection(yaml: Any) -> YamlDict:
+    """
+    Validate the YAML data of a question collection in a single pass.
+
+    This checks the same conditions as QuestionCollection.validate_yaml(),
+    including all nested elements, and fills in the same default values.
+
+    Args:
+        yaml:
+            The YAML data of a question collection.
+    Returns:
+        The validated YAML data, which may be passed to
+        QuestionCollection.from_yaml_dictionary() without validating it
+        again.
+    Raises:
+        ValueError:
+            If the data is not valid. The message lists all errors found,
+            each prefixed with the path of the offending element.
+    """
+    errors: List[str] = []
+    path: str = (
+        yaml["id"]
+        if isinstance(yaml, dict) and isinstance(yaml.get("id"), str)
+        else "<collection>"
+    )
+
+    checked = _check_fields(yaml, _COLLECTION_FIELDS, True, path, errors)
+    if "text" in checked:
+        checked["text"] = _check_translated(
+            checked["text"], f"{path}/text", errors
+        )
+    if isinstance(checked.get("questions"), list):
+        checked["questions"] = [
+            _check_question(
+                question_yaml,
+                _element_path(path, "questions", index, question_yaml),
+                errors,
+            )
+            for (index, question_yaml) in enumerate(checked["questions"])
+        ]
+
+    if errors:
+        raise ValueError(
+            f"Invalid metadata for question collection {path}:\n"
+            + "\n".join(f"  {error}" for error in errors)
+        )
+    return checked
@@ -261,6 +261,20 @@ class HasID(UsesSettings):
         )
         HasID.known_ids.add(self._full_id)
 
+    def __setstate__(self, state: Dict) -> None:
+        """
+        Restore an identifiable object, e.g. when unpickling or copying it.
+
+        Since the initialization is skipped in these cases, the restored ID
+        is registered as known here.
+
+        Args:
+            state:
+                The attributes of the object to be restored.
+        """
+        self.__dict__.update(state)
+        HasID.known_ids.add(self._full_id)
+
     def __del__(self) -> None:
         """
         Deconstruct an identifiable object.
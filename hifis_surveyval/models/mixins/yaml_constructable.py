@@ -30,6 +30,14 @@ from typing import Dict, List, Union
 
 from schema import Or, Schema, SchemaError
 
+# The loader used for parsing YAML data is the safe loader based on libyaml
+# if PyYAML was built with it, which is considerably faster than the pure
+# Python implementation.
+try:
+    from yaml import CSafeLoader as YamlLoader  # noqa: F401
+except ImportError:
+    from yaml import SafeLoader as YamlLoader  # noqa: F401
+
 # A shorthand type for the kind of lists and dictionaries that can be
 # encountered when parsing YAML data
 YamlList = List[Union[str, "YamlDict"]]
@@ -67,27 +75,29 @@ class YamlConstructable(ABC):
         pass
 
     @classmethod
-    def from_yaml_dictionary(
-        cls, yaml: YamlDict, **kwargs
-    ) -> "YamlConstructable":
+    def validate_yaml(cls, yaml: YamlDict) -> YamlDict:
         """
-        Instantiate an object of this class from a given YamlDict.
+        Validate YAML data for an instance of this class.
 
         The given YAML will be validated against the schema defined for the
-        class. If the class did not define a schema  on its own (although it
-        should) a catchall schema is provided.
+        class, including the YAML data of all nested elements. If the class
+        did not define a schema on its own (although it should) a catchall
+        schema is provided.
 
         Args:
             yaml:
                 A dictionary as received from the YAML parser containing the
                 data required to create a new instance of the inheriting class
         Returns:
-            A new instance of the overriding subclass
+            The validated YAML data, with default values filled in where
+            the schema provides them.
+        Raises:
+            ValueError:
+                If the YAML data does not match the schema.
         """
         schema: Schema = cls.schema
         try:
             validated_yaml = schema.validate(yaml)
-            return cls._from_yaml_dictionary(yaml=validated_yaml, **kwargs)
         except SchemaError as validation_error:
             # Construct a reduces YAML representation to limit the output in
             # the error message to the essentials.
@@ -102,3 +112,51 @@ class YamlConstructable(ABC):
                 for (key, value) in yaml.items()
             }
             raise ValueError(f"{validation_error} when parsing {reduced_yaml}")
+        return cls._validate_nested_yaml(validated_yaml)
+
+    @classmethod
+    def _validate_nested_yaml(cls, yaml: YamlDict) -> YamlDict:
+        """
+        Validate the YAML data of nested elements.
+
+        Classes containing other YamlConstructables should override this to
+        call validate_yaml() of the nested classes. By default, there are no
+        nested elements.
+
+        Args:
+            yaml:
+                The YAML data of an instance of this class, already validated
+                against the class' schema.
+        Returns:
+            The YAML data with the nested elements replaced by their
+            validated versions.
+        """
+        return yaml
+
+    @classmethod
+    def from_yaml_dictionary(
+        cls, yaml: YamlDict, validate: bool = True, **kwargs
+    ) -> "YamlConstructable":
+        """
+        Instantiate an object of this class from a given YamlDict.
+
+        Unless disabled, the given YAML will be validated via validate_yaml()
+        first.
+
+        Args:
+            yaml:
+                A dictionary as received from the YAML parser containing the
+                data required to create a new instance of the inheriting class
+            validate:
+                (Optional, Default=True) Whether to validate the YAML data.
+                Validation may only be skipped for data that has been
+                obtained from validate_yaml() before.
+        Returns:
+            A new instance of the overriding subclass
+        Raises:
+            ValueError:
+                If the YAML data does not match the schema.
+        """
+        if validate:
+            yaml = cls.validate_yaml(yaml)
+        return cls._from_yaml_dictionary(yaml=yaml, **kwargs)
@@ -0,0 +1,202 @@
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module provides an index of participants shared between answer columns.
+
+Each participant ID is assigned to a fixed integer position once it is
+first encountered. Answers to questions are stored in arrays that are
+aligned to these positions.
+"""
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy
+from pandas import Index
+
+
+class ParticipantIndex(object):
+    """
+    Associates participant IDs with positions in answer columns.
+
+    Positions are assigned in the order in which the participants are
+    registered and never change afterwards, so that columns aligned to the
+    index stay valid while new participants are added.
+    """
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        """
+        Set up an empty participant index.
+
+        Args:
+            name:
+                (Optional) The name given to the index when it is represented
+                as a pandas.Index, usually the name of the participant ID
+                column.
+        """
+        self._name: Optional[str] = name
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._pandas_index: Optional[Index] = None
+        # The pandas representation is cached and dropped whenever a new
+        # participant gets registered.
+        self._shared: bool = False
+        # Whether the ID list and position mapping are shared with another
+        # index and need to be copied before registering new participants.
+
+    def __len__(self) -> int:
+        """Get the amount of registered participants."""
+        return len(self._ids)
+
+    def __contains__(self, participant_id: object) -> bool:
+        """Check whether a participant ID has been registered."""
+        return participant_id in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all participant IDs in the order of their positions."""
+        return iter(self._ids)
+
+    def share(self) -> "ParticipantIndex":
+        """
+        Create a copy of this index that shares the registered participants.
+
+        Nothing is copied right away. Whichever of the two indices registers
+        a new participant first copies the registered participants at that
+        point, so registering participants in one index never affects the
+        other.
+
+        Returns:
+            A new index holding the same participants at the same positions.
+        """
+        shared = ParticipantIndex(name=self._name)
+        shared._ids = self._ids
+        shared._positions = self._positions
+        shared._pandas_index = self._pandas_index
+        shared._shared = True
+        self._shared = True
+        return shared
+
+    def register(self, participant_id: str) -> int:
+        """
+        Get the position of a participant, registering it if required.
+
+        Args:
+            participant_id:
+                The ID of the participant to be looked up.
+        Returns:
+            The position associated with the participant ID.
+        """
+        position = self._positions.get(participant_id)
+        if position is None:
+            if self._shared:
+                self._ids = list(self._ids)
+                self._positions = dict(self._positions)
+                self._shared = False
+            position = len(self._ids)
+            self._positions[participant_id] = position
+            self._ids.append(participant_id)
+            self._pandas_index = None
+        return position
+
+    def register_all(self, participant_ids: Sequence[str]) -> numpy.ndarray:
+        """
+        Get the positions of many participants, registering them if required.
+
+        The effort only depends on the amount of given IDs, not on the
+        amount of participants registered before, so registering survey data
+        in chunks takes linear time overall. The pandas representation is
+        not built for this.
+
+        Args:
+            participant_ids:
+                The IDs of the participants to be looked up.
+        Returns:
+            An integer array holding the position for each given ID.
+        """
+        participant_ids = numpy.asarray(participant_ids, dtype=object)
+        known_position = self._positions.get
+        positions = numpy.fromiter(
+            (
+                known_position(participant_id, -1)
+                for participant_id in participant_ids
+            ),
+            dtype=numpy.intp,
+            count=len(participant_ids),
+        )
+
+        for unknown in numpy.flatnonzero(positions == -1):
+            positions[unknown] = self.register(participant_ids[unknown])
+
+        return positions
+
+    def position_for(self, participant_id: str) -> int:
+        """
+        Get the position of an already registered participant.
+
+        Args:
+            participant_id:
+                The ID of the participant to be looked up.
+        Returns:
+            The position associated with the participant ID.
+        Raises:
+            KeyError:
+                If the participant ID has not been registered.
+        """
+        return self._positions[participant_id]
+
+    def id_at(self, position: int) -> str:
+        """
+        Get the participant ID registered at a given position.
+
+        Args:
+            position:
+                The position to be looked up.
+        Returns:
+            The participant ID at the given position.
+        Raises:
+            IndexError:
+                If no participant has been registered at the position.
+        """
+        return self._ids[position]
+
+    @property
+    def name(self) -> Optional[str]:
+        """
+        Get the name of the index.
+
+        Returns:
+            The name given to the pandas representation of this index.
+        """
+        return self._name
+
+    def as_pandas_index(self) -> Index:
+        """
+        Obtain the registered participant IDs as a pandas.Index.
+
+        The returned object is cached and shared between all callers until
+        a new participant is registered. It must not be modified.
+
+        Returns:
+            A pandas.Index holding the participant IDs in position order.
+        """
+        if self._pandas_index is None:
+            self._pandas_index = Index(
+                self._ids, dtype=object, name=self._name
+            )
+        return self._pandas_index
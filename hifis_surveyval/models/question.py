@@ -24,22 +24,34 @@ This module contains classes to represent survey questions.
 These can be constructed from YAML through the YamlConstructable abstract
 class.
 """
+import copy
 # alias name to avoid clash with schema.Optional
-import logging
-from typing import Dict, Optional, Set, Generic, get_args, Union, Iterable
+from typing import (
+    Dict, Optional, Set, Generic, get_args, Union, Iterable, Mapping, List,
+    Sequence,
+)
 
+import numpy
 import schema
-from pandas import Series
+from pandas import DataFrame, Series, concat
 
+from hifis_surveyval.core.memory_report import MemoryUsage, deep_size
 from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.models.answer_column import AnswerColumn
+from hifis_surveyval.models.answer_decoder import (
+    AnswerDecoder, CastDecoder, DecodedValues, OptionDecoder,
+    TruthValueDecoder,
+)
 from hifis_surveyval.models.answer_option import AnswerOption
 from hifis_surveyval.models.answer_types import VALID_ANSWER_TYPES, AnswerType
+from hifis_surveyval.models.frame_cache import FrameCache, OwnerKey
 from hifis_surveyval.models.mixins.mixins import (
     HasLabel, HasText, HasID, HasMandatory,
 )
 from hifis_surveyval.models.mixins.yaml_constructable import (
     YamlConstructable, YamlDict
 )
+from hifis_surveyval.models.participant_index import ParticipantIndex
 from hifis_surveyval.models.translated import Translated
 
 
@@ -91,6 +103,7 @@ class Question(
         label: str,
         mandatory: bool,
         settings: Settings,
+        participant_index: Optional[ParticipantIndex] = None,
     ):
         """
         Initialize a question object with metadata.
@@ -118,6 +131,11 @@ class Question(
                 complete.
             settings:
                 An object reflecting the application settings.
+            participant_index:
+                (Optional) The index of participants to which the answers
+                are aligned. Usually this is shared between all questions of
+                a data container. If not given, the question will use an
+                index of its own.
         """
         super(Question, self).__init__(
             object_id=question_id,
@@ -135,7 +153,94 @@ class Question(
 
         # The actual answers are not part of the metadata but have to be read
         # from other sources in a separate step
-        self._answers: Dict[str, Optional[AnswerType]] = {}
+        if participant_index is None:
+            participant_index = ParticipantIndex(
+                name=self._settings.ID_COLUMN_NAME
+            )
+        self._participant_index: ParticipantIndex = participant_index
+        self._answer_column: Optional[AnswerColumn] = None
+        # The column is set up on first use, since the answer type is not
+        # yet accessible during initialization.
+
+        self._answer_decoder: Optional[AnswerDecoder] = None
+        # The decoder is compiled once the answer options are known.
+
+        self._cache_key: OwnerKey = FrameCache.new_key()
+        # Renewed whenever the answers or the label change, so data frames
+        # built from the question before are dropped from the cache.
+
+    @property
+    def _answers(self) -> AnswerColumn:
+        """
+        Get the column storing the answers to this question.
+
+        Returns:
+            The answer column, aligned to the question's participant index.
+        """
+        if self._answer_column is None:
+            self._answer_column = AnswerColumn(
+                answer_type=self._answer_type,
+                participant_index=self._participant_index
+            )
+        return self._answer_column
+
+    @property
+    def decoder(self) -> AnswerDecoder:
+        """
+        Get the decoder for the answer texts of this question.
+
+        If no decoder has been compiled yet, this is done on first use.
+        The decoder may be used to decode answers elsewhere, e.g. in another
+        process, before handing them to add_decoded_answers().
+
+        Returns:
+            The decoder matching the answer type and answer options.
+        """
+        if self._answer_decoder is None:
+            self._answer_decoder = self._compile_decoder()
+        return self._answer_decoder
+
+    def _compile_decoder(self) -> AnswerDecoder:
+        """
+        Build the decoder for the answer texts of this question.
+
+        If answer options are defined, the answer texts are expected to be
+        the short IDs of the answer options, which are decoded into the
+        option's values. Otherwise, booleans are decoded according to the
+        truth values given in the settings and all other types are cast.
+
+        Returns:
+            A new decoder for the answer texts of this question.
+        """
+        if self._answer_options:
+            return OptionDecoder(
+                name=self.full_id,
+                options={
+                    short_id: option.value
+                    for (short_id, option) in self._answer_options.items()
+                },
+                answer_type=self._answer_type,
+            )
+        if self._answer_type == bool:
+            return TruthValueDecoder(
+                name=self.full_id,
+                true_values=self._settings.TRUE_VALUES,
+                false_values=self._settings.FALSE_VALUES,
+            )
+        return CastDecoder(name=self.full_id, answer_type=self._answer_type)
+
+    @property
+    def decoder_statistics(self) -> Dict[str, int]:
+        """
+        Get statistics about decoding the answers to this question.
+
+        Returns:
+            A dictionary holding the amount of decode calls ("calls"), the
+            amount of processed answer texts ("values"), how many of these
+            were empty ("empty") and how many could not be decoded
+            ("errors").
+        """
+        return self.decoder.statistics
 
     @property
     def _answer_type(self) -> type:
@@ -156,6 +261,41 @@ class Question(
         # instantiation has not yes completed, so caching the type is
         # probably not an option.
 
+    def snapshot(
+        self, settings: Settings, participant_index: ParticipantIndex
+    ) -> "Question[AnswerType]":
+        """
+        Create a copy of this question for use in an isolated context.
+
+        The stored answers are shared with the copy until either of them is
+        modified, see AnswerColumn.share(). The answer options and the
+        decoder are copied, since they may be relabelled or keep statistics
+        respectively.
+
+        Args:
+            settings:
+                The settings to be used by the copy.
+            participant_index:
+                The index to which the answers of the copy are aligned, as
+                obtained from ParticipantIndex.share().
+        Returns:
+            A copy of this question that can be modified independently.
+        """
+        snapshot = copy.copy(self)
+        snapshot._settings = settings
+        snapshot._participant_index = participant_index
+        snapshot._answer_options = {
+            short_id: answer_option.snapshot(settings)
+            for (short_id, answer_option) in self._answer_options.items()
+        }
+        if self._answer_column is not None:
+            snapshot._answer_column = self._answer_column.share(
+                participant_index
+            )
+        if self._answer_decoder is not None:
+            snapshot._answer_decoder = copy.copy(self._answer_decoder)
+        return snapshot
+
     def _add_answer_option(self, new_answer_option: AnswerOption) -> None:
         """
         Add a new answer option to this Question.
@@ -176,6 +316,36 @@ class Question(
             )
 
         self._answer_options[new_answer_option.short_id] = new_answer_option
+        self._answer_decoder = None  # Needs to be compiled again
+
+    def __setstate__(self, state: Dict) -> None:
+        """
+        Restore a question, e.g. when unpickling or copying it.
+
+        The restored question gets a new cache key, since it may be modified
+        independently of the question it was copied from.
+
+        Args:
+            state:
+                The attributes of the question to be restored.
+        """
+        super(Question, self).__setstate__(state)
+        self._cache_key = FrameCache.new_key()
+
+    def relabel(self, new_label: str) -> None:
+        """
+        Set a new label for this question.
+
+        Data frames built from the question before are dropped from the
+        cache.
+
+        Args:
+            new_label:
+                The new label to be used for the question. See
+                HasLabel.relabel() for details.
+        """
+        super(Question, self).relabel(new_label)
+        self._cache_key = FrameCache.renew_key(self._cache_key)
 
     def add_answer(self, participant_id: str, value_text: str) -> None:
         """
@@ -196,39 +366,57 @@ class Question(
                 If answer options were present, but none of the answer options
                 had an ID that matched the given value
         """
-        if not value_text:
-            # Convert empty strings to None to properly indicate that no
-            # data was provided
-            self._answers[participant_id] = None
-            return
+        self._answers.set_answer(
+            participant_id, self.decoder.decode_one(value_text)
+        )
+        self._cache_key = FrameCache.renew_key(self._cache_key)
+        # FIXME catch if conversion fails
 
-        if self._answer_options:
-            # If answer options are defined, the answer value is expected to
-            # be the short id of the corresponding answer option to be
-            # looked up. The actual value is taken from there.
-            option = self._answer_options[value_text]
-            self._answers[participant_id] = option.value
-            return
+    def add_answers(
+        self, participant_ids: Sequence[str], raw_values: Sequence[str]
+    ) -> None:
+        """
+        Store the answers of many participants to this question at once.
 
-        if self._answer_type == bool:
-            # When casting to boolean values, Python casts any non-empty string
-            # to True and only empty strings to False. Consequently, values
-            # are transformed according to a set of valid true and false
-            # values to allow for different truth values.
-            if value_text in self._settings.TRUE_VALUES:
-                bool_value = True
-            elif value_text in self._settings.FALSE_VALUES:
-                bool_value = False
-            else:
-                logging.error(f"Boolean data is an invalid truth value "
-                              f"in question {self.full_id}: {value_text}.")
-                bool_value = None
-            self._answers[participant_id] = bool_value
-            return
-
-        # try to cast the answer value to the expected type
-        self._answers[participant_id] = self._answer_type(value_text)
-        # FIXME catch if conversion fails
+        This is the bulk version of add_answer(), which decodes all given
+        values in one go instead of one by one. Values that can not be
+        decoded are logged and not stored.
+
+        Args:
+            participant_ids:
+                The IDs of the participants who gave the answers.
+            raw_values:
+                The text-versions of the answers as stored in the CSV, in
+                the same order as the participant IDs.
+        """
+        self.add_decoded_answers(
+            positions=self._participant_index.register_all(participant_ids),
+            decoded=self.decoder.decode(raw_values),
+        )
+
+    def add_decoded_answers(
+        self, positions: numpy.ndarray, decoded: DecodedValues
+    ) -> None:
+        """
+        Store answers that have already been decoded.
+
+        Args:
+            positions:
+                The positions of the participants who gave the answers, as
+                assigned by the question's participant index.
+            decoded:
+                The result of decoding the answer texts with this question's
+                decoder, in the same order as the positions. Values that
+                could not be decoded are not stored.
+        """
+        (values, null, valid) = decoded
+
+        self._answers.set_answers(
+            positions=positions[valid],
+            values=values[valid],
+            null=null[valid],
+        )
+        self._cache_key = FrameCache.renew_key(self._cache_key)
 
     def remove_answers(self, participant_ids: Set[str]) -> None:
         """
@@ -239,9 +427,8 @@ class Question(
                 The IDs of the participants whose answers are to be removed.
                 Invalid IDs are ignored.
         """
-        for participant_id in participant_ids:
-            if participant_id in self._answers:
-                del self._answers[participant_id]
+        self._answers.remove_answers(participant_ids)
+        self._cache_key = FrameCache.renew_key(self._cache_key)
 
     def is_mandatory_fulfilled(
             self, check_for: Union[str, Iterable[str]]
@@ -279,16 +466,18 @@ class Question(
         return results
 
     @property
-    def answers(self) -> Dict[str, Optional[AnswerType]]:
+    def answers(self) -> Mapping[str, Optional[AnswerType]]:
         """
         Obtain the given answers as read from the survey data.
 
-        The answers are given as a mapping:
+        The answers are given as a read-only mapping:
         participant ID -> participant answer
 
         The participant ID will be a string, while the answers may be
         assumed to be of the answer_type of the Question.
         If the Question is not mandatory, answers may also be None.
+        The mapping is a view on the stored answers and reflects later
+        changes to them.
 
         Returns:
             The mapping from participant ID to the participant's answer for
@@ -304,14 +493,157 @@ class Question(
         indices are the respective answers.
 
         The series will be named with the question's full ID.
+        It holds its own copy of the answers, so it may be modified freely.
+        Its index is the shared participant index, which must not be
+        modified. Series are not cached, since building one takes no more
+        than copying the answers.
 
         Returns:
             A pandas.Series representing the answers for each participant
         """
-        series = Series(self._answers)
-        series.name = self.full_id
-        series.index.name = self._settings.ID_COLUMN_NAME
-        return series
+        index = self._participant_index.as_pandas_index()
+        present = self._answers.present
+        if present.all():
+            # The stored answers are only copied if as_array() did not
+            # already have to
+            return Series(
+                numpy.require(self._answers.as_array(), requirements="W"),
+                index=index,
+                name=self.full_id,
+                copy=False,
+            )
+
+        # Leave out the participants who did not give any answer
+        return Series(
+            self._answers.as_array(selection=present),
+            index=index[present],
+            name=self.full_id,
+        )
+
+    @property
+    def participant_index(self) -> ParticipantIndex:
+        """
+        Get the index of participants the answers are aligned to.
+
+        Returns:
+            The participant index used by this question.
+        """
+        return self._participant_index
+
+    @property
+    def cache_key(self) -> OwnerKey:
+        """
+        Get the key identifying the current state of this question.
+
+        The key changes whenever the answers or the label of the question
+        change. It is used to look up cached data frames.
+
+        Returns:
+            The cache key of the question.
+        """
+        return self._cache_key
+
+    def memory_usage(self, seen: Set[int]) -> MemoryUsage:
+        """
+        Estimate the memory held by this question.
+
+        The participant index and the settings are shared with other
+        questions and therefore not counted here.
+
+        Args:
+            seen:
+                The IDs of objects already counted elsewhere. They are not
+                counted again. The IDs of all counted objects are added.
+        Returns:
+            The memory held by the answers, the translations of the question
+            and its answer options and by the remaining metadata, like the
+            answer options and the decoder.
+        """
+        seen.update({id(self._settings), id(self._participant_index)})
+        sizes: Dict[str, int] = {
+            "answers": deep_size(self._answer_column, seen),
+            "translations": deep_size(self._text, seen) + sum(
+                deep_size(answer_option._text, seen)
+                for answer_option in self._answer_options.values()
+            ),
+        }
+        # Everything not counted so far is metadata
+        sizes["metadata"] = deep_size(self, seen)
+        return MemoryUsage(name=self.full_id, sizes=sizes)
+
+    @staticmethod
+    def frame_from_questions(questions: List["Question"]) -> DataFrame:
+        """
+        Gather the answers to multiple questions into a single data frame.
+
+        If all questions share the same participant index, the frame is
+        composed directly from the aligned answers. Otherwise, the answer
+        series are joined by participant ID.
+
+        Args:
+            questions:
+                The questions whose answers are to be put into the frame.
+                Each question will be represented by a column named with the
+                question's full ID.
+        Returns:
+            A pandas data frame with participants in the rows and the
+            given questions in the columns. Participants who did not answer
+            any of the questions are left out.
+        Raises:
+            ValueError:
+                If no questions were given.
+        """
+        if not questions:
+            raise ValueError("No questions to gather answers from")
+
+        index = questions[0].participant_index
+        if any(question.participant_index is not index
+               for question in questions):
+            return concat(
+                [question.as_series() for question in questions], axis=1
+            )
+
+        present = numpy.logical_or.reduce(
+            [question._answers.present for question in questions]
+        )
+        selection = None if present.all() else present
+        pandas_index = index.as_pandas_index()
+
+        frame = DataFrame(
+            {
+                position: question._answers.as_array(selection=selection)
+                for (position, question) in enumerate(questions)
+            },
+            index=(
+                pandas_index if selection is None
+                else pandas_index[selection]
+            ),
+        )
+        # Columns are assigned afterwards, since the same question may be
+        # requested more than once.
+        frame.columns = [question.full_id for question in questions]
+        return frame
+
+    @classmethod
+    def _validate_nested_yaml(cls, yaml: YamlDict) -> YamlDict:
+        """
+        Validate the translated texts and answer options of the question.
+
+        Args:
+            yaml:
+                The YAML data of the question, already validated against the
+                schema.
+        Returns:
+            The YAML data with the validated texts and answer options.
+        """
+        yaml[HasText.YAML_TOKEN] = Translated.validate_yaml(
+            yaml[HasText.YAML_TOKEN]
+        )
+        yaml[Question.token_ANSWER_OPTIONS] = [
+            AnswerOption.validate_yaml(answer_yaml)
+            for answer_yaml in yaml[Question.token_ANSWER_OPTIONS]
+        ]
+        return yaml
 
     @staticmethod
     def _from_yaml_dictionary(yaml: YamlDict, **kwargs) -> "Question":
@@ -328,6 +660,9 @@ class Question(
                 belongs to.
             settings:
                 (Required) An object reflecting the applications settings.
+            participant_index:
+                (Optional) The participant index the answers of the question
+                are to be aligned to.
 
         Returns:
             A new Question containing the provided data
@@ -342,18 +677,25 @@ class Question(
             question_id=question_id,
             parent_id=parent_id,
             label=yaml[HasLabel.YAML_TOKEN],
-            text=Translated(yaml[HasText.YAML_TOKEN]),
+            text=Translated.from_yaml_dictionary(
+                yaml[HasText.YAML_TOKEN], validate=False
+            ),
             mandatory=yaml[HasMandatory.YAML_TOKEN],
-            settings=settings
+            settings=settings,
+            participant_index=kwargs.get("participant_index"),
         )
 
         for answer_yaml in yaml[Question.token_ANSWER_OPTIONS]:
             new_answer_option = AnswerOption.from_yaml_dictionary(
                 yaml=answer_yaml,
+                validate=False,
                 parent_id=new_question.full_id,
                 settings=settings,
                 answer_type=answer_type
             )
             new_question._add_answer_option(new_answer_option)
 
+        # With all answer options known, the decoder can be compiled once
+        # instead of being set up again for each answer.
+        new_question._answer_decoder = new_question._compile_decoder()
         return new_question
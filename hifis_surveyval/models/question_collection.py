@@ -24,20 +24,25 @@ This module contains classes to represent groups of survey questions.
 These can be constructed from YAML through the YamlConstructable abstract
 class.
 """
+import copy
 from typing import Dict, List, Set, Iterable
 from typing import Optional as typing_Optional
 from typing import Union
 
-from pandas import DataFrame, Series, concat
+from pandas import DataFrame
 from schema import Optional, Schema
 
+from hifis_surveyval.core.memory_report import MemoryUsage, deep_size
 from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.models.frame_cache import FrameCache, OwnerKey
+from hifis_surveyval.models.metadata_validator import validate_collection
 from hifis_surveyval.models.mixins.mixins import (
     HasLabel, HasText, HasID, HasMandatory,
 )
 from hifis_surveyval.models.mixins.yaml_constructable import (
     YamlConstructable, YamlDict,
 )
+from hifis_surveyval.models.participant_index import ParticipantIndex
 from hifis_surveyval.models.question import Question
 from hifis_surveyval.models.translated import Translated
 
@@ -116,6 +121,33 @@ class QuestionCollection(
         self._questions: Dict[str, Question] = {
             question.short_id: question for question in questions
         }
+        self._cache_key: OwnerKey = FrameCache.new_key()
+        # Renewed whenever the label changes. Changes to the answers are
+        # tracked by the cache keys of the questions.
+
+    def snapshot(
+        self, settings: Settings, participant_index: ParticipantIndex
+    ) -> "QuestionCollection":
+        """
+        Create a copy of this collection for use in an isolated context.
+
+        Args:
+            settings:
+                The settings to be used by the copy.
+            participant_index:
+                The index to which the answers of the copy are aligned, as
+                obtained from ParticipantIndex.share().
+        Returns:
+            A copy of this collection and its questions that can be modified
+            independently. See Question.snapshot() for details.
+        """
+        snapshot = copy.copy(self)
+        snapshot._settings = settings
+        snapshot._questions = {
+            short_id: question.snapshot(settings, participant_index)
+            for (short_id, question) in self._questions.items()
+        }
+        return snapshot
 
     @property
     def questions(self) -> List[Question]:
@@ -127,6 +159,32 @@ class QuestionCollection(
         """
         return list(self._questions.values())
 
+    def memory_usage(self, seen: Set[int]) -> MemoryUsage:
+        """
+        Estimate the memory held by this collection and its questions.
+
+        Args:
+            seen:
+                The IDs of objects already counted elsewhere. They are not
+                counted again. The IDs of all counted objects are added.
+        Returns:
+            The memory held by the translations, the cached data frames and
+            the remaining metadata of the collection itself, with the memory
+            held by each question as parts.
+        """
+        seen.add(id(self._settings))
+        questions: List[MemoryUsage] = [
+            question.memory_usage(seen)
+            for question in self._questions.values()
+        ]
+        sizes: Dict[str, int] = {
+            "translations": deep_size(self._text, seen),
+            "frames": FrameCache.size_of(self._cache_key),
+        }
+        # Everything not counted so far is metadata
+        sizes["metadata"] = deep_size(self, seen)
+        return MemoryUsage(name=self.full_id, sizes=sizes, parts=questions)
+
     def question_for_id(self, question_short_id: str) -> Question:
         """
         Obtain a question from the collection for a given short ID.
@@ -168,7 +226,11 @@ class QuestionCollection(
             A pandas data frame with participants in the rows and the
             questions of this collection in the columns. The fields in
             the data frame then contain the answer to a question for a
-            given participant.
+            given participant. The data frame is kept for re-use until the
+            answers change, see FrameCache.
+        Raises:
+            ValueError:
+                If no questions remain after the exclusion.
         """
         excluded = []
         if isinstance(exclude_labels, str):
@@ -177,16 +239,52 @@ class QuestionCollection(
             excluded.extend(exclude_labels)
         # Nothing to do in any other case
 
-        question_series: List[Series] = []
-        for (label, question) in self._questions.items():
-            if label in excluded:
-                continue
-            question_series.append(question.as_series())
-        return concat(question_series, axis=1)  # Note (0)
+        selected_questions: List[Question] = [
+            question
+            for (label, question) in self._questions.items()
+            if label not in excluded
+        ]
+        if not selected_questions:
+            return Question.frame_from_questions(selected_questions)
+        return FrameCache.obtain(
+            settings=self._settings,
+            key=(
+                self._cache_key,
+                "frame",
+                tuple(question.cache_key for question in selected_questions),
+                len(selected_questions[0].participant_index),
+            ),
+            build=lambda: Question.frame_from_questions(selected_questions),
+            sources=[question.cache_key for question in selected_questions],
+        )
+
+    def __setstate__(self, state: Dict) -> None:
+        """
+        Restore a collection, e.g. when unpickling or copying it.
+
+        The restored collection gets a new cache key, since it may be
+        modified independently of the collection it was copied from.
+
+        Args:
+            state:
+                The attributes of the collection to be restored.
+        """
+        super(QuestionCollection, self).__setstate__(state)
+        self._cache_key = FrameCache.new_key()
+
+    def relabel(self, new_label: str) -> None:
+        """
+        Set a new label for this collection.
 
-        # Note (0) The series are joined row-wise, so each participant in the
-        # row labels (aka indexes) is associated with each answer according to
-        # the question (Question ID in the column labels).
+        Data frames of the collection cached before are dropped.
+
+        Args:
+            new_label:
+                The new label to be used for the collection. See
+                HasLabel.relabel() for details.
+        """
+        super(QuestionCollection, self).relabel(new_label)
+        self._cache_key = FrameCache.renew_key(self._cache_key)
 
     def is_mandatory_fulfilled(
             self, check_for: Union[str, Iterable[str]]
@@ -232,6 +330,27 @@ class QuestionCollection(
 
         return accumulated
 
+    @classmethod
+    def validate_yaml(cls, yaml: YamlDict) -> YamlDict:
+        """
+        Validate the YAML data of a collection in a single pass.
+
+        Instead of interpreting the schemas of the collection and all its
+        nested elements one by one, the precompiled checks of the metadata
+        validator are used. They are equivalent to the schemas, but report
+        all errors of the collection at once, each with its path.
+
+        Args:
+            yaml:
+                The YAML data of the collection.
+        Returns:
+            The validated YAML data, with default values filled in.
+        Raises:
+            ValueError:
+                If the YAML data is not valid.
+        """
+        return validate_collection(yaml)
+
     @staticmethod
     def _from_yaml_dictionary(
         yaml: YamlDict, **kwargs
@@ -246,6 +365,9 @@ class QuestionCollection(
         Keyword Args:
             settings:
                 (Required) An object representing the application settings.
+            participant_index:
+                (Optional) The participant index the answers of all
+                questions in the collection are to be aligned to.
 
         Returns:
             A new Question containing the provided data
@@ -255,13 +377,17 @@ class QuestionCollection(
 
         questions = [
             Question.from_yaml_dictionary(
-                yaml=question_yaml, parent_id=collection_id, settings=settings
+                yaml=question_yaml,
+                validate=False,
+                parent_id=collection_id,
+                settings=settings,
+                participant_index=kwargs.get("participant_index"),
             )
             for question_yaml in yaml[QuestionCollection.token_QUESTIONS]
         ]
 
         text = Translated.from_yaml_dictionary(
-            yaml[HasText.YAML_TOKEN]
+            yaml[HasText.YAML_TOKEN], validate=False
         )
 
         return QuestionCollection(
@@ -59,7 +59,7 @@ class Translated(YamlConstructable):
     """
     # TODO: Properly format this docstring
 
-    def __init__(self, translations: Dict[str, str]):
+    def __init__(self, translations: Dict[str, str], validate: bool = True):
         """
         Create a new instance of translated text.
 
@@ -69,8 +69,15 @@ class Translated(YamlConstructable):
                 respective language. The dictionary must not be empty.
                 Keys are expected to be two-letter codes with an optional
                 region code, and values must neither be None nor be empty.
+            validate:
+                (Optional, Default=True) Whether to validate the
+                translations. This may only be skipped if they have already
+                been validated before.
         """
-        self._translations = Translated.schema.validate(translations)
+        self._translations = (
+            Translated.schema.validate(translations) if validate
+            else translations
+        )
 
     def available_languages(self) -> List[str]:
         """
@@ -118,8 +125,8 @@ class Translated(YamlConstructable):
         """
         Construct a new Translated instance from the given data.
 
-        The validation of the dictionaries keys and values are done by the
-        Translated-constructor.
+        The validation of the dictionaries keys and values has already been
+        done by from_yaml_dictionary() at this point.
 
         Args:
             yaml:
@@ -130,4 +137,4 @@ class Translated(YamlConstructable):
         Returns:
             A new Translated-instance as given in the YAML data.
         """
-        return Translated(yaml)
+        return Translated(yaml, validate=False)
@@ -38,6 +38,7 @@ from typing import Dict, List, Optional, Tuple
 from matplotlib import colors, pyplot, rcParams
 from pandas import DataFrame
 
+from hifis_surveyval.core.tracer import Tracer
 from hifis_surveyval.plotting.matplotlib_color_map_parameters import \
     ColorMapParameters, DefaultColors, FillPattern, DefaultFillPattern
 from hifis_surveyval.plotting.plotter import Plotter
@@ -63,36 +64,44 @@ class MatplotlibPlotter(Plotter):
                 generation of a file name from the date of the run and the
                 module producing the image.
         """
-        if self.settings.OUTPUT_FORMAT == SupportedOutputFormat.SCREEN:
-            pyplot.show()
-            pyplot.close()
-            return
-
-        if not output_file_stem:
-            # Auto-generate the file stem
-
-            # Get the calling module's name, assuming this function is called
-            # from a survey evaluation script
-            # Keep in mind that
-            # * FrameInfo is a named tuple in which the second entry is the
-            #   fully qualified module name
-            # * The first element on the stack is this function, the caller is
-            #   the second frame
-            calling_module_frame: FrameInfo = stack()[1]
-            calling_module_name: str = getmodulename(calling_module_frame[1])
+        # The span is entered here rather than by decorating the method,
+        # since the automatic file name is taken from the calling frame
+        with Tracer.span("MatplotlibPlotter._output_pyplot_image",
+                         "plotting"):
+            if self.settings.OUTPUT_FORMAT == SupportedOutputFormat.SCREEN:
+                pyplot.show()
+                pyplot.close()
+                return
+
+            if not output_file_stem:
+                # Auto-generate the file stem
+
+                # Get the calling module's name, assuming this function is
+                # called from a survey evaluation script
+                # Keep in mind that
+                # * FrameInfo is a named tuple in which the second entry is
+                #   the fully qualified module name
+                # * The first element on the stack is this function, the
+                #   caller is the second frame
+                calling_module_frame: FrameInfo = stack()[1]
+                calling_module_name: str = getmodulename(
+                    calling_module_frame[1]
+                )
 
-            output_file_stem: str = f"{calling_module_name}"
+                output_file_stem: str = f"{calling_module_name}"
 
-        file_ending: str = self.settings.OUTPUT_FORMAT.name.lower()
-        file_name: str = f"{output_file_stem}.{file_ending}"
+            file_ending: str = self.settings.OUTPUT_FORMAT.name.lower()
+            file_name: str = f"{output_file_stem}.{file_ending}"
 
-        output_path: Path = self.settings.ANALYSIS_OUTPUT_PATH / file_name
+            output_path: Path = self.settings.ANALYSIS_OUTPUT_PATH / file_name
 
-        if output_path.exists():
-            logging.warning(f"Overriding existing output file {output_path}")
+            if output_path.exists():
+                logging.warning(
+                    f"Overriding existing output file {output_path}"
+                )
 
-        pyplot.savefig(f"{output_path}")
-        pyplot.close()
+            pyplot.savefig(f"{output_path}")
+            pyplot.close()
 
     @classmethod
     def _set_figure_size(cls, width: float, height: float):
@@ -166,6 +175,7 @@ class MatplotlibPlotter(Plotter):
                          f"using plot style: {default_plot_style_name}")
             pyplot.style.use(default_plot_style_name)
 
+    @Tracer.traced("plotting")
     def plot_bar_chart(
         self,
         data_frame: DataFrame,
@@ -546,6 +556,7 @@ class MatplotlibPlotter(Plotter):
                         bbox=bbox_dict
                     )
 
+    @Tracer.traced("plotting")
     def plot_box_chart(
         self,
         data_frame: Optional[DataFrame] = None,
@@ -661,6 +672,7 @@ class MatplotlibPlotter(Plotter):
 
         self._output_pyplot_image(plot_file_name)
 
+    @Tracer.traced("plotting")
     def plot_matrix_chart(
         self,
         data_frame: DataFrame,
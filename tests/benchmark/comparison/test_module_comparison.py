@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module comparison."""
+
+from typing import List
+
+import pytest
+
+from hifis_surveyval.benchmark.comparison import BenchmarkComparison
+from hifis_surveyval.benchmark.results import BenchmarkRecord
+from hifis_surveyval.benchmark.runner import BenchmarkResult
+
+
+def record(results: List[BenchmarkResult]) -> BenchmarkRecord:
+    """
+    Create a record of benchmark results without context.
+
+    Args:
+        results:
+            The results to be recorded.
+    Returns:
+        The record holding the results.
+    """
+    return BenchmarkRecord(
+        results=results,
+        scale={"participants": 10, "questions": 5, "seed": 0, "repeat": 5},
+        configuration={},
+        machine={},
+        version="1.0.0",
+        commit=None,
+        created="2021-01-01T00:00:00",
+    )
+
+
+class TestBenchmarkComparison(object):
+    """
+    Tests BenchmarkComparison operations.
+
+    Basic tests for class BenchmarkComparison are performed in unit test
+    methods of this class.
+    """
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "baseline, candidate, verdict",
+        [
+            ([1.0, 1.1, 0.9, 1.0, 1.05], [1.5, 1.6, 1.4, 1.55, 1.5],
+             BenchmarkComparison.REGRESSION),
+            ([1.5, 1.6, 1.4, 1.55, 1.5], [1.0, 1.1, 0.9, 1.0, 1.05],
+             BenchmarkComparison.IMPROVEMENT),
+            # Slower, but the timings overlap too much to be significant
+            ([1.0, 2.0, 1.2, 1.9, 1.1], [1.3, 2.1, 1.2, 1.9, 1.5], ""),
+            # Significant, but below the threshold
+            ([1.00, 1.01, 1.00, 1.01, 1.00], [1.02, 1.03, 1.02, 1.03, 1.02],
+             ""),
+            # A single timing can not be tested
+            ([1.0], [5.0], ""),
+        ],
+    )
+    def test_verdict(
+        self, baseline: List[float], candidate: List[float], verdict: str
+    ) -> None:
+        """
+        Tests that only significant changes above the threshold are flagged.
+
+        Args:
+            baseline (List[float]):
+                Timings of the earlier run.
+            candidate (List[float]):
+                Timings of the later run.
+            verdict (str):
+                The expected verdict on the change.
+        """
+        comparison: BenchmarkComparison = BenchmarkComparison(
+            BenchmarkResult("load", baseline),
+            BenchmarkResult("load", candidate),
+        )
+        assert comparison.verdict(alpha=0.05, threshold=0.05) == verdict, \
+            "Change was not judged correctly."
+
+    @pytest.mark.ci
+    def test_compare_matches_benchmarks_by_name(self) -> None:
+        """Tests that only benchmarks present in both runs are compared."""
+        comparisons: List[BenchmarkComparison] = BenchmarkComparison.compare(
+            record([BenchmarkResult("old", [1.0]),
+                    BenchmarkResult("load", [1.0, 1.0])]),
+            record([BenchmarkResult("load", [2.0, 2.0]),
+                    BenchmarkResult("new", [1.0])]),
+        )
+        assert [(comparison.name, comparison.change)
+                for comparison in comparisons] == [("load", 1.0)], \
+            "Benchmarks were not matched by name."
+        summary: str = BenchmarkComparison.summary(comparisons, 0.05, 0.05)
+        assert summary.splitlines()[1].split()[1:4] \
+            == ["1.0000", "2.0000", "+100.0%"], "Summary is not correct."
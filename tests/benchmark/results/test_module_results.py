@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module results."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from hifis_surveyval.benchmark.results import BenchmarkRecord
+from hifis_surveyval.benchmark.runner import BenchmarkResult
+from hifis_surveyval.core.settings import Settings
+
+
+class TestBenchmarkRecord(object):
+    """
+    Tests BenchmarkRecord operations.
+
+    Basic tests for class BenchmarkRecord are performed in unit test methods
+    of this class.
+    """
+
+    @pytest.mark.ci
+    def test_record_can_be_read_back(self, tmp_path: Path) -> None:
+        """
+        Tests that a written record is read back with its context.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the results.
+        """
+        settings: Settings = Settings()
+        settings.DECODE_WORKERS = 3
+        scale = {"participants": 10, "questions": 5, "seed": 0, "repeat": 2}
+        record: BenchmarkRecord = BenchmarkRecord.collect(
+            settings, [BenchmarkResult("load", [0.5, 0.7])], scale
+        )
+        path: Path = tmp_path / "results" / "run.json"
+        record.write(path)
+
+        read: BenchmarkRecord = BenchmarkRecord.read(path)
+        assert [(result.name, result.timings) for result in read.results] \
+            == [("load", [0.5, 0.7])], "Timings were not read back."
+        assert read.scale == scale, "Scale was not read back."
+        assert read.configuration["DECODE_WORKERS"] == "3", \
+            "Configuration was not recorded."
+        assert read.machine["python"] and read.version, \
+            "Machine and version were not recorded."
+
+    @pytest.mark.ci
+    def test_unknown_format_is_rejected(self, tmp_path: Path) -> None:
+        """
+        Tests that files of other formats are not read as results.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the file.
+        """
+        path: Path = tmp_path / "other.json"
+        path.write_text(json.dumps({"scripts": []}))
+        with pytest.raises(ValueError):
+            BenchmarkRecord.read(path)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module runner."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from hifis_surveyval.benchmark.benchmarks import (
+    BENCHMARKS,
+    BenchmarkEnvironment,
+)
+from hifis_surveyval.benchmark.runner import BenchmarkResult, BenchmarkRunner
+from hifis_surveyval.core.settings import Settings
+
+
+class TestBenchmarkRunner(object):
+    """
+    Tests BenchmarkRunner operations.
+
+    Basic tests for class BenchmarkRunner are performed in unit test methods
+    of this class.
+    """
+
+    @pytest.mark.ci
+    def test_all_benchmarks_run(self, tmp_path: Path) -> None:
+        """
+        Tests that each benchmark runs on a small generated survey.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the survey.
+        """
+        settings: Settings = Settings()
+        settings.ANALYSIS_OUTPUT_PATH = tmp_path / "unused"
+        environment: BenchmarkEnvironment = BenchmarkEnvironment(
+            settings, tmp_path, participants=20, questions=10
+        )
+        results: List[BenchmarkResult] = BenchmarkRunner(
+            environment, repeat=2
+        ).run_all(BENCHMARKS)
+        environment.release()
+
+        assert [result.name for result in results] \
+            == [benchmark.name for benchmark in BENCHMARKS], \
+            "Not all benchmarks were run."
+        assert all(len(result.timings) == 2 for result in results), \
+            "Benchmarks were not repeated."
+        assert list((tmp_path / "output").glob("*.png")), \
+            "Plots were not written into the benchmark folder."
+        assert settings.METADATA != environment.settings.METADATA, \
+            "Given settings must not be modified."
+
+    @pytest.mark.ci
+    def test_summary_lists_statistics(self) -> None:
+        """Tests that the summary holds the statistics of each benchmark."""
+        result: BenchmarkResult = BenchmarkResult("load", [1.0, 2.0, 3.0])
+        assert (result.minimum, result.mean, result.deviation) \
+            == (1.0, 2.0, 1.0), "Statistics are not correct."
+        lines: List[str] = BenchmarkRunner.summary([result]).splitlines()
+        assert lines[1].split() == ["load", "1.0000", "2.0000", "1.0000"], \
+            "Summary is not correct."
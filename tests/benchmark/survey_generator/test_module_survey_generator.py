@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module survey_generator."""
+
+import gc
+from pathlib import Path
+
+import pytest
+
+from hifis_surveyval.benchmark.survey_generator import SurveyGenerator
+from hifis_surveyval.core.metadata_loader import MetadataLoader
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.survey_data_reader import SurveyDataReader
+from hifis_surveyval.data_container import DataContainer
+from hifis_surveyval.models.question import Question
+
+
+class TestSurveyGenerator(object):
+    """
+    Tests SurveyGenerator operations.
+
+    Basic tests for class SurveyGenerator are performed in unit test methods
+    of this class.
+    """
+
+    @pytest.mark.ci
+    def test_generated_survey_can_be_loaded(self, tmp_path: Path) -> None:
+        """
+        Tests that generated metadata and survey data load as expected.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the survey.
+        """
+        settings: Settings = Settings()
+        generator: SurveyGenerator = SurveyGenerator(
+            settings, participants=30, questions=25, seed=3
+        )
+        (metadata_files, survey_data) = generator.write(tmp_path)
+
+        data: DataContainer = DataContainer(settings=settings)
+        MetadataLoader.load(
+            settings=settings, metadata_files=metadata_files, data=data
+        )
+        SurveyDataReader.read(
+            settings=settings, survey_data=survey_data, data=data
+        )
+
+        assert len(data.participant_ids) == 30, \
+            "Not all participants were loaded."
+        assert sum(len(collection.questions)
+                   for collection in data.survey_questions) == 25, \
+            "Not all questions were loaded."
+        for (kind, answer_type) in [
+            ("bool", bool), ("int", int), ("float", float), ("str", str)
+        ]:
+            question: Question = data.question_for_id(
+                generator.question_ids(kind)[0]
+            )
+            assert any(isinstance(answer, answer_type)
+                       for answer in question.answers.values()), \
+                f"Answers of {kind} questions have the wrong type."
+        del data
+        gc.collect()
+
+    @pytest.mark.ci
+    def test_generated_survey_is_reproducible(self, tmp_path: Path) -> None:
+        """
+        Tests that the same seed generates the same survey data.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the surveys.
+        """
+        settings: Settings = Settings()
+        surveys = []
+        for name in ["first", "second"]:
+            generator = SurveyGenerator(settings, 40, 12, seed=7)
+            (_, survey_data) = generator.write(tmp_path / name)
+            surveys.append(survey_data.read_text())
+        assert surveys[0] == surveys[1], "Survey data is not reproducible."
+
+    @pytest.mark.ci
+    def test_generator_rejects_too_few_questions(self) -> None:
+        """Tests that each kind of question must fit into the survey."""
+        with pytest.raises(ValueError):
+            SurveyGenerator(Settings(), 10, len(SurveyGenerator.KINDS) - 1)
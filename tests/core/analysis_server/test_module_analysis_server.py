@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module analysis_server."""
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+from _pytest.capture import CaptureFixture
+
+from hifis_surveyval.core.analysis_server import AnalysisServer
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.hifis_surveyval import HIFISSurveyval
+from tests.helper.data_container_helper.data_container_loader import \
+    DataContainerLoader
+
+METADATA_FILE: str = \
+    "tests/data_container/fixtures/metadata-seven-question-collections.yml"
+DATA_FILE: str = \
+    "tests/data_container/fixtures/test_data_for_module_data_container.csv"
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="The analysis server requires the fork start method"
+)
+class TestAnalysisServer(object):
+    """
+    Tests AnalysisServer operations.
+
+    Basic tests for class AnalysisServer are performed in unit test methods
+    of this class.
+    """
+
+    @pytest.mark.ci
+    def test_submitted_scripts_run_against_resident_data(
+        self, tmp_path: Path, capsys: CaptureFixture
+    ) -> None:
+        """
+        Tests that submitted scripts run isolated and report their outcome.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+            capsys (CaptureFixture):
+                Fixture provided by pytest to capture the console output.
+        """
+        settings: Settings = Settings()
+        settings.SERVER_SOCKET = tmp_path / "server.sock"
+        settings.OUTPUT_FOLDER = tmp_path / "output"
+        settings.ANALYSIS_OUTPUT_PATH = tmp_path / "output" / "server"
+        modifying: Path = tmp_path / "modifying.py"
+        modifying.write_text(
+            "def run(hifis_surveyval, data):\n"
+            "    data.question_for_id('Q003/SQ001').add_answer('4', '1')\n"
+            "    print('answers', len(data.participant_ids))\n"
+        )
+        failing: Path = tmp_path / "failing.py"
+        failing.write_text(
+            "def run(hifis_surveyval, data):\n"
+            "    raise RuntimeError('broken script')\n"
+        )
+
+        server: AnalysisServer = AnalysisServer(HIFISSurveyval(settings))
+        server.listen()
+        with pytest.raises(RuntimeError):
+            AnalysisServer(HIFISSurveyval(settings)).listen()
+
+        process = multiprocessing.get_context("fork").Process(
+            target=server.serve,
+            args=(DataContainerLoader.prepare_data_container(METADATA_FILE,
+                                                             DATA_FILE),),
+        )
+        process.start()
+        try:
+            assert AnalysisServer.submit(settings, modifying), \
+                "Script should have succeeded."
+            # Make sure that modifications of one script do not affect the
+            # scripts submitted later.
+            assert AnalysisServer.submit(settings, modifying), \
+                "Script should have succeeded."
+            assert capsys.readouterr().out == "answers 4\nanswers 4\n", \
+                "Console output was not streamed correctly."
+            assert not AnalysisServer.submit(settings, failing), \
+                "Failing script was not reported."
+        finally:
+            process.terminate()
+            process.join()
+            server.close()
+
+        assert not settings.SERVER_SOCKET.exists(), "Socket was not removed."
+        with pytest.raises(ConnectionError):
+            AnalysisServer.submit(settings, modifying)
@@ -0,0 +1,454 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module dispatch."""
+
+import json
+import logging
+import multiprocessing
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+from _pytest.capture import CaptureFixture
+from _pytest.logging import LogCaptureFixture
+
+from hifis_surveyval.core.dispatch import Dispatcher
+from hifis_surveyval.core.memory_report import MemoryStages
+from hifis_surveyval.core.run_cache import RunCache
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.tracer import Tracer
+from hifis_surveyval.hifis_surveyval import HIFISSurveyval
+from tests.helper.data_container_helper.data_container_loader import \
+    DataContainerLoader
+
+METADATA_FILE: str = \
+    "tests/data_container/fixtures/metadata-seven-question-collections.yml"
+DATA_FILE: str = \
+    "tests/data_container/fixtures/test_data_for_module_data_container.csv"
+
+SCRIPTS = {
+    "first": (
+        "import logging\n"
+        "def run(hifis_surveyval, data):\n"
+        "    data.question_for_id('Q003/SQ001').add_answer('4', '1')\n"
+        "    print('answers', len(data.participant_ids))\n"
+        "    logging.warning('first script done')\n"
+    ),
+    "second": (
+        "def run(hifis_surveyval, data):\n"
+        "    raise RuntimeError('broken script')\n"
+    ),
+    "third": (
+        "def run(hifis_surveyval, data):\n"
+        "    print('answers', len(data.participant_ids))\n"
+    ),
+}
+
+
+def create_dispatcher(
+    script_folder: Path,
+    workers: int,
+    scripts: Dict[str, str] = SCRIPTS,
+    output_path: Optional[Path] = None,
+    incremental: bool = False,
+) -> Dispatcher:
+    """
+    Set up a dispatcher for test scripts.
+
+    Args:
+        script_folder (Path): Folder into which the scripts are written.
+        workers (int): Amount of scripts to be run at the same time.
+        scripts (Dict[str, str]): The contents of the scripts by their names.
+        output_path (Optional[Path]): Folder for the outputs of the run.
+            Defaults to a sub-folder of the script folder.
+        incremental (bool): Whether to re-use outputs of previous runs.
+    Returns:
+        A dispatcher that discovered the test scripts in the given order.
+    """
+    for (name, content) in scripts.items():
+        (script_folder / f"{name}.py").write_text(content)
+    settings: Settings = Settings()
+    settings.SCRIPT_FOLDER = script_folder
+    settings.SCRIPT_NAMES = list(scripts.keys())
+    settings.SCRIPT_WORKERS = workers
+    settings.ANALYSIS_OUTPUT_PATH = output_path or script_folder / "output"
+    settings.CACHE_FOLDER = script_folder / "cache"
+    dispatcher: Dispatcher = Dispatcher(
+        surveyval=HIFISSurveyval(settings=settings),
+        data=DataContainerLoader.prepare_data_container(METADATA_FILE,
+                                                        DATA_FILE),
+        run_cache=RunCache(settings, "data") if incremental else None,
+    )
+    dispatcher.discover()
+    return dispatcher
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Parallel dispatch requires the fork start method"
+)
+class TestDispatcher(object):
+    """
+    Tests Dispatcher operations.
+
+    Basic tests for class Dispatcher are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_load_all_modules_in_workers_works(
+        self,
+        tmp_path: Path,
+        capsys: CaptureFixture,
+        caplog: LogCaptureFixture,
+    ) -> None:
+        """
+        Tests that scripts run in workers are reported one by one.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+            capsys (CaptureFixture):
+                Fixture provided by pytest to capture the console output.
+            caplog (LogCaptureFixture):
+                Fixture provided by pytest to capture log records.
+        """
+        dispatcher: Dispatcher = create_dispatcher(tmp_path, workers=2)
+        with caplog.at_level(logging.INFO):
+            dispatcher.load_all_modules()
+        # Make sure that the scripts were isolated from each other and their
+        # output is reported in the order of the scripts.
+        assert capsys.readouterr().out == "answers 4\nanswers 3\n", \
+            "Console output of the scripts is not correct."
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages.index("first script done") \
+            < messages.index("Module first finished.") \
+            < messages.index("Module second failed.") \
+            < messages.index("Module third finished."), \
+            "Scripts are not reported in order."
+        assert any("broken script" in (record.exc_text or "")
+                   for record in caplog.records), \
+            "Error of the failing script was not reported."
+        assert "1 of 3 modules failed: second" in messages, \
+            "Failed scripts are not summarized."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_results_are_passed_to_dependent_modules(
+        self, tmp_path: Path, capsys: CaptureFixture, workers: int
+    ) -> None:
+        """
+        Tests that results are computed once and passed to dependents.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+            capsys (CaptureFixture):
+                Fixture provided by pytest to capture the console output.
+            workers (int):
+                Amount of scripts to be run at the same time.
+        """
+        scripts = {
+            "a_consumer": (
+                "REQUIRES = ['frame']\n"
+                "def run(hifis_surveyval, data, results):\n"
+                "    results['frame'].loc['1', 'Q003/SQ001'] = 0\n"
+                "    print('consumer', results['frame'].sum().item())\n"
+            ),
+            "b_consumer": (
+                "REQUIRES = ['frame']\n"
+                "def run(hifis_surveyval, data, results):\n"
+                "    print('consumer', results['frame'].sum().item())\n"
+            ),
+            "c_producer": (
+                "PROVIDES = ['frame']\n"
+                "def run(hifis_surveyval, data):\n"
+                "    print('producer')\n"
+                "    return {'frame': data.data_frame_for_ids(['Q003'])}\n"
+            ),
+        }
+        dispatcher: Dispatcher = create_dispatcher(tmp_path, workers, scripts)
+        dispatcher.load_all_modules()
+        # Make sure that the producer runs once before its consumers and
+        # that the consumers do not affect each other.
+        assert capsys.readouterr().out == \
+            "producer\nconsumer 1245\nconsumer 1368\n", \
+            "Results were not passed on correctly."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_unchanged_modules_are_reused(
+        self, tmp_path: Path, capsys: CaptureFixture, workers: int
+    ) -> None:
+        """
+        Tests that outputs of unchanged modules are re-used in later runs.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+            capsys (CaptureFixture):
+                Fixture provided by pytest to capture the console output.
+            workers (int):
+                Amount of scripts to be run at the same time.
+        """
+        scripts = {
+            "writer": (
+                "def run(hifis_surveyval, data):\n"
+                "    print('writer')\n"
+                "    path = hifis_surveyval.settings.ANALYSIS_OUTPUT_PATH\n"
+                "    (path / 'table.csv').write_text('content')\n"
+            ),
+            "other": (
+                "def run(hifis_surveyval, data):\n"
+                "    print('other')\n"
+                "    path = hifis_surveyval.settings.ANALYSIS_OUTPUT_PATH\n"
+                "    (path / 'other.csv').write_text('other')\n"
+            ),
+        }
+        for run in ["first", "second"]:
+            create_dispatcher(
+                tmp_path, workers, scripts, tmp_path / run, incremental=True
+            ).load_all_modules()
+        # Make sure that the scripts ran only the first time, but their
+        # outputs are present in both runs.
+        assert capsys.readouterr().out == "writer\nother\n", \
+            "Unchanged scripts were run again."
+        assert (tmp_path / "second" / "table.csv").read_text() == "content", \
+            "Outputs were not re-used."
+
+        scripts["other"] += "# changed\n"
+        create_dispatcher(
+            tmp_path, workers, scripts, tmp_path / "third", incremental=True
+        ).load_all_modules()
+        # Make sure that only the changed script ran again.
+        assert capsys.readouterr().out == "other\n", \
+            "Only the changed script should run again."
+        assert sorted(path.name for path in (tmp_path / "third").iterdir()) \
+            == ["other.csv", "table.csv"], "Outputs are not correct."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_load_changed_modules_runs_affected_modules(
+        self, tmp_path: Path, capsys: CaptureFixture, workers: int
+    ) -> None:
+        """
+        Tests that changed modules are re-run with providers and dependents.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+            capsys (CaptureFixture):
+                Fixture provided by pytest to capture the console output.
+            workers (int):
+                Amount of scripts to be run at the same time.
+        """
+        scripts = {
+            "base": (
+                "PROVIDES = ['base']\n"
+                "def run(hifis_surveyval, data):\n"
+                "    print('base')\n"
+                "    return {'base': 1}\n"
+            ),
+            "middle": (
+                "PROVIDES = ['middle']\n"
+                "REQUIRES = ['base']\n"
+                "def run(hifis_surveyval, data, results):\n"
+                "    print('middle')\n"
+                "    return {'middle': results['base'] + 1}\n"
+            ),
+            "top": (
+                "REQUIRES = ['middle']\n"
+                "def run(hifis_surveyval, data, results):\n"
+                "    print('top', results['middle'])\n"
+            ),
+            "unrelated": (
+                "def run(hifis_surveyval, data):\n"
+                "    print('unrelated')\n"
+            ),
+        }
+        dispatcher: Dispatcher = create_dispatcher(tmp_path, workers, scripts)
+        dispatcher.load_changed_modules(["middle", "missing"])
+        # Make sure that the provider of the changed module runs to supply
+        # its results and the dependent runs since its input changed.
+        assert capsys.readouterr().out == "base\nmiddle\ntop 2\n", \
+            "Affected modules were not run correctly."
+
+        dispatcher.load_changed_modules(["unrelated"])
+        assert capsys.readouterr().out == "unrelated\n", \
+            "Only the changed module should run."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_profiles_are_reported(
+        self, tmp_path: Path, capsys: CaptureFixture, workers: int
+    ) -> None:
+        """
+        Tests that profiles of all modules are written and provided.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+            capsys (CaptureFixture):
+                Fixture provided by pytest to capture the console output.
+            workers (int):
+                Amount of scripts to be run at the same time.
+        """
+        scripts = {
+            name: SCRIPTS[name] for name in ["first", "third"]
+        }
+        dispatcher: Dispatcher = create_dispatcher(tmp_path, workers, scripts)
+        dispatcher.surveyval.settings.PROFILE_SCRIPTS = True
+        dispatcher.surveyval.settings.PROFILE_FUNCTIONS = True
+        dispatcher.load_all_modules()
+
+        output_path: Path = tmp_path / "output"
+        report = json.loads((output_path / "profile.json").read_text())
+        assert sorted(script["module"] for script in report["scripts"]) \
+            == ["first", "third"], "Profiled modules are not correct."
+        assert (output_path / "profiles" / "first.prof").exists(), \
+            "Statistics of cProfile were not written."
+        assert sorted(profile.module_name for profile in dispatcher.profiles) \
+            == ["first", "third"], "Provided profiles are not correct."
+        # Make sure that the summary is left to the command line interface.
+        assert "Slowest scripts:" not in capsys.readouterr().out, \
+            "Profiles were printed by the dispatcher."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_spans_of_modules_are_traced(
+        self, tmp_path: Path, workers: int
+    ) -> None:
+        """
+        Tests that a span is recorded for each module, also in workers.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+            workers (int):
+                Amount of scripts to be run at the same time.
+        """
+        scripts = {
+            name: SCRIPTS[name] for name in ["first", "third"]
+        }
+        dispatcher: Dispatcher = create_dispatcher(tmp_path, workers, scripts)
+        Tracer.enable()
+        try:
+            dispatcher.load_all_modules()
+            spans = Tracer.take_events()
+        finally:
+            Tracer.disable()
+
+        assert sorted(span["name"] for span in spans
+                      if span["cat"] == "scripts") == ["first", "third"], \
+            "Modules were not traced."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_memory_of_workers_is_sampled(
+        self, tmp_path: Path, workers: int
+    ) -> None:
+        """
+        Tests that workers report their memory peak to the memory stage.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+            workers (int):
+                Amount of scripts to be run at the same time.
+        """
+        scripts = {
+            name: SCRIPTS[name] for name in ["first", "third"]
+        }
+        dispatcher: Dispatcher = create_dispatcher(tmp_path, workers, scripts)
+        dispatcher.surveyval.settings.PROFILE_SCRIPTS = True
+        dispatcher.surveyval.settings.PROFILE_MEMORY = True
+        MemoryStages.enable()
+        try:
+            with MemoryStages.stage("analysis scripts"):
+                dispatcher.load_all_modules()
+            stages = MemoryStages.take_stages()
+        finally:
+            MemoryStages.disable()
+
+        worker_peak: Optional[int] = stages[0]["worker_peak"]
+        if workers == 1:
+            assert worker_peak is None, \
+                "A worker peak was recorded without workers."
+        else:
+            assert worker_peak is not None and worker_peak > 0, \
+                "Peaks of the workers were not recorded."
+
+    @pytest.mark.ci
+    @pytest.mark.skipif(
+        not sys.platform.startswith("linux"),
+        reason="Memory limits are only reliably enforced on Linux"
+    )
+    def test_modules_exceeding_limits_are_stopped(
+        self,
+        tmp_path: Path,
+        capsys: CaptureFixture,
+        caplog: LogCaptureFixture,
+    ) -> None:
+        """
+        Tests that modules exceeding their limits fail while others continue.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+            capsys (CaptureFixture):
+                Fixture provided by pytest to capture the console output.
+            caplog (LogCaptureFixture):
+                Fixture provided by pytest to capture log records.
+        """
+        scripts = {
+            "looping": (
+                "TIMEOUT = 0.5\n"
+                "def run(hifis_surveyval, data):\n"
+                "    while True:\n"
+                "        pass\n"
+            ),
+            "allocating": (
+                "MEMORY_LIMIT = 100\n"
+                "def run(hifis_surveyval, data):\n"
+                "    print('allocating')\n"
+                "    blocks = [bytearray(2**20) for _ in range(1000)]\n"
+                "    print('allocated', len(blocks))\n"
+            ),
+            "third": SCRIPTS["third"],
+        }
+        dispatcher: Dispatcher = create_dispatcher(tmp_path, 1, scripts)
+        dispatcher.load_all_modules()
+
+        assert capsys.readouterr().out == "allocating\nanswers 3\n", \
+            "Modules were not run as expected."
+        messages = [record.getMessage() for record in caplog.records]
+        assert "Module looping exceeded its time limit of 0.5 seconds and " \
+               "was stopped." in messages, "Time limit was not enforced."
+        assert "Module allocating exceeded its memory limit of 100 MiB." \
+            in messages, "Memory limit was not enforced."
+        assert "2 of 3 modules failed: looping, allocating" in messages, \
+            "Failed scripts are not summarized."
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module file_watcher."""
+
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+from hifis_surveyval.core.file_watcher import FileWatcher
+from hifis_surveyval.core.settings import Settings
+
+
+def create_watcher(folder: Path) -> FileWatcher:
+    """
+    Set up a watcher for a script folder and a preprocessing script.
+
+    Args:
+        folder (Path): Folder holding the scripts folder and preprocessing
+            script.
+    Returns:
+        A watcher for the scripts created in the given folder.
+    """
+    script_folder: Path = folder / "scripts"
+    script_folder.mkdir()
+    (script_folder / "first.py").write_text("print('first')\n")
+    (script_folder / "notes.txt").write_text("not a script\n")
+    (folder / "preprocess.py").write_text("print('preprocess')\n")
+    settings: Settings = Settings()
+    settings.SCRIPT_FOLDER = script_folder
+    settings.PREPROCESSING_FILENAME = folder / "preprocess.py"
+    return FileWatcher(settings=settings)
+
+
+class TestFileWatcher(object):
+    """
+    Tests FileWatcher operations.
+
+    Basic tests for class FileWatcher are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_changed_files_reports_changes(self, tmp_path: Path) -> None:
+        """
+        Tests that modified, added and removed scripts are reported once.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+        """
+        watcher: FileWatcher = create_watcher(tmp_path)
+        assert watcher.changed_files() == [], \
+            "Existing files must not be reported as changed."
+
+        first: Path = tmp_path / "scripts" / "first.py"
+        status = first.stat()
+        os.utime(first, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+        (tmp_path / "scripts" / "second.py").write_text("print('second')\n")
+        (tmp_path / "scripts" / "other.txt").write_text("ignored\n")
+        (tmp_path / "preprocess.py").unlink()
+        assert watcher.changed_files() == [
+            tmp_path / "preprocess.py",
+            first,
+            tmp_path / "scripts" / "second.py",
+        ], "Changes were not detected correctly."
+        assert watcher.changed_files() == [], \
+            "Changes must only be reported once."
+
+    @pytest.mark.ci
+    def test_changed_files_removes_outdated_byte_code(
+        self, tmp_path: Path
+    ) -> None:
+        """
+        Tests that compiled byte code of changed scripts is removed.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the scripts.
+        """
+        watcher: FileWatcher = create_watcher(tmp_path)
+        first: Path = tmp_path / "scripts" / "first.py"
+        byte_code: Path = Path(importlib.util.cache_from_source(str(first)))
+        byte_code.parent.mkdir()
+        byte_code.write_bytes(b"outdated")
+
+        first.write_text("print('changed first')\n")
+        assert watcher.wait_for_changes(interval=0.01) == [first], \
+            "Change was not detected."
+        assert not byte_code.exists(), "Outdated byte code was not removed."
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module memory_report."""
+
+import json
+import sys
+from pathlib import Path
+from typing import Set
+
+import numpy
+import pytest
+
+from hifis_surveyval.core.memory_report import (
+    MemoryReport,
+    MemoryStages,
+    MemoryUsage,
+    deep_size,
+)
+from hifis_surveyval.core.settings import Settings
+
+
+class TestDeepSize(object):
+    """
+    Tests deep_size operations.
+
+    Basic tests for function deep_size are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_shared_objects_are_counted_once(self) -> None:
+        """Tests that objects referenced twice are only counted once."""
+        shared: numpy.ndarray = numpy.zeros(1000)
+        seen: Set[int] = set()
+        size: int = deep_size([shared, shared[:10], shared], seen)
+        assert shared.nbytes < size < 2 * shared.nbytes, \
+            "Shared array was not counted exactly once."
+        assert deep_size(shared, seen) == 0, \
+            "Objects already seen must not be counted again."
+
+    @pytest.mark.ci
+    def test_elements_of_object_arrays_are_counted(self) -> None:
+        """Tests that the objects held in object arrays are counted."""
+        texts: numpy.ndarray = numpy.array(
+            [f"answer {index}" * 10 for index in range(100)], dtype=object
+        )
+        assert deep_size(texts, set()) >= sys.getsizeof(texts) + sum(
+            sys.getsizeof(text) for text in texts
+        ), "Elements of the array were not counted."
+
+
+class TestMemoryReport(object):
+    """
+    Tests MemoryReport operations.
+
+    Basic tests for class MemoryReport are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_report_is_written_with_stages(self, tmp_path: Path) -> None:
+        """
+        Tests that the report and the sampled stages are written.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the report.
+        """
+        MemoryStages.enable()
+        try:
+            with MemoryStages.stage("allocating"):
+                allocated = [bytes(2**20) for _ in range(4)]
+            stages = MemoryStages.take_stages()
+        finally:
+            MemoryStages.disable()
+        del allocated
+
+        report: MemoryReport = MemoryReport(
+            container=MemoryUsage("data container", {"answers": 2**20}),
+            collections=[
+                MemoryUsage("small", {"metadata": 10}, parts=[
+                    MemoryUsage("small/question", {"answers": 100})
+                ]),
+                MemoryUsage("large", {"translations": 2**21}),
+            ],
+        )
+        settings: Settings = Settings()
+        settings.ANALYSIS_OUTPUT_PATH = tmp_path
+        report.write(settings, stages)
+
+        written = json.loads((tmp_path / MemoryReport.JSON_FILE).read_text())
+        assert written["stages"][0]["stage"] == "allocating" \
+            and written["stages"][0]["peak"] >= 4 * 2**20, \
+            "Peak memory of the stage was not sampled."
+        totals = written["container"]
+        assert (totals["total"], totals["answers"]) \
+            == (2**20 + 10 + 100 + 2**21, 2**20 + 100), \
+            "Totals are not correct."
+        lines = (tmp_path / MemoryReport.TEXT_FILE).read_text().splitlines()
+        collections = lines.index("Largest collections [MiB]:")
+        assert lines[collections + 2].endswith("large"), \
+            "Collections are not ordered by size."
+
+
+class TestMemoryStages(object):
+    """
+    Tests MemoryStages operations.
+
+    Basic tests for class MemoryStages are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_peak_is_kept_when_reset(self) -> None:
+        """Tests that resetting the peak within a stage keeps its peak."""
+        MemoryStages.enable()
+        try:
+            with MemoryStages.stage("allocating"):
+                allocated = bytes(8 * 2**20)
+                del allocated
+                MemoryStages.reset_peak()
+                MemoryStages.add_worker_peak(2**20)
+            stages = MemoryStages.take_stages()
+        finally:
+            MemoryStages.disable()
+
+        assert stages[0]["peak"] >= 8 * 2**20, \
+            "Peak before the reset was lost."
+        assert stages[0]["worker_peak"] == 2**20, \
+            "Peak of the worker was not recorded."
+        assert "Worker peak is the largest peak" \
+            in MemoryStages.summary(stages), \
+            "Worker peaks are not explained in the summary."
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module metadata_cache."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from hifis_surveyval.core.metadata_cache import MetadataCache
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.models.mixins.yaml_constructable import YamlList
+
+METADATA_FILE: str = \
+    "tests/data_container/fixtures/metadata-seven-question-collections.yml"
+
+
+class TestMetadataCache(object):
+    """
+    Tests MetadataCache operations.
+
+    Basic tests for class MetadataCache are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_unchanged_file_is_not_parsed_again(self, tmp_path: Path) -> None:
+        """
+        Tests that a cached metadata file is not parsed a second time.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest.
+        """
+        metadata_file: Path = tmp_path / "metadata.yml"
+        shutil.copy(METADATA_FILE, metadata_file)
+        settings: Settings = Settings()
+        settings.CACHE_FOLDER = tmp_path / "cache"
+
+        parsed: YamlList = MetadataCache.load(settings, metadata_file)
+        cached: YamlList = MetadataCache.load(settings, metadata_file)
+        # Make sure that the validated data is complete and equal and that
+        # defaults have been filled in.
+        assert len(parsed) == 7, "Not all collections were loaded."
+        assert cached == parsed, "Cached metadata is not equal."
+        assert "mandatory" in cached[0], "Metadata has not been validated."
+
+    @pytest.mark.ci
+    def test_changed_file_is_parsed_again(self, tmp_path: Path) -> None:
+        """
+        Tests that changing a metadata file invalidates the cached data.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest.
+        """
+        metadata_file: Path = tmp_path / "metadata.yml"
+        shutil.copy(METADATA_FILE, metadata_file)
+        settings: Settings = Settings()
+        settings.CACHE_FOLDER = tmp_path / "cache"
+
+        MetadataCache.load(settings, metadata_file)
+        metadata_file.write_text(
+            "- id: Q999\n  label: Changed\n  text:\n    en: Changed\n",
+            encoding="utf-8",
+        )
+        reloaded: YamlList = MetadataCache.load(settings, metadata_file)
+        assert [collection["id"] for collection in reloaded] == ["Q999"], \
+            "Changed metadata was not parsed again."
+
+    @pytest.mark.ci
+    def test_invalid_file_is_not_cached(self, tmp_path: Path) -> None:
+        """
+        Tests that metadata with invalid collections are not cached.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest.
+        """
+        metadata_file: Path = tmp_path / "metadata.yml"
+        metadata_file.write_text(
+            "- id: Q001\n  label: Valid\n  text:\n    en: Valid\n"
+            "- id: Q002\n  label: No text\n",
+            encoding="utf-8",
+        )
+        settings: Settings = Settings()
+        settings.CACHE_FOLDER = tmp_path / "cache"
+
+        loaded: YamlList = MetadataCache.load(settings, metadata_file)
+        # Make sure that only the valid collection is given and nothing is
+        # cached.
+        assert [collection["id"] for collection in loaded] == ["Q001"], \
+            "Invalid collection was not left out."
+        assert not settings.CACHE_FOLDER.exists(), \
+            "Invalid metadata was cached."
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module metadata_loader."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+import yaml
+
+from hifis_surveyval.core.metadata_loader import MetadataLoader
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.data_container import DataContainer
+
+
+def write_metadata_files(
+    folder: Path, collection_ids: List[str]
+) -> List[Path]:
+    """
+    Write one metadata file per given question collection ID.
+
+    Args:
+        folder (Path):
+            The folder to write the files into.
+        collection_ids (List[str]):
+            The IDs of the question collections to be defined.
+
+    Returns:
+        List[Path]: The written files in the order of the given IDs.
+    """
+    files: List[Path] = []
+    for collection_id in collection_ids:
+        metadata_file: Path = folder / f"{collection_id}.yml"
+        metadata_file.write_text(
+            f"- id: {collection_id}\n  label: Label\n  text:\n"
+            f"    en: Text\n",
+            encoding="utf-8",
+        )
+        files.append(metadata_file)
+    return files
+
+
+class TestMetadataLoader(object):
+    """
+    Tests MetadataLoader operations.
+
+    Basic tests for class MetadataLoader are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize("worker_count", [1, 2])
+    def test_load_keeps_file_order(
+        self, tmp_path: Path, worker_count: int
+    ) -> None:
+        """
+        Tests that metadata files are loaded in the given order.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest.
+            worker_count (int):
+                The amount of worker processes to be used.
+        """
+        expected_ids: List[str] = ["Z01", "A02", "M03"]
+        settings: Settings = Settings()
+        settings.METADATA_WORKERS = worker_count
+        data_container: DataContainer = DataContainer(settings)
+        MetadataLoader.load(
+            settings,
+            write_metadata_files(tmp_path, expected_ids),
+            data_container,
+        )
+        assert data_container.question_collection_ids == expected_ids, \
+            "Metadata files were not loaded in the given order."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize("worker_count", [1, 2])
+    def test_load_reports_parse_errors(
+        self, tmp_path: Path, worker_count: int
+    ) -> None:
+        """
+        Tests that a file with invalid YAML prevents loading any metadata.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest.
+            worker_count (int):
+                The amount of worker processes to be used.
+        """
+        files: List[Path] = write_metadata_files(tmp_path, ["Q01", "Q02"])
+        files[1].write_text("- id: [unclosed\n", encoding="utf-8")
+        settings: Settings = Settings()
+        settings.METADATA_WORKERS = worker_count
+        data_container: DataContainer = DataContainer(settings)
+        with pytest.raises(yaml.YAMLError):
+            MetadataLoader.load(settings, files, data_container)
+        assert not data_container.question_collection_ids, \
+            "Metadata was loaded despite a parse error."
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module run_cache."""
+
+from pathlib import Path
+
+import pytest
+
+from hifis_surveyval.core.run_cache import RunCache
+from hifis_surveyval.core.settings import Settings
+
+METADATA_FILE: Path = Path(
+    "tests/data_container/fixtures/metadata-seven-question-collections.yml"
+)
+DATA_FILE: Path = Path(
+    "tests/data_container/fixtures/test_data_for_module_data_container.csv"
+)
+
+
+class TestRunCache(object):
+    """
+    Tests RunCache operations.
+
+    Basic tests for class RunCache are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_data_fingerprint_depends_on_preprocessing(
+        self, tmp_path: Path
+    ) -> None:
+        """
+        Tests that changing the preprocessing script changes the fingerprint.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the script.
+        """
+        settings: Settings = Settings()
+        settings.PREPROCESSING_FILENAME = tmp_path / "preprocess.py"
+        settings.PREPROCESSING_FILENAME.write_text("# first version\n")
+        before: str = RunCache.data_fingerprint_for(
+            settings, DATA_FILE, [METADATA_FILE]
+        )
+        settings.PREPROCESSING_FILENAME.write_text("# second version\n")
+        after: str = RunCache.data_fingerprint_for(
+            settings, DATA_FILE, [METADATA_FILE]
+        )
+        # Make sure that the preprocessing affects the fingerprint.
+        assert before != after, "Fingerprint did not change."
+
+    @pytest.mark.ci
+    def test_reusable_outputs_works(self, tmp_path: Path) -> None:
+        """
+        Tests that outputs are only re-used if the script did not change.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the outputs.
+        """
+        script: Path = tmp_path / "script.py"
+        script.write_text("def run(hifis_surveyval, data): pass\n")
+        settings: Settings = Settings()
+        settings.CACHE_FOLDER = tmp_path / "cache"
+        settings.ANALYSIS_OUTPUT_PATH = tmp_path / "first"
+
+        first_run: RunCache = RunCache(settings, "data")
+        first_run.fingerprint("script", script, [])
+        first_run.staging_path("script").mkdir(parents=True)
+        (first_run.staging_path("script") / "plot.png").write_text("plot")
+        first_run.collect("script", succeeded=True)
+        first_run.save()
+
+        settings.ANALYSIS_OUTPUT_PATH = tmp_path / "second"
+        second_run: RunCache = RunCache(settings, "data")
+        second_run.fingerprint("script", script, [])
+        # Make sure that the output of the unchanged script can be re-used.
+        assert second_run.reusable_outputs("script") == \
+            [(tmp_path / "first" / "plot.png").resolve()], \
+            "Outputs are not re-usable."
+
+        third_run: RunCache = RunCache(settings, "changed data")
+        third_run.fingerprint("script", script, [])
+        # Make sure that changed inputs prevent re-using outputs.
+        assert third_run.reusable_outputs("script") is None, \
+            "Outputs of changed script are re-usable."
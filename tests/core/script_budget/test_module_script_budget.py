@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module script_budget."""
+
+from pathlib import Path
+
+import pytest
+
+from hifis_surveyval.core.script_budget import ScriptBudget
+from hifis_surveyval.core.settings import Settings
+
+
+class TestScriptBudget(object):
+    """
+    Tests ScriptBudget operations.
+
+    Basic tests for class ScriptBudget are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "source, timeout, memory_limit",
+        [
+            ("def run(hifis_surveyval, data):\n    pass\n", 60, None),
+            ("TIMEOUT = 0\nMEMORY_LIMIT: int = 512\n", None, 512),
+            ("TIMEOUT = 1.5\n", 1.5, None),
+            ("def broken(:\n", 60, None),
+        ],
+    )
+    def test_for_module_prefers_declared_limits(
+        self,
+        tmp_path: Path,
+        source: str,
+        timeout: float,
+        memory_limit: int,
+    ) -> None:
+        """
+        Tests that declared limits take precedence over the settings.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the script.
+            source (str):
+                The source code of the script.
+            timeout (float):
+                The expected time limit.
+            memory_limit (int):
+                The expected memory limit.
+        """
+        settings: Settings = Settings()
+        settings.SCRIPT_TIMEOUT = 60
+        script: Path = tmp_path / "script.py"
+        script.write_text(source)
+
+        budget: ScriptBudget = ScriptBudget.for_module(settings, script)
+        assert (budget.timeout, budget.memory_limit) \
+            == (timeout, memory_limit), "Limits were not read correctly."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "source", ["TIMEOUT = -1\n", "MEMORY_LIMIT = '1 GiB'\n",
+                   "TIMEOUT = compute()\n"]
+    )
+    def test_for_module_rejects_invalid_limits(
+        self, tmp_path: Path, source: str
+    ) -> None:
+        """
+        Tests that limits which are not non-negative numbers are rejected.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the script.
+            source (str):
+                The source code of the script.
+        """
+        script: Path = tmp_path / "script.py"
+        script.write_text(source)
+
+        with pytest.raises(ValueError):
+            ScriptBudget.for_module(Settings(), script)
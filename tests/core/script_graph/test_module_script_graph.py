@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module script_graph."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from hifis_surveyval.core.script_graph import ScriptGraph
+
+
+class TestScriptGraph(object):
+    """
+    Tests ScriptGraph operations.
+
+    Basic tests for class ScriptGraph are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_read_declarations_works(self, tmp_path: Path) -> None:
+        """
+        Tests that declarations are read without executing the script.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the script.
+        """
+        script: Path = tmp_path / "script.py"
+        script.write_text(
+            "raise RuntimeError('must not be executed')\n"
+            "PROVIDES = ['first', 'second']\n"
+            "REQUIRES: tuple = ('third',)\n"
+        )
+        # Make sure that both declarations are read.
+        assert ScriptGraph.read_declarations(script) == \
+            (["first", "second"], ["third"]), "Declarations are not correct."
+
+        script.write_text("REQUIRES = [name for name in 'abc']\n")
+        # Make sure that declarations must be literals.
+        with pytest.raises(ValueError):
+            ScriptGraph.read_declarations(script)
+
+    @pytest.mark.ci
+    def test_order_works(self) -> None:
+        """Tests that scripts are ordered by their dependencies."""
+        graph: ScriptGraph = ScriptGraph()
+        graph.add("report", provides=[], requires=["frame"])
+        graph.add("plain", provides=[], requires=[])
+        graph.add("producer", provides=["frame"], requires=[])
+        graph.add("unknown", provides=[], requires=["missing"])
+        graph.add("dependent", provides=[], requires=["unknown_frame"])
+        graph.add("cycle_a", provides=["a"], requires=["b"])
+        graph.add("cycle_b", provides=["b"], requires=["a"])
+        order: List[str] = graph.order()
+        # Make sure that producers come first and that scripts with unmet
+        # requirements are left out, while the discovery order is kept
+        # otherwise.
+        assert order == ["plain", "producer", "report"], \
+            "Order of scripts is not correct."
+        assert graph.dependencies("report") == {"producer"}, \
+            "Dependencies are not correct."
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module script_profiler."""
+
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from hifis_surveyval.core.script_profiler import (
+    ProfileReport,
+    ScriptProfile,
+    ScriptProfiler,
+)
+from hifis_surveyval.core.settings import Settings
+
+
+def busy_function() -> int:
+    """
+    Spend some time and memory for the profiler to measure.
+
+    Returns:
+        The length of a list of several megabytes.
+    """
+    return len([index * index for index in range(200000)])
+
+
+class TestScriptProfiler(object):
+    """
+    Tests ScriptProfiler operations.
+
+    Basic tests for class ScriptProfiler are performed in unit test methods
+    of this class.
+    """
+
+    @pytest.mark.ci
+    def test_profiler_measures_script(self, tmp_path: Path) -> None:
+        """
+        Tests that time, memory and the slowest functions are measured.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the statistics.
+        """
+        dump: Path = tmp_path / "profiles" / "busy.prof"
+        with pytest.raises(RuntimeError):
+            with ScriptProfiler("busy", dump, trace_memory=True) as profiler:
+                busy_function()
+                raise RuntimeError("failed script")
+
+        profile: ScriptProfile = profiler.profile
+        assert profile.wall_time > 0 and profile.cpu_time > 0, \
+            "Time was not measured."
+        assert profile.peak_memory > 10**6, "Peak memory was not measured."
+        assert any("busy_function" in function["function"]
+                   for function in profile.functions[:2]), \
+            "Slowest function was not found."
+        assert dump.exists(), "Statistics of cProfile were not written."
+
+    @pytest.mark.ci
+    def test_memory_is_only_traced_on_request(self) -> None:
+        """Tests that memory is not traced unless requested."""
+        with ScriptProfiler("busy") as profiler:
+            assert not tracemalloc.is_tracing(), \
+                "Memory was traced without being requested."
+            busy_function()
+
+        assert profiler.profile.peak_memory is None, \
+            "Peak memory was reported without being traced."
+        summary: str = ProfileReport.summary([profiler.profile])
+        assert summary.splitlines()[0] == "Slowest scripts:" \
+            and summary.splitlines()[2].split()[2] == "-", \
+            "Untraced memory was not left out of the summary."
+
+    @pytest.mark.ci
+    def test_report_lists_slowest_scripts_first(self, tmp_path: Path) -> None:
+        """
+        Tests that the report is written ordered by wall time.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the report.
+        """
+        settings: Settings = Settings()
+        settings.ANALYSIS_OUTPUT_PATH = tmp_path
+        profiles = [
+            ScriptProfile("fast", 0.5, 0.4, 2**20),
+            ScriptProfile("slow", 2.0, 1.5, 2**21),
+        ]
+        ProfileReport.write(settings, profiles)
+
+        report = json.loads((tmp_path / ProfileReport.JSON_FILE).read_text())
+        assert [script["module"] for script in report["scripts"]] \
+            == ["slow", "fast"], "Scripts are not ordered by wall time."
+        lines = (tmp_path / ProfileReport.TEXT_FILE).read_text().splitlines()
+        assert lines[2].split() == ["2.000", "1.500", "2.0", "slow"], \
+            "Text summary is not correct."
+        assert ProfileReport.summary(profiles, count=1).count("\n") == 3, \
+            "Summary must be limited to the given count."
@@ -32,6 +32,7 @@ from typing import List
 import pytest
 
 from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.supported_csv_engine import SupportedCsvEngine
 from hifis_surveyval.plotting.supported_output_format import (
     SupportedOutputFormat,
 )
@@ -171,6 +172,24 @@ class TestModuleSettings(object):
             settings.OUTPUT_FORMAT == expected_output_format
         ), "Value of output format set is not correct."
 
+    @pytest.mark.ci
+    def test_load_config_file_check_csv_engine(
+        self, settings_custom_config_fixture: Settings
+    ):
+        """
+        Tests that loading a config file with custom CSV engine works.
+
+        Args:
+            settings_custom_config_fixture (Settings):
+                New Settings object containing all settings of an analysis run.
+        """
+        expected_csv_engine: SupportedCsvEngine = SupportedCsvEngine.PANDAS
+        settings: Settings = settings_custom_config_fixture
+        # Assure that loaded custom CSV engine is as expected.
+        assert (
+            settings.CSV_ENGINE == expected_csv_engine
+        ), "Value of CSV engine set is not correct."
+
     @pytest.mark.ci
     def test_load_config_file_check_scripts_folder(
         self, settings_custom_config_fixture: Settings
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module snapshot_cache."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+from pandas import DataFrame
+
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.snapshot_cache import SnapshotCache
+from hifis_surveyval.data_container import DataContainer
+from tests.helper.data_container_helper.data_container_loader import \
+    DataContainerLoader
+
+METADATA_FILE: str = \
+    "tests/data_container/fixtures/metadata-seven-question-collections.yml"
+DATA_FILE: str = \
+    "tests/data_container/fixtures/test_data_for_module_data_container.csv"
+
+
+@pytest.mark.skipif(
+    not SnapshotCache.is_supported(),
+    reason="Snapshots require pickle protocol 5"
+)
+class TestSnapshotCache(object):
+    """
+    Tests SnapshotCache operations.
+
+    Basic tests for class SnapshotCache are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_store_and_load_works(self, tmp_path: Path) -> None:
+        """
+        Tests that a restored data container holds the same data.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest to store the snapshot in.
+        """
+        data_container: DataContainer = \
+            DataContainerLoader.prepare_data_container(METADATA_FILE,
+                                                       DATA_FILE)
+        settings: Settings = Settings()
+        settings.CACHE_FOLDER = tmp_path
+        key: str = SnapshotCache.key_for(
+            settings, Path(DATA_FILE), [Path(METADATA_FILE)]
+        )
+        SnapshotCache.store(settings, key, data_container)
+        restored: DataContainer = SnapshotCache.load(settings, key)
+
+        requested_ids: List[str] = ["Q002/SQ001", "Q003/SQ001"]
+        expected_frame: DataFrame = \
+            data_container.data_frame_for_ids(requested_ids)
+        actual_frame: DataFrame = restored.data_frame_for_ids(requested_ids)
+        # Make sure that the data is restored and uses the current settings.
+        assert actual_frame.equals(expected_frame), \
+            "Expected and actual DataFrames are not equal."
+        assert restored.question_for_id("Q003/SQ001")._settings is settings, \
+            "Restored objects do not use the current settings."
+
+    @pytest.mark.ci
+    def test_key_depends_on_settings(self) -> None:
+        """Tests that changing relevant settings changes the snapshot key."""
+        settings: Settings = Settings()
+        original_key: str = SnapshotCache.key_for(
+            settings, Path(DATA_FILE), [Path(METADATA_FILE)]
+        )
+        settings.TRUE_VALUES = {"Sure"}
+        changed_key: str = SnapshotCache.key_for(
+            settings, Path(DATA_FILE), [Path(METADATA_FILE)]
+        )
+        assert original_key != changed_key, "Snapshot key did not change."
+
+    @pytest.mark.ci
+    def test_load_without_snapshot_returns_none(self, tmp_path: Path) -> None:
+        """
+        Tests that loading a snapshot which does not exist gives None.
+
+        Args:
+            tmp_path (Path):
+                Temporary folder provided by pytest as empty cache folder.
+        """
+        settings: Settings = Settings()
+        settings.CACHE_FOLDER = tmp_path
+        assert SnapshotCache.load(settings, "unknown") is None, \
+            "Loading a missing snapshot did not give None."
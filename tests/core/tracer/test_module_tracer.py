@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module tracer."""
+
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from hifis_surveyval.core.tracer import Tracer
+
+
+@Tracer.traced("testing")
+def traced_function(value: int) -> int:
+    """
+    Stand in for a stage of the pipeline.
+
+    Args:
+        value:
+            The value to be returned.
+    Returns:
+        The given value.
+    """
+    return value
+
+
+@pytest.fixture
+def tracing() -> Iterator[None]:
+    """Enable tracing for a test and disable it afterwards."""
+    Tracer.enable()
+    yield
+    Tracer.disable()
+
+
+class TestTracer(object):
+    """
+    Tests Tracer operations.
+
+    Basic tests for class Tracer are performed in unit test methods of this
+    class.
+    """
+
+    @pytest.mark.ci
+    def test_disabled_tracer_records_nothing(self) -> None:
+        """Tests that spans are not recorded while tracing is disabled."""
+        with Tracer.span("stage", "testing"):
+            assert traced_function(3) == 3, "Return value was lost."
+        assert not Tracer.take_events(), "Spans were recorded."
+
+    @pytest.mark.ci
+    def test_spans_are_exported(self, tracing: None, tmp_path: Path) -> None:
+        """
+        Tests that nested spans are written as Chrome trace events.
+
+        Args:
+            tracing (None):
+                Fixture enabling tracing during the test.
+            tmp_path (Path):
+                Temporary folder provided by pytest to hold the trace.
+        """
+        with pytest.raises(ValueError):
+            with Tracer.span("stage", "testing", rows=10):
+                traced_function(3)
+                raise ValueError("failed stage")
+        Tracer.write(tmp_path / "trace.json")
+
+        events = json.loads((tmp_path / "trace.json").read_text())[
+            "traceEvents"
+        ]
+        spans = {event["name"]: event for event in events
+                 if event["ph"] == "X"}
+        assert set(spans) == {"stage", "traced_function"}, \
+            "Spans were not recorded."
+        (outer, inner) = (spans["stage"], spans["traced_function"])
+        assert outer["ts"] <= inner["ts"] and \
+            inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"], \
+            "Inner span is not nested in the outer one."
+        assert outer["args"] == {"rows": 10, "error": "ValueError"}, \
+            "Arguments of the span were not recorded."
+        assert any(event["ph"] == "M" for event in events), \
+            "Process name is missing."
@@ -24,12 +24,16 @@
 
 """Provide pytest test cases for module data_container."""
 
+from pathlib import Path
 from typing import Dict, List, Optional, Union
 
 import pytest
-from pandas import DataFrame
+from pandas import DataFrame, Series
 
+from hifis_surveyval.core.memory_report import MemoryReport, MemoryUsage
 from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.core.supported_csv_engine import SupportedCsvEngine
+from hifis_surveyval.core.survey_data_reader import SurveyDataReader
 from hifis_surveyval.data_container import DataContainer
 from hifis_surveyval.models.answer_option import AnswerOption
 from hifis_surveyval.models.mixins.yaml_constructable import YamlDict, YamlList
@@ -956,3 +960,524 @@ class TestDataContainer(object):
         # Make sure that expected and actual DataFrames are equal.
         assert actual_frame.equals(expected_frame), \
             "Expected and actual DataFrames are not equal."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    def test_participant_index_is_shared(
+        self, data_container_load_metadata_and_data_fixture: DataContainer
+    ) -> None:
+        """
+        Tests that all answer series are indexed by the same index object.
+
+        Args:
+            data_container_load_metadata_and_data_fixture (DataContainer):
+                Fixture that provides a DataContainer containing metadata and
+                data.
+        """
+        data_container: DataContainer = \
+            data_container_load_metadata_and_data_fixture
+        first_series: Series = \
+            data_container.question_for_id("Q002/SQ001").as_series()
+        second_series: Series = \
+            data_container.question_for_id("Q003/SQ001").as_series()
+        # Make sure that the participant IDs are kept in order and that the
+        # answer series do not carry indexes of their own.
+        assert list(data_container.participant_index) == ["1", "2", "3"], \
+            "Participant index is not correct."
+        assert first_series.index is data_container.participant_index, \
+            "Series index is not the shared participant index."
+        assert second_series.index is data_container.participant_index, \
+            "Series index is not the shared participant index."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    def test_data_frame_for_ids_works_after_removing_answers(
+        self, data_container_load_metadata_and_data_fixture: DataContainer
+    ) -> None:
+        """
+        Tests that participants with removed answers are left out of frames.
+
+        Args:
+            data_container_load_metadata_and_data_fixture (DataContainer):
+                Fixture that provides a DataContainer containing metadata and
+                data.
+        """
+        expected_data_dict = {"id": ["1", "3"],
+                              "Q002/SQ001": ["Option1", "Option3"],
+                              "Q003/SQ001": [123, 789]}
+        expected_frame: DataFrame = DataStructureCreator. \
+            create_dataframe_from_dict(expected_data_dict)
+        data_container: DataContainer = \
+            data_container_load_metadata_and_data_fixture
+        data_container.mark_answers_invalid({"2"})
+        data_container.remove_invalid_answer_sets()
+        actual_frame: DataFrame = \
+            data_container.data_frame_for_ids(["Q002/SQ001", "Q003/SQ001"])
+        # Make sure that expected and actual DataFrames are equal.
+        assert actual_frame.equals(expected_frame), \
+            "Expected and actual DataFrames are not equal."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    def test_load_survey_data_in_chunks_works(
+        self,
+        data_container_load_metadata_fixture: DataContainer,
+        read_in_data_csv_file: List[List[str]],
+    ) -> None:
+        """
+        Tests that loading survey data from a stream of rows works.
+
+        Args:
+            data_container_load_metadata_fixture (DataContainer):
+                Fixture that provides a DataContainer containing metadata.
+            read_in_data_csv_file (List[List[str]]):
+                Fixture that provides the rows of a CSV file.
+        """
+        expected_data_dict = {"id": ["1", "2", "3"],
+                              "Q002/SQ001": ["Option1", "Option2", "Option3"],
+                              "Q003/SQ001": [123, 456, 789]}
+        expected_frame: DataFrame = DataStructureCreator. \
+            create_dataframe_from_dict(expected_data_dict)
+        data_container: DataContainer = data_container_load_metadata_fixture
+        data_container.load_survey_data(
+            csv_data=iter(read_in_data_csv_file), chunk_size=2
+        )
+        actual_frame: DataFrame = \
+            data_container.data_frame_for_ids(["Q002/SQ001", "Q003/SQ001"])
+        # Make sure that expected and actual DataFrames are equal.
+        assert actual_frame.equals(expected_frame), \
+            "Expected and actual DataFrames are not equal."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    @pytest.mark.parametrize("csv_engine", list(SupportedCsvEngine))
+    def test_read_survey_data_with_csv_engine_works(
+        self,
+        data_container_load_metadata_fixture: DataContainer,
+        test_data_csv_file_path: str,
+        csv_engine: SupportedCsvEngine,
+    ) -> None:
+        """
+        Tests that reading survey data works with each CSV engine.
+
+        Args:
+            data_container_load_metadata_fixture (DataContainer):
+                Fixture that provides a DataContainer containing metadata.
+            test_data_csv_file_path (str):
+                File name of a data CSV file to be read in.
+            csv_engine (SupportedCsvEngine):
+                The CSV engine to be used.
+        """
+        expected_data_dict = {"id": ["1", "2", "3"],
+                              "Q002/SQ001": ["Option1", "Option2", "Option3"],
+                              "Q003/SQ001": [123, 456, 789]}
+        expected_frame: DataFrame = DataStructureCreator. \
+            create_dataframe_from_dict(expected_data_dict)
+        settings: Settings = Settings()
+        settings.CSV_ENGINE = csv_engine
+        settings.CSV_CHUNK_SIZE = 2
+        data_container: DataContainer = data_container_load_metadata_fixture
+        SurveyDataReader.read(
+            settings=settings,
+            survey_data=Path(test_data_csv_file_path),
+            data=data_container,
+        )
+        actual_frame: DataFrame = \
+            data_container.data_frame_for_ids(["Q002/SQ001", "Q003/SQ001"])
+        # Make sure that expected and actual DataFrames are equal.
+        assert actual_frame.equals(expected_frame), \
+            "Expected and actual DataFrames are not equal."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path",
+        [
+            "tests/data_container/fixtures/"
+            "metadata-seven-question-collections.yml",
+        ],
+    )
+    @pytest.mark.parametrize("csv_engine", list(SupportedCsvEngine))
+    def test_read_multi_line_answers_with_csv_engine_works(
+        self,
+        data_container_load_metadata_fixture: DataContainer,
+        csv_engine: SupportedCsvEngine,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Tests that quoted answers spanning several lines are read correctly.
+
+        The file is large enough to be parsed in several blocks by engines
+        reading it in parallel, so line breaks within quotes end up at the
+        borders of blocks.
+
+        Args:
+            data_container_load_metadata_fixture (DataContainer):
+                Fixture that provides a DataContainer containing metadata.
+            csv_engine (SupportedCsvEngine):
+                The CSV engine to be used.
+            tmp_path (Path):
+                Temporary directory to write the survey data to.
+        """
+        participant_count: int = 30000
+        survey_data: Path = tmp_path / "multi_line_answers.csv"
+        with survey_data.open("w", encoding="utf-8") as data_file:
+            data_file.write(
+                '"id","Q001/SQ001","Q002/SQ001","Q003/SQ001","Q004/SQ001",'
+                '"Q005/SQ001","Q006/SQ001","Q007/SQ001"\n'
+            )
+            for participant in range(participant_count):
+                data_file.write(
+                    f'"{participant}","A001","A001","123","12.3",'
+                    f'"first line {participant}\n""second"" line","N/A",""\n'
+                )
+        settings: Settings = Settings()
+        settings.CSV_ENGINE = csv_engine
+        data_container: DataContainer = data_container_load_metadata_fixture
+        SurveyDataReader.read(
+            settings=settings,
+            survey_data=survey_data,
+            data=data_container,
+        )
+        actual_series: Series = \
+            data_container.question_for_id("Q005/SQ001").as_series()
+        # Make sure that line breaks within quotes did not split the rows.
+        assert len(actual_series) == participant_count, \
+            "Amount of participants is not correct."
+        assert actual_series.iloc[-1] == (
+            f'first line {participant_count - 1}\n"second" line'
+        ), "Multi-line answer is not correct."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    def test_decoder_statistics_works(
+        self,
+        data_container_load_metadata_and_data_fixture: DataContainer,
+    ) -> None:
+        """
+        Tests that decoder statistics are collected while loading data.
+
+        Args:
+            data_container_load_metadata_and_data_fixture (DataContainer):
+                Fixture that provides a DataContainer containing metadata
+                and data.
+        """
+        statistics: Dict[str, Dict[str, int]] = \
+            data_container_load_metadata_and_data_fixture.decoder_statistics
+        # Make sure that all three answers were decoded without errors.
+        assert statistics["Q003/SQ001"]["values"] == 3, \
+            "Amount of decoded values is not correct."
+        assert statistics["Q003/SQ001"]["errors"] == 0, \
+            "Amount of decode errors is not correct."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    def test_load_survey_data_with_decode_workers_works(
+        self,
+        read_in_metadata_yaml_file: Union[YamlList, YamlDict],
+        read_in_data_csv_file: List[List[str]],
+    ) -> None:
+        """
+        Tests that decoding survey data in worker processes works.
+
+        Args:
+            read_in_metadata_yaml_file (Union[YamlList, YamlDict]):
+                Fixture that provides the contents of a metadata YAML file.
+            read_in_data_csv_file (List[List[str]]):
+                Fixture that provides the rows of a CSV file.
+        """
+        expected_data_dict = {"id": ["1", "2", "3"],
+                              "Q002/SQ001": ["Option1", "Option2", "Option3"],
+                              "Q003/SQ001": [123, 456, 789]}
+        expected_frame: DataFrame = DataStructureCreator. \
+            create_dataframe_from_dict(expected_data_dict)
+        settings: Settings = Settings()
+        settings.DECODE_WORKERS = 2
+        data_container: DataContainer = DataContainer(settings)
+        data_container.load_metadata(read_in_metadata_yaml_file)
+        data_container.load_survey_data(
+            csv_data=read_in_data_csv_file, chunk_size=2
+        )
+        actual_frame: DataFrame = \
+            data_container.data_frame_for_ids(["Q002/SQ001", "Q003/SQ001"])
+        # Make sure that expected and actual DataFrames are equal and the
+        # statistics of the workers are accounted for.
+        assert actual_frame.equals(expected_frame), \
+            "Expected and actual DataFrames are not equal."
+        assert data_container.decoder_statistics["Q003/SQ001"]["values"] \
+            == 3, "Amount of decoded values is not correct."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    def test_lazy_metadata_constructs_collections_on_access(
+        self,
+        read_in_metadata_yaml_file: Union[YamlList, YamlDict],
+        read_in_data_csv_file: List[List[str]],
+    ) -> None:
+        """
+        Tests that lazy metadata is only constructed once it is accessed.
+
+        Args:
+            read_in_metadata_yaml_file (Union[YamlList, YamlDict]):
+                Fixture that provides the contents of a metadata YAML file.
+            read_in_data_csv_file (List[List[str]]):
+                Fixture that provides the rows of a CSV file.
+        """
+        settings: Settings = Settings()
+        settings.LAZY_METADATA = True
+        data_container: DataContainer = DataContainer(settings)
+        data_container.load_metadata(read_in_metadata_yaml_file)
+        # Make sure that nothing is constructed before it is accessed.
+        assert not data_container._survey_questions, \
+            "Collections were constructed before being accessed."
+        # Leave out the last column, so its collection Q007 is not needed.
+        data_container.load_survey_data(
+            csv_data=[row[:-1] for row in read_in_data_csv_file]
+        )
+        assert data_container.question_for_id("Q003/SQ001").as_series()\
+            .tolist() == [123, 456, 789], "Answers are not correct."
+        assert "Q007" in data_container._pending_collections, \
+            "Collection not present in the data was constructed."
+        # Make sure that listing the collections constructs all of them.
+        assert len(data_container.survey_questions) == 7, \
+            "Amount of question collections is not correct."
+        assert not data_container._pending_collections, \
+            "Collections are still pending."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    def test_lazy_metadata_defers_collections_while_loading_data(
+        self,
+        read_in_metadata_yaml_file: Union[YamlList, YamlDict],
+        read_in_data_csv_file: List[List[str]],
+    ) -> None:
+        """
+        Tests that loading survey data keeps lazy metadata pending.
+
+        Args:
+            read_in_metadata_yaml_file (Union[YamlList, YamlDict]):
+                Fixture that provides the contents of a metadata YAML file.
+            read_in_data_csv_file (List[List[str]]):
+                Fixture that provides the rows of a CSV file.
+        """
+        settings: Settings = Settings()
+        settings.LAZY_METADATA = True
+        data_container: DataContainer = DataContainer(settings)
+        data_container.load_metadata(read_in_metadata_yaml_file)
+        data_container.load_survey_data(
+            csv_data=read_in_data_csv_file, chunk_size=2
+        )
+        # Make sure that the answers are kept for later instead of
+        # constructing the collections right away.
+        assert len(data_container._pending_collections) == 7, \
+            "Collections were constructed while loading survey data."
+        assert data_container.participant_ids == ["1", "2", "3"], \
+            "Participant IDs are not correct."
+
+        data_container.mark_answers_invalid({"2"})
+        data_container.remove_invalid_answer_sets()
+        assert len(data_container._pending_collections) == 7, \
+            "Collections were constructed while removing answers."
+        actual_series: Series = \
+            data_container.question_for_id("Q003/SQ001").as_series()
+        # Make sure that pending answers are decoded once they are accessed.
+        assert actual_series.to_dict() == {"1": 123, "3": 789}, \
+            "Answers are not correct."
+        assert "Q003" not in data_container._pending_answers, \
+            "Answers of a constructed collection are still pending."
+        assert len(data_container._pending_collections) == 6, \
+            "Other collections were constructed on access."
+
+    @pytest.mark.ci
+    def test_lazy_metadata_drops_invalid_collections(
+        self,
+        data_container_fixture: DataContainer,
+    ) -> None:
+        """
+        Tests that invalid lazy metadata is reported upon construction.
+
+        Args:
+            data_container_fixture (DataContainer):
+                Fixture that provides an empty DataContainer.
+        """
+        data_container_fixture._settings.LAZY_METADATA = True
+        data_container_fixture.load_metadata(
+            {"id": "Q001", "label": "Q001", "text": {"english": "Text"}}
+        )
+        assert "Q001" in data_container_fixture._pending_collections, \
+            "Collection was not deferred."
+        data_container_fixture.construct_pending_collections()
+        # Make sure that the invalid collection is neither pending nor
+        # available after forcing the construction.
+        assert not data_container_fixture._pending_collections, \
+            "Collections are still pending."
+        with pytest.raises(KeyError):
+            data_container_fixture.collection_for_id("Q001")
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    def test_snapshot_is_isolated(
+        self,
+        data_container_load_metadata_and_data_fixture: DataContainer,
+    ) -> None:
+        """
+        Tests that modifying a snapshot does not affect the original.
+
+        Args:
+            data_container_load_metadata_and_data_fixture (DataContainer):
+                Fixture that provides a DataContainer containing metadata
+                and data.
+        """
+        original: DataContainer = data_container_load_metadata_and_data_fixture
+        snapshot: DataContainer = original.snapshot()
+        snapshot.question_for_id("Q003/SQ001").add_answer("4", "1000")
+        snapshot.collection_for_id("Q002").remove_answers({"1"})
+        snapshot.question_for_id("Q002/SQ001").relabel("Relabelled")
+        snapshot.mark_answers_invalid({"2"})
+        snapshot._settings.ID_COLUMN_NAME = "changed"
+        # Make sure that none of the modifications affect the original.
+        assert original.question_for_id("Q003/SQ001").as_series().tolist() \
+            == [123, 456, 789], "Answers of original were modified."
+        assert original.participant_ids == ["1", "2", "3"], \
+            "Participants of original were modified."
+        assert "1" in original.question_for_id("Q002/SQ001").answers, \
+            "Removed answer is missing in original."
+        assert original.question_for_id("Q002/SQ001").label != "Relabelled", \
+            "Label of original was modified."
+        assert not original.invalid_answer_sets, \
+            "Invalid answer sets of original were modified."
+        assert original._settings.ID_COLUMN_NAME == "id", \
+            "Settings of original were modified."
+        # Make sure that the snapshot itself reflects the modifications.
+        assert snapshot.question_for_id("Q003/SQ001").as_series().tolist() \
+            == [123, 456, 789, 1000], "Answers of snapshot are not correct."
+        assert "1" not in snapshot.question_for_id("Q002/SQ001").answers, \
+            "Removed answer is present in snapshot."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/data_container/fixtures/"
+                "metadata-seven-question-collections.yml",
+                "tests/data_container/fixtures/"
+                "test_data_for_module_data_container.csv",
+            ]
+        ],
+    )
+    def test_memory_report_covers_all_questions(
+        self,
+        data_container_load_metadata_and_data_fixture: DataContainer,
+    ) -> None:
+        """
+        Tests that the memory report breaks down all collections.
+
+        Args:
+            data_container_load_metadata_and_data_fixture (DataContainer):
+                Fixture that provides a DataContainer containing metadata
+                and data.
+        """
+        data: DataContainer = data_container_load_metadata_and_data_fixture
+        report: MemoryReport = data.memory_report()
+        # Make sure that each collection and question is listed once.
+        assert [usage.name for usage in report.collections] \
+            == data.question_collection_ids, "Collections are missing."
+        question: MemoryUsage = report.collections[2].parts[0]
+        assert question.name == "Q003/SQ001", "Questions are missing."
+        assert question.size_of("answers") > 0 \
+            and question.size_of("translations") > 0 \
+            and question.size_of("metadata") > 0, \
+            "Memory of the question was not accounted for."
+        assert report.total == report.container.total + sum(
+            collection.total for collection in report.collections
+        ), "Total memory is not correct."
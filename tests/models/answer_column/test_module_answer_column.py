@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module answer_column."""
+
+import numpy as np
+import pytest
+
+from hifis_surveyval.models.answer_column import AnswerColumn
+from hifis_surveyval.models.participant_index import ParticipantIndex
+
+
+class TestAnswerColumn(object):
+    """
+    Tests AnswerColumn operations.
+
+    Basic tests for class AnswerColumn are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_set_answer_works(
+        self, participant_index_fixture: ParticipantIndex
+    ) -> None:
+        """
+        Tests that stored answers can be looked up by participant ID.
+
+        Args:
+            participant_index_fixture (ParticipantIndex):
+                Fixture that provides an empty ParticipantIndex.
+        """
+        column: AnswerColumn = AnswerColumn(int, participant_index_fixture)
+        column.set_answer("1", 42)
+        column.set_answer("2", None)
+        # Make sure that answers are returned as built-in types and empty
+        # answers as None.
+        assert column["1"] == 42 and isinstance(column["1"], int), \
+            "Stored answer is not correct."
+        assert column["2"] is None, "Empty answer is not None."
+        assert dict(column) == {"1": 42, "2": None}, \
+            "Answer mapping is not correct."
+
+    @pytest.mark.ci
+    def test_remove_answers_works(
+        self, participant_index_fixture: ParticipantIndex
+    ) -> None:
+        """
+        Tests that removed answers are no longer contained in the column.
+
+        Args:
+            participant_index_fixture (ParticipantIndex):
+                Fixture that provides an empty ParticipantIndex.
+        """
+        column: AnswerColumn = AnswerColumn(str, participant_index_fixture)
+        column.set_answer("1", "a")
+        column.set_answer("2", "b")
+        column.remove_answers({"1", "unknown"})
+        # Make sure that only the removed answer is gone and the participant
+        # is still known to the index.
+        assert "1" not in column, "Removed answer is still present."
+        assert len(column) == 1, "Answer count is not correct."
+        assert "1" in participant_index_fixture, \
+            "Participant was removed from index."
+
+    @pytest.mark.ci
+    def test_set_answers_counts_answers(
+        self, participant_index_fixture: ParticipantIndex
+    ) -> None:
+        """
+        Tests that answers set in blocks are counted once per participant.
+
+        Args:
+            participant_index_fixture (ParticipantIndex):
+                Fixture that provides an empty ParticipantIndex.
+        """
+        column: AnswerColumn = AnswerColumn(int, participant_index_fixture)
+        column.set_answers(
+            positions=participant_index_fixture.register_all(["1", "2", "1"]),
+            values=np.array([1, 2, 3]),
+            null=np.array([False, False, False]),
+        )
+        column.remove_answers({"2"})
+        column.set_answers(
+            positions=participant_index_fixture.register_all(["2", "3", "1"]),
+            values=np.array([4, 0, 5]),
+            null=np.array([False, True, False]),
+        )
+        # Make sure that repeated and overwritten answers are not counted
+        # twice.
+        assert len(column) == 3, "Answer count is not correct."
+        assert dict(column) == {"1": 5, "2": 4, "3": None}, \
+            "Answer mapping is not correct."
+
+    @pytest.mark.ci
+    def test_columns_share_index(
+        self, participant_index_fixture: ParticipantIndex
+    ) -> None:
+        """
+        Tests that columns sharing an index are aligned to each other.
+
+        Args:
+            participant_index_fixture (ParticipantIndex):
+                Fixture that provides an empty ParticipantIndex.
+        """
+        first: AnswerColumn = AnswerColumn(float, participant_index_fixture)
+        second: AnswerColumn = AnswerColumn(float, participant_index_fixture)
+        first.set_answer("1", 1.5)
+        second.set_answer("2", 2.5)
+        # Make sure that both arrays span all participants and missing
+        # entries are NaN.
+        np.testing.assert_array_equal(first.as_array(), [1.5, np.nan])
+        np.testing.assert_array_equal(second.as_array(), [np.nan, 2.5])
+        assert "2" not in first, "Answer of other column is visible."
+
+    @pytest.mark.ci
+    def test_as_array_is_read_only(
+        self, participant_index_fixture: ParticipantIndex
+    ) -> None:
+        """
+        Tests that the array view can not be used to modify the column.
+
+        Args:
+            participant_index_fixture (ParticipantIndex):
+                Fixture that provides an empty ParticipantIndex.
+        """
+        column: AnswerColumn = AnswerColumn(bool, participant_index_fixture)
+        column.set_answer("1", True)
+        array: np.ndarray = column.as_array()
+        # Make sure that writing to the array fails.
+        with pytest.raises(ValueError):
+            array[0] = False
+
+    @pytest.mark.ci
+    def test_missing_booleans_are_none(
+        self, participant_index_fixture: ParticipantIndex
+    ) -> None:
+        """
+        Tests that boolean columns with missing values are given as objects.
+
+        Args:
+            participant_index_fixture (ParticipantIndex):
+                Fixture that provides an empty ParticipantIndex.
+        """
+        column: AnswerColumn = AnswerColumn(bool, participant_index_fixture)
+        column.set_answer("1", True)
+        column.set_answer("2", None)
+        # Make sure that the missing value is represented as None.
+        assert list(column.as_array()) == [True, None], \
+            "Missing boolean value is not None."
+
+    @pytest.mark.ci
+    def test_mismatching_values_are_kept(
+        self, participant_index_fixture: ParticipantIndex
+    ) -> None:
+        """
+        Tests that values not matching the answer type are stored unchanged.
+
+        Args:
+            participant_index_fixture (ParticipantIndex):
+                Fixture that provides an empty ParticipantIndex.
+        """
+        column: AnswerColumn = AnswerColumn(int, participant_index_fixture)
+        column.set_answer("1", 1)
+        column.set_answer("2", 2.5)
+        # Make sure that the floating point value was not truncated.
+        assert column["1"] == 1 and column["2"] == 2.5, \
+            "Stored answers are not correct."
+
+    @pytest.mark.ci
+    def test_large_integers_are_kept(
+        self, participant_index_fixture: ParticipantIndex
+    ) -> None:
+        """
+        Tests that integers beyond the range of the storage type are kept.
+
+        Args:
+            participant_index_fixture (ParticipantIndex):
+                Fixture that provides an empty ParticipantIndex.
+        """
+        large: int = 2**70
+        column: AnswerColumn = AnswerColumn(int, participant_index_fixture)
+        column.set_answer("1", 1)
+        column.set_answer("2", large)
+        column.set_answers(
+            positions=participant_index_fixture.register_all(["3"]),
+            values=np.array([large + 1], dtype=object),
+            null=np.array([False]),
+        )
+        # Make sure that the large values were neither truncated nor lost.
+        assert [column["1"], column["2"], column["3"]] == [
+            1, large, large + 1
+        ], "Stored answers are not correct."
+
+    @pytest.mark.ci
+    def test_shared_column_copies_on_write(
+        self, participant_index_fixture: ParticipantIndex
+    ) -> None:
+        """
+        Tests that shared columns copy their answers only when modified.
+
+        Args:
+            participant_index_fixture (ParticipantIndex):
+                Fixture that provides an empty ParticipantIndex.
+        """
+        column: AnswerColumn = AnswerColumn(int, participant_index_fixture)
+        column.set_answer("1", 1)
+        column.set_answer("2", 2)
+        shared: AnswerColumn = column.share(participant_index_fixture.share())
+        # Make sure that the answers are shared until one side is modified.
+        assert np.shares_memory(column.as_array(), shared.as_array()), \
+            "Answers were copied before being modified."
+        shared.set_answer("1", 10)
+        shared.set_answer("3", 3)
+        column.remove_answers({"2"})
+        assert dict(column) == {"1": 1}, "Original column was affected."
+        assert dict(shared) == {"1": 10, "2": 2, "3": 3}, \
+            "Shared column was affected."
+        assert "3" not in participant_index_fixture, \
+            "Original index was affected."
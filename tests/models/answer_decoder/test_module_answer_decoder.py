@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module answer_decoder."""
+
+import numpy as np
+import pytest
+
+from hifis_surveyval.models.answer_decoder import (
+    CastDecoder, OptionDecoder, TruthValueDecoder, decode_column_group,
+    pack_column,
+)
+
+
+class TestAnswerDecoder(object):
+    """
+    Tests AnswerDecoder operations.
+
+    Basic tests for the classes derived from AnswerDecoder are performed in
+    unit test methods of this class.
+    """
+
+    @pytest.mark.ci
+    def test_option_decoder_works(self) -> None:
+        """Tests that answer option IDs are decoded into option values."""
+        decoder: OptionDecoder = OptionDecoder(
+            name="Q001/_", options={"A1": 1, "A2": 2}, answer_type=int
+        )
+        (values, null, valid) = decoder.decode(["A2", "", "A3", "A1"])
+        # Make sure that known IDs are decoded, while empty values are None
+        # and unknown IDs are reported as invalid.
+        assert values.dtype == np.int64, "Option values are not typed."
+        assert values[[0, 3]].tolist() == [2, 1], "Decoded values not correct."
+        assert null.tolist() == [False, True, True, False], \
+            "Null mask is not correct."
+        assert valid.tolist() == [True, True, False, True], \
+            "Valid mask is not correct."
+        assert decoder.error_count == 1, "Error count is not correct."
+
+    @pytest.mark.ci
+    def test_option_decoder_raises_for_unknown_single_value(self) -> None:
+        """Tests that decoding a single unknown answer option ID fails."""
+        decoder: OptionDecoder = OptionDecoder(
+            name="Q001/_", options={"A1": "yes"}, answer_type=str
+        )
+        assert decoder.decode_one("A1") == "yes", "Decoded value not correct."
+        with pytest.raises(KeyError):
+            decoder.decode_one("A2")
+        assert decoder.error_count == 1, "Error count is not correct."
+
+    @pytest.mark.ci
+    def test_truth_value_decoder_works(self) -> None:
+        """Tests that truth values are decoded and invalid ones are None."""
+        decoder: TruthValueDecoder = TruthValueDecoder(
+            name="Q001/_", true_values={"Y"}, false_values={"N"}
+        )
+        (values, null, valid) = decoder.decode(["Y", "N", "maybe", ""])
+        # Make sure that invalid truth values are kept as None.
+        assert values[:2].tolist() == [True, False], \
+            "Decoded values not correct."
+        assert null.tolist() == [False, False, True, True], \
+            "Null mask is not correct."
+        assert valid.all(), "Valid mask is not correct."
+        assert decoder.decode_one("maybe") is None, \
+            "Invalid truth value is not None."
+        assert decoder.error_count == 2, "Error count is not correct."
+
+    @pytest.mark.ci
+    def test_cast_decoder_works(self) -> None:
+        """Tests that numbers are parsed and invalid numbers are reported."""
+        decoder: CastDecoder = CastDecoder(name="Q001/_", answer_type=float)
+        (values, null, valid) = decoder.decode(["1.5", "", "x", "2"])
+        # Make sure that the valid numbers are parsed into a typed array.
+        assert values.dtype == np.float64, "Parsed values are not typed."
+        assert values[[0, 3]].tolist() == [1.5, 2.0], \
+            "Parsed values not correct."
+        assert valid.tolist() == [True, True, False, True], \
+            "Valid mask is not correct."
+        assert decoder.statistics == {
+            "calls": 1, "values": 4, "empty": 1, "errors": 1
+        }, "Decoder statistics are not correct."
+
+    @pytest.mark.ci
+    def test_cast_decoder_keeps_numbers_beyond_storage_type(self) -> None:
+        """Tests that integers too large to be stored typed are kept."""
+        decoder: CastDecoder = CastDecoder(name="Q001/_", answer_type=int)
+        (values, null, valid) = decoder.decode(
+            ["1", "123456789012345678901234567890", "x"]
+        )
+        # Make sure that the large number is kept instead of failing.
+        assert values[[0, 1]].tolist() == [
+            1, 123456789012345678901234567890
+        ], "Parsed values are not correct."
+        assert valid.tolist() == [True, True, False], \
+            "Valid mask is not correct."
+        assert decoder.error_count == 1, "Error count is not correct."
+
+    @pytest.mark.ci
+    def test_packed_columns_are_decoded(self) -> None:
+        """Tests that columns packed for worker processes decode the same."""
+        columns = [
+            ["1", "", "ä 3"],
+            ["x\x00y", "", "z"],
+            ["", "", ""],
+        ]
+        packed = [pack_column(column) for column in columns]
+        # Make sure that texts containing the separator are not packed.
+        assert isinstance(packed[0], bytes), "Column was not packed."
+        assert packed[1] is columns[1], "Column with separator was packed."
+        results = decode_column_group(
+            [CastDecoder(name=f"Q001/SQ00{index}", answer_type=str)
+             for index in range(len(columns))],
+            packed,
+            3,
+        )
+        for (column, ((values, null, valid), statistics)) in zip(
+            columns, results
+        ):
+            assert [
+                value if valid_value and not null_value else ""
+                for (value, null_value, valid_value) in zip(
+                    values, null, valid
+                )
+            ] == column, "Decoded values are not correct."
+            assert statistics["values"] == 3, "Statistics are not correct."
+        assert decode_column_group([], [], 0) == [], \
+            "Empty group is not decoded."
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""Provide pytest test cases for module frame_cache."""
+
+import pickle
+from typing import Iterator
+
+import pytest
+from pandas import DataFrame, Series
+
+from hifis_surveyval.core.settings import Settings
+from hifis_surveyval.data_container import DataContainer
+from hifis_surveyval.models.frame_cache import FrameCache
+from tests.helper.data_container_helper.data_container_loader import \
+    DataContainerLoader
+
+METADATA_FILE: str = \
+    "tests/data_container/fixtures/metadata-seven-question-collections.yml"
+DATA_FILE: str = \
+    "tests/data_container/fixtures/test_data_for_module_data_container.csv"
+
+
+@pytest.fixture
+def empty_cache() -> Iterator[None]:
+    """Start a test with an empty frame cache and clear it afterwards."""
+    FrameCache.clear()
+    yield
+    FrameCache.clear()
+
+
+class TestFrameCache(object):
+    """
+    Tests FrameCache operations.
+
+    Basic tests for class FrameCache are performed in unit test methods of
+    this class.
+    """
+
+    @pytest.mark.ci
+    def test_entries_are_reused_as_copies(self, empty_cache: None) -> None:
+        """
+        Tests that cached entries are handed out as independent copies.
+
+        Args:
+            empty_cache (None):
+                Fixture that clears the frame cache.
+        """
+        settings: Settings = Settings()
+        key = (FrameCache.new_key(), "series")
+        first: Series = FrameCache.obtain(
+            settings, key, lambda: Series(["a", "b"], name="test")
+        )
+        first[0] = "modified"
+        second: Series = FrameCache.obtain(
+            settings, key, lambda: Series(["x", "y"], name="test")
+        )
+        assert list(second) == ["a", "b"], "Cached series was modified."
+        statistics = FrameCache.statistics()
+        assert statistics["hits"] == 1, "Cached series was not reused."
+        assert statistics["misses"] == 1, "Series was built more than once."
+        assert FrameCache.size_of(key[0]) == statistics["size"] > 0, \
+            "Size of the owner's entries is not correct."
+
+    @pytest.mark.ci
+    def test_built_objects_are_kept(self, empty_cache: None) -> None:
+        """
+        Tests that newly built objects are kept without copying them.
+
+        Args:
+            empty_cache (None):
+                Fixture that clears the frame cache.
+        """
+        settings: Settings = Settings()
+        key = (FrameCache.new_key(), "frame")
+        built: DataFrame = DataFrame({"values": [1, 2]})
+        obtained: DataFrame = FrameCache.obtain(settings, key, lambda: built)
+        assert FrameCache._entries[key][0] is built, \
+            "Built data frame was not kept."
+        # Make sure that the caller may modify what it got without
+        # affecting later calls.
+        obtained.iloc[0, 0] = 3
+        again: DataFrame = FrameCache.obtain(
+            settings, key, lambda: DataFrame({"values": [5, 6]})
+        )
+        assert again["values"].tolist() == [1, 2], \
+            "Modification reached the cache."
+
+    @pytest.mark.ci
+    def test_renewed_keys_drop_entries(self, empty_cache: None) -> None:
+        """
+        Tests that entries are dropped once their owner or a source renews.
+
+        Args:
+            empty_cache (None):
+                Fixture that clears the frame cache.
+        """
+        settings: Settings = Settings()
+        (owner, source) = (FrameCache.new_key(), FrameCache.new_key())
+        for _ in range(3):
+            FrameCache.obtain(
+                settings,
+                (owner, "frame", source),
+                lambda: DataFrame({"values": [1, 2]}),
+                sources=[source],
+            )
+            source = FrameCache.renew_key(source)
+        assert FrameCache.statistics()["entries"] == 0, \
+            "Entries of a renewed source were kept."
+
+        FrameCache.obtain(
+            settings, (owner, "frame"), lambda: DataFrame({"values": [1]})
+        )
+        FrameCache.renew_key(owner)
+        assert FrameCache.statistics()["entries"] == 0 \
+            and not FrameCache.size_of(owner), \
+            "Entries of a renewed owner were kept."
+
+    @pytest.mark.ci
+    def test_least_recently_used_entries_are_evicted(
+        self, empty_cache: None
+    ) -> None:
+        """
+        Tests that the least recently used entries exceeding the limit go.
+
+        Args:
+            empty_cache (None):
+                Fixture that clears the frame cache.
+        """
+        settings: Settings = Settings()
+        settings.FRAME_CACHE_SIZE = 1
+        # Each frame takes up almost a quarter of the limit
+        rows: int = 2**20 // 8 // 4 - 64
+        keys = [(FrameCache.new_key(), "frame") for _ in range(5)]
+        for key in keys[:4]:
+            FrameCache.obtain(
+                settings, key, lambda: DataFrame({"values": range(rows)})
+            )
+        # Touch the first entry, so the second one is evicted instead
+        FrameCache.obtain(settings, keys[0], DataFrame)
+        FrameCache.obtain(
+            settings, keys[4], lambda: DataFrame({"values": range(rows)})
+        )
+        assert FrameCache.statistics()["evictions"] == 1, \
+            "Not exactly one entry was evicted."
+        assert FrameCache.size_of(keys[0][0]), "Recently used entry is gone."
+        assert not FrameCache.size_of(keys[1][0]), \
+            "Least recently used entry was kept."
+
+    @pytest.mark.ci
+    def test_size_zero_disables_cache(self, empty_cache: None) -> None:
+        """
+        Tests that nothing is cached if the size limit is zero.
+
+        Args:
+            empty_cache (None):
+                Fixture that clears the frame cache.
+        """
+        settings: Settings = Settings()
+        settings.FRAME_CACHE_SIZE = 0
+        key = (FrameCache.new_key(), "series")
+        FrameCache.obtain(settings, key, lambda: Series(dtype=object))
+        FrameCache.obtain(settings, key, lambda: Series(dtype=object))
+        assert FrameCache.statistics() == {
+            "hits": 0, "misses": 0, "evictions": 0, "entries": 0, "size": 0,
+        }, "Series were cached."
+
+    @pytest.mark.ci
+    def test_modifications_invalidate_entries(self, empty_cache: None) -> None:
+        """
+        Tests that cached answers are not reused once they change.
+
+        Args:
+            empty_cache (None):
+                Fixture that clears the frame cache.
+        """
+        data_container: DataContainer = \
+            DataContainerLoader.prepare_data_container(METADATA_FILE,
+                                                       DATA_FILE)
+        collection = data_container.collection_for_id("Q003")
+        question = data_container.question_for_id("Q003/SQ001")
+        collection.as_data_frame()
+        question.as_series()
+        assert collection.as_data_frame().equals(
+            question.frame_from_questions(list(collection.questions))
+        ), "Cached data frame differs from the answers."
+        assert FrameCache.statistics()["hits"] == 1, \
+            "Cached data frame was not reused."
+
+        question.add_answer("4", "1")
+        assert "4" in collection.as_data_frame().index, \
+            "Data frame of outdated answers was reused."
+        assert "4" in question.as_series().index, \
+            "Series of outdated answers was reused."
+
+        assert FrameCache.statistics()["entries"] == 1, \
+            "Data frame of outdated answers was kept."
+
+        data_container.question_for_id("Q002/SQ001").add_answer("5", "A001")
+        assert collection.as_data_frame().equals(
+            question.frame_from_questions(list(collection.questions))
+        ), "Data frame of outdated participants was reused."
+
+        question.remove_answers({"4"})
+        assert "4" not in question.as_series().index, \
+            "Series of removed answers was reused."
+
+        restored = pickle.loads(pickle.dumps(question))
+        assert restored.cache_key != question.cache_key, \
+            "Restored question shares the cache key."
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+"""Provide pytest test cases for module metadata_validator."""
+
+from copy import deepcopy
+from pathlib import Path
+
+import pytest
+import yaml
+
+from hifis_surveyval.models.metadata_validator import validate_collection
+from hifis_surveyval.models.mixins.mixins import HasText
+from hifis_surveyval.models.mixins.yaml_constructable import YamlDict
+from hifis_surveyval.models.question import Question
+from hifis_surveyval.models.question_collection import QuestionCollection
+from hifis_surveyval.models.translated import Translated
+
+FIXTURES: Path = Path("tests/data_container/fixtures")
+
+
+def validate_with_schema(collection_yaml: YamlDict) -> YamlDict:
+    """
+    Validate the YAML data of a collection with the schema library.
+
+    Args:
+        collection_yaml (YamlDict): YAML data of a question collection.
+    Returns:
+        The validated YAML data.
+    """
+    validated = QuestionCollection.schema.validate(collection_yaml)
+    validated[HasText.YAML_TOKEN] = Translated.validate_yaml(
+        validated[HasText.YAML_TOKEN]
+    )
+    validated[QuestionCollection.token_QUESTIONS] = [
+        Question.validate_yaml(question_yaml)
+        for question_yaml in validated[QuestionCollection.token_QUESTIONS]
+    ]
+    return validated
+
+
+class TestMetadataValidator(object):
+    """
+    Tests the single pass validation of metadata.
+
+    The results are compared against those of the schema based validation.
+    """
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "file_name",
+        [
+            "metadata-seven-question-collections.yml",
+            "metadata-seven-question-collections-wrong-keys.yml",
+        ],
+    )
+    def test_validate_collection_matches_schema(self, file_name: str) -> None:
+        """
+        Tests that valid collections are validated like with the schemas.
+
+        Args:
+            file_name (str): Name of the metadata fixture file.
+        """
+        with (FIXTURES / file_name).open("r", encoding="utf-8") as stream:
+            collections = yaml.safe_load(stream)
+        for collection_yaml in collections:
+            assert validate_collection(deepcopy(collection_yaml)) == \
+                validate_with_schema(deepcopy(collection_yaml)), \
+                "Validation result differs from schema validation."
+
+    @pytest.mark.ci
+    def test_validate_collection_fills_defaults(self) -> None:
+        """Tests that missing optional fields get their default values."""
+        validated = validate_collection(
+            {
+                "id": "C1",
+                "label": "C1",
+                "text": {"en": "Collection"},
+                "questions": [
+                    {
+                        "id": "Q1",
+                        "label": "Q1",
+                        "text": {"en": "Question"},
+                        "datatype": "str",
+                        "answers": [
+                            {"id": "A1", "label": "A1", "text": {"en": "A"}}
+                        ],
+                    }
+                ],
+            }
+        )
+        assert validated["mandatory"] is False, "Collection default missing."
+        question = validated["questions"][0]
+        assert question["mandatory"] is False, "Question default missing."
+        assert question["answers"][0]["value"] is None, \
+            "Answer option default missing."
+
+    @pytest.mark.ci
+    def test_validate_collection_reports_all_errors(self) -> None:
+        """Tests that all errors are reported together with their paths."""
+        with pytest.raises(ValueError) as raised:
+            validate_collection(
+                {
+                    "id": "C1",
+                    "label": "C1",
+                    "text": {"english": "Collection"},
+                    "questions": [
+                        {
+                            "id": "Q1",
+                            "label": "Q1",
+                            "text": {"en": ""},
+                            "datatype": "complex",
+                            "answers": [
+                                {"label": "A1", "text": {"en": "A"}},
+                                {
+                                    "id": "A2",
+                                    "label": "A2",
+                                    "text": {"en": "B"},
+                                    "extra": 1,
+                                },
+                            ],
+                        }
+                    ],
+                }
+            )
+        message: str = str(raised.value)
+        for expected in [
+            "C1/text: Invalid language code 'english'",
+            "C1/Q1/text/en: Translation must neither be empty nor None",
+            "C1/Q1/datatype: Expected one of",
+            "C1/Q1/answers[0]: Missing key 'id'",
+            "C1/Q1/A2: Unexpected key 'extra'",
+        ]:
+            assert expected in message, f"Missing error: {expected}"
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+# hifis-surveyval
+# Framework to help developing analysis scripts for the HIFIS Software survey.
+#
+# SPDX-FileCopyrightText: 2021 HIFIS Software <support@hifis.net>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""Provide pytest test cases for module participant_index."""
+
+import numpy as np
+import pytest
+
+from hifis_surveyval.models.participant_index import ParticipantIndex
+
+
+class TestParticipantIndex(object):
+    """
+    Tests ParticipantIndex operations.
+
+    Basic tests for class ParticipantIndex are performed in unit test methods
+    of this class.
+    """
+
+    @pytest.mark.ci
+    def test_register_all_works(self) -> None:
+        """Tests that known, new and repeated IDs get the right positions."""
+        index: ParticipantIndex = ParticipantIndex(name="id")
+        index.register("1")
+        positions: np.ndarray = index.register_all(["2", "1", "3", "2"])
+        # Make sure that repeated IDs share their position.
+        assert positions.tolist() == [1, 0, 2, 1], \
+            "Positions are not correct."
+        assert list(index) == ["1", "2", "3"], \
+            "Registered participants are not correct."
+        assert index.register_all([]).tolist() == [], \
+            "Positions of no participants are not empty."
+
+    @pytest.mark.ci
+    def test_register_all_does_not_build_pandas_index(self) -> None:
+        """Tests that registering chunks leaves the pandas index alone."""
+        index: ParticipantIndex = ParticipantIndex(name="id")
+        for chunk in range(3):
+            index.register_all([f"{chunk}-{row}" for row in range(4)])
+        index.as_pandas_index()
+        index.register_all(["0-1", "2-3"])
+        # Make sure that the cached pandas index survives known IDs.
+        assert index._pandas_index is not None, \
+            "Pandas index was dropped for known participants."
+        index.register_all(["new"])
+        assert index._pandas_index is None, \
+            "Pandas index was kept after registering a participant."
+        index.register_all(["other"])
+        assert index._pandas_index is None, \
+            "Pandas index was built while registering participants."
+        assert index.as_pandas_index().tolist()[-2:] == ["new", "other"], \
+            "Pandas index is not correct."
@@ -188,6 +188,43 @@ class TestQuestion(object):
             actual_given_answer_value == expected_given_answer_value
         ), "Given answer of participant is not casted correctly."
 
+    @pytest.mark.ci
+    def test_add_answers_works(self, question_fixture: Question) -> None:
+        """
+        Tests that adding many answers at once works.
+
+        Args:
+            question_fixture (Question):
+                Fixture that sets up a question object to be used in the test
+                case.
+        """
+        expected_answers = {"1": "No", "2": None}
+        question: Question = question_fixture
+        question.add_answers(["1", "2", "3"], ["A001", "", "A999"])
+        # Make sure that answer options are resolved, empty answers are None
+        # and unknown answer options are skipped.
+        assert dict(question.answers) == expected_answers, \
+            "Given answers of participants are not correct."
+
+    @pytest.mark.ci
+    def test_add_answers_with_no_answer_options_works(
+        self, question_no_answer_options_fixture: Question
+    ) -> None:
+        """
+        Tests that adding many answers without answer options works.
+
+        Args:
+            question_no_answer_options_fixture (Question):
+                Fixture that sets up a question object to be used in the test
+                case.
+        """
+        expected_answers = {"1": "42", "2": None}
+        question: Question = question_no_answer_options_fixture
+        question.add_answers(["1", "2"], ["42", ""])
+        # Make sure that the answers are kept as given.
+        assert dict(question.answers) == expected_answers, \
+            "Given answers of participants are not correct."
+
     @pytest.mark.ci
     @pytest.mark.parametrize(
         "metadata_yaml_file_path,test_data_csv_file_path",
@@ -222,3 +259,45 @@ class TestQuestion(object):
         # Make sure that expected and actual Series are equal.
         assert actual_series.equals(expected_series), \
             "Expected and actual Series are not equal."
+
+    @pytest.mark.ci
+    @pytest.mark.parametrize(
+        "metadata_yaml_file_path,test_data_csv_file_path",
+        [
+            [
+                "tests/models/question/fixtures/"
+                "metadata-single-question-collection.yml",
+                "tests/models/question/fixtures/"
+                "test_data_for_module_question.csv",
+            ]
+        ],
+    )
+    @pytest.mark.parametrize("frame_cache_size", [0, 256])
+    def test_as_series_can_be_modified(
+        self,
+        data_container_load_metadata_and_data_fixture: DataContainer,
+        frame_cache_size: int,
+    ) -> None:
+        """
+        Tests that series can be modified without affecting the answers.
+
+        Args:
+            data_container_load_metadata_and_data_fixture (DataContainer):
+                Fixture that sets up a DataContainer object with metadata and
+                data to be used in the test cases.
+            frame_cache_size (int):
+                The size limit of the frame cache in MiB.
+        """
+        question: Question = \
+            data_container_load_metadata_and_data_fixture \
+            .question_for_id("Q001/SQ001")
+        question._settings.FRAME_CACHE_SIZE = frame_cache_size
+        first_series: Series = question.as_series()
+        first_series.iloc[0] = "Changed"
+        first_series.fillna("Missing", inplace=True)
+        second_series: Series = question.as_series()
+        second_series += "!"
+        # Make sure that neither modification reached the stored answers.
+        assert question.as_series().tolist() == ["No", "Yes", "Maybe"], \
+            "Stored answers were modified."
+        assert first_series.iloc[0] == "Changed", "Series was not modified."
@@ -44,8 +44,12 @@ from hifis_surveyval.core.settings import Settings
 
 
 @pytest.fixture(scope='function')
-def settings():
+def settings(tmp_path, monkeypatch):
     """Set up and tear down for testing settings."""
+    # Run in a temporary folder so the generated files stay out of the
+    # working copy
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "metadata").mkdir()
     settings: Settings = Settings()
     shutil.rmtree(settings.SCRIPT_FOLDER, ignore_errors=True)
     try:
@@ -149,3 +153,17 @@ def test_init(settings):
         "The default script folder should be created at default path."
     assert (Path(f"{settings.SCRIPT_FOLDER}/example_script.py").exists()), \
         "The default config file should be created at default path."
+
+
+def test_benchmark_rejects_unknown_benchmark():
+    """
+    Arrange/Act: Run the `benchmark` subcommand with an unknown benchmark.
+
+    Assert: The command fails before generating any data.
+    Assert: The available benchmarks are listed.
+    """
+    runner: CliRunner = CliRunner()
+    result: Result = runner.invoke(cli.cli, ["benchmark", "-b", "unknown"])
+    assert result.exit_code == 2, "Unknown benchmark should be rejected."
+    assert "load_survey_data" in result.output, \
+        "The available benchmarks should be listed."